@@ -0,0 +1,225 @@
+"""
+Headless HTTP/JSON server for the MAGI council — no Tk, no ui/ imports.
+
+  GET  /health         liveness + load: active, waiting, limit, post-processing depth
+  POST /query          {"query", "address_mode", "debate", "refinement", "context"}
+                       -> {"results": {...}, "elapsed": seconds}
+  POST /query/stream   same body; Server-Sent Events: status, tool, stats and
+                       delta events while the council works, then one
+                       "result" (or "error") event
+
+Deliberations share an orchestrator's history, so each in-flight request
+gets its own orchestrator from a pool of SERVER_MAX_CONCURRENT. The pool is
+one session, like the desktop app: every orchestrator shares the same
+clipboard, memory session and post-processing queue, so what a request sees
+doesn't depend on the slot it lands on. Requests
+beyond that wait up to SERVER_QUEUE_TIMEOUT seconds for a free one
+(SERVER_MAX_WAITING at most), otherwise get 503. An orchestrator goes back
+to the pool once its clipboard review is done, after the response is sent,
+so clients never wait on the review. A client that disconnects
+cancels its deliberation and the in-flight model calls with it.
+"""
+import asyncio
+import json
+import time
+from aiohttp import web
+from core.config import CONFIG
+
+MAX_CONCURRENT = CONFIG.get("SERVER_MAX_CONCURRENT", 2)
+MAX_WAITING = CONFIG.get("SERVER_MAX_WAITING", 8)
+QUEUE_TIMEOUT = CONFIG.get("SERVER_QUEUE_TIMEOUT", 120)
+MAX_QUERY_CHARS = CONFIG.get("SERVER_MAX_QUERY_CHARS", 8000)
+ADDRESS_MODES = ("ALL", "MELCHIOR", "BALTHASAR", "CASPER")
+
+
+class Busy(Exception):
+    pass
+
+
+class CouncilPool:
+    """Fixed set of orchestrators; holding one is the concurrency slot."""
+
+    def __init__(self, factory, size: int = MAX_CONCURRENT):
+        self.size = size
+        self.waiting = 0
+        self._idle = asyncio.Queue()
+        self._releasing: set[asyncio.Task] = set()
+        self._all = [factory() for _ in range(size)]
+        shared = self._all[0]
+        for orch in self._all:
+            # One post-processing queue (it owns a file on disk), one memory session and
+            # one clipboard: the server is a single session, whichever slot a request gets
+            orch.postprocess, orch.session_key = shared.postprocess, shared.session_key
+            orch.clipboard = shared.clipboard
+            self._idle.put_nowait(orch)
+
+    @property
+    def active(self) -> int:
+        return self.size - self._idle.qsize()
+
+    @property
+    def postprocess(self):
+        return self._all[0].postprocess
+
+    async def acquire(self):
+        if self._idle.empty() and self.waiting >= MAX_WAITING:
+            raise Busy()
+        self.waiting += 1
+        try:
+            return await asyncio.wait_for(self._idle.get(), QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise Busy()
+        finally:
+            self.waiting -= 1
+
+    def release(self, orch) -> None:
+        """Return orch to the pool once its clipboard review is done. Doesn't wait for
+        it, so the response goes out while the review finishes behind it."""
+        task = asyncio.create_task(self._release(orch))
+        self._releasing.add(task)
+        task.add_done_callback(self._releasing.discard)
+
+    async def _release(self, orch) -> None:
+        try:
+            await orch.wait_background()  # clipboard review belongs to this deliberation
+        finally:
+            self._idle.put_nowait(orch)
+
+    async def drain(self) -> None:
+        """Wait for every pending release (call on shutdown)."""
+        while self._releasing:
+            await asyncio.gather(*list(self._releasing), return_exceptions=True)
+
+
+POOL = web.AppKey("pool", CouncilPool)
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"error": message}, status=status)
+
+
+async def _parse(request: web.Request) -> dict:
+    """Request body -> process_query keyword arguments. Raises ValueError with a message."""
+    try:
+        body = await request.json()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("body must be JSON")
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    query = body.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("'query' must be a non-empty string")
+    if len(query) > MAX_QUERY_CHARS:
+        raise ValueError(f"'query' is longer than {MAX_QUERY_CHARS} characters")
+    address = str(body.get("address_mode", "ALL")).upper()
+    if address not in ADDRESS_MODES:
+        raise ValueError(f"'address_mode' must be one of {', '.join(ADDRESS_MODES)}")
+    return {
+        "user_question": query.strip(),
+        "address_mode": address,
+        "debate_mode": bool(body.get("debate", False)),
+        "refinement_mode": bool(body.get("refinement", False)),
+        "context_text": str(body.get("context") or ""),
+    }
+
+
+async def health(request: web.Request) -> web.Response:
+    pool = request.app[POOL]
+    return web.json_response({
+        "status": "ok", "active": pool.active, "waiting": pool.waiting,
+        "limit": pool.size, "postprocess_depth": pool.postprocess.depth,
+    })
+
+
+async def query(request: web.Request) -> web.Response:
+    try:
+        kwargs = await _parse(request)
+    except ValueError as e:
+        return _error(400, str(e))
+    pool = request.app[POOL]
+    try:
+        orch = await pool.acquire()
+    except Busy:
+        return _error(503, "council busy, try again later")
+    start = time.perf_counter()
+    try:
+        results = await orch.process_query(**kwargs)
+    except Exception as e:
+        return _error(500, str(e))
+    finally:
+        pool.release(orch)
+    return web.json_response({"results": results, "elapsed": round(time.perf_counter() - start, 3)})
+
+
+async def query_stream(request: web.Request) -> web.StreamResponse:
+    try:
+        kwargs = await _parse(request)
+    except ValueError as e:
+        return _error(400, str(e))
+    pool = request.app[POOL]
+    try:
+        orch = await pool.acquire()
+    except Busy:
+        return _error(503, "council busy, try again later")
+
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream",
+                                           "Cache-Control": "no-cache"})
+    events: asyncio.Queue = asyncio.Queue()
+    start = time.perf_counter()
+    try:
+        await response.prepare(request)
+        task = asyncio.create_task(orch.process_query(
+            **kwargs,
+            status_callback=lambda m: events.put_nowait(("status", {"message": m})),
+            tool_callback=lambda m: events.put_nowait(("tool", {"message": m})),
+            stats_callback=lambda m: events.put_nowait(("stats", {"message": m})),
+            delta_callback=lambda n, t: events.put_nowait(("delta", {"agent": n, "token": t})),
+        ))
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while (event := await events.get()) is not None:
+                await _send(response, *event)
+        finally:
+            task.cancel()  # client went away mid-deliberation: stop the model calls
+            await asyncio.gather(task, return_exceptions=True)  # let it unwind before release
+        try:
+            results = task.result()
+            await _send(response, "result", {"results": results,
+                                             "elapsed": round(time.perf_counter() - start, 3)})
+        except Exception as e:
+            await _send(response, "error", {"error": str(e)})
+    finally:
+        pool.release(orch)
+    return response
+
+
+async def _send(response: web.StreamResponse, event: str, data: dict) -> None:
+    await response.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+
+
+async def _close_resources(app: web.Application) -> None:
+    from llm.session import close_session
+    await app[POOL].drain()
+    await app[POOL].postprocess.flush()
+    await close_session()
+
+
+def create_app(factory=None, size: int = MAX_CONCURRENT) -> web.Application:
+    """The aiohttp application. factory() builds one orchestrator (tests pass a fake)."""
+    if factory is None:
+        from core.orchestrator import MAGIOrchestrator
+        factory = MAGIOrchestrator
+    app = web.Application(client_max_size=1024 ** 2)
+    app[POOL] = CouncilPool(factory, size)
+    app.router.add_get("/health", health)
+    app.router.add_post("/query", query)
+    app.router.add_post("/query/stream", query_stream)
+    app.on_cleanup.append(_close_resources)
+    return app
+
+
+def run(host: str = None, port: int = None) -> None:
+    web.run_app(create_app(),
+                host=host or CONFIG.get("SERVER_HOST", "127.0.0.1"),
+                port=port or CONFIG.get("SERVER_PORT", 8080),
+                handler_cancellation=True)  # a dropped client cancels its deliberation
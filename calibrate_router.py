@@ -0,0 +1,35 @@
+"""
+Router fast-path calibration report.
+Replays core/fastpath.py over the held-out check set (never trained on), the
+seed corpus and every LLM router decision logged in data/router_log.jsonl, and
+prints how many queries would skip the LLM router and how many of those would
+be misrouted. Only the held-out numbers say anything about accuracy; the
+other two sets are what the model was trained on.
+Run: python calibrate_router.py [--train]
+  --train  retrain data/router_model.json on seed + logged decisions first
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.fastpath import train_model, load_logged_samples, calibration_report
+from core.router_seed import SEED_SAMPLES, HELDOUT_SAMPLES
+
+logged = load_logged_samples()
+if "--train" in sys.argv:
+    train_model(logged)
+    print(f"Retrained on {len(SEED_SAMPLES)} seed + {len(logged)} logged samples.\n")
+
+for title, samples in [("HELD-OUT CHECK SET", HELDOUT_SAMPLES), ("SEED CORPUS (trained on)", SEED_SAMPLES),
+                       ("LOGGED LLM DECISIONS", logged)]:
+    r = calibration_report(samples)
+    print(f"=== {title} ({r['total']} queries) ===")
+    if not r["total"]:
+        print("  (no data)\n")
+        continue
+    print(f"  short-circuited: {r['short_circuited']} ({r['short_circuit_rate']:.1%})")
+    print(f"  misroutes:       {r['misroutes']} ({r['misroute_rate']:.1%} of short-circuited)")
+    for reason, n in sorted(r["by_reason"].items(), key=lambda kv: -kv[1]):
+        print(f"    {reason:<18} {n}")
+    print()
@@ -0,0 +1,89 @@
+"""
+Token budget manager.
+One place that decides how much of the context window each part of a prompt
+gets — system prompt, briefing blocks, history, tool results, memory — and
+compresses the lowest-priority parts first when a prompt would overflow.
+"""
+from core.config import CONFIG
+from llm.client import MAX_AGENT_TOKENS
+from llm.tokens import count_tokens, count_messages
+
+CONTEXT_WINDOW = CONFIG.get("CONTEXT_WINDOW", 16384)         # model's loaded context length
+BRIEFING_TOKENS = CONFIG.get("BRIEFING_TOKENS", 3000)         # whole council briefing
+TOOL_RESULT_TOKENS = CONFIG.get("TOOL_RESULT_TOKENS", 250)    # one tool result in an agent turn
+RESEARCH_RESULT_TOKENS = CONFIG.get("RESEARCH_RESULT_TOKENS", 350)  # one tool result in research
+REFINE_INPUT_TOKENS = CONFIG.get("REFINE_INPUT_TOKENS", 900)  # decision text sent to refinement
+MEMORY_TOKENS = CONFIG.get("MEMORY_TOKENS", 350)              # injected historical memory
+MIN_TURN_TOKENS = CONFIG.get("MIN_TURN_TOKENS", 256)          # newest message is never cut below this
+
+
+def truncate_to_tokens(text: str, limit: int, marker: str = "\n[truncated]") -> str:
+    """Keep the head of text within limit tokens (binary search on length)."""
+    if count_tokens(text) <= limit:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= limit:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + marker
+
+
+def compress(text: str, limit: int) -> str:
+    """Shrink to ~limit tokens keeping head and tail — conclusions often sit at the end."""
+    if count_tokens(text) <= limit:
+        return text
+    marker = "\n[… compressed …]\n"
+    room = limit - count_tokens(marker)
+    if room <= 0:
+        return truncate_to_tokens(text, limit, marker="")
+    head = truncate_to_tokens(text, room * 2 // 3, marker="")
+    tail_chars = len(text) * (room - count_tokens(head)) // count_tokens(text)
+    tail = text[len(text) - tail_chars:].lstrip() if tail_chars > 0 else ""
+    out = f"{head}{marker}{tail}"
+    # The tail is sized by ratio; make sure the estimate never overshoots the limit
+    return out if count_tokens(out) <= limit else truncate_to_tokens(out, limit, marker="")
+
+
+def allocate(sections: list[tuple[str, str, int]], limit: int) -> dict[str, str]:
+    """
+    sections: (name, text, priority) — higher priority is kept longer.
+    Shrinks sections lowest-priority first until the total fits within limit.
+    """
+    texts = {name: text or "" for name, text, _ in sections}
+    sizes = {name: count_tokens(texts[name]) for name in texts}
+    overflow = sum(sizes.values()) - limit
+    for name, _, _ in sorted(sections, key=lambda s: s[2]):
+        if overflow <= 0:
+            break
+        keep = max(0, sizes[name] - overflow)
+        texts[name] = compress(texts[name], keep)
+        overflow -= sizes[name] - count_tokens(texts[name])
+    return texts
+
+
+def fit_history(system_prompt: str, history: list, tools: list = None,
+                max_tokens: int = None) -> list:
+    """
+    Drop the oldest messages until the request fits the context window
+    (leaving room for the reply). The newest message is always kept —
+    compressed if it alone is too large, but never below MIN_TURN_TOKENS.
+    """
+    available = CONTEXT_WINDOW - (max_tokens or MAX_AGENT_TOKENS)
+    msgs = list(history)
+    while len(msgs) > 1 and count_messages(system_prompt, msgs, tools) > available:
+        msgs.pop(0)
+        # A tool result without its assistant tool_calls message is invalid
+        while len(msgs) > 1 and msgs[0].get("role") == "tool":
+            msgs.pop(0)
+
+    over = count_messages(system_prompt, msgs, tools) - available
+    if over > 0 and msgs and isinstance(msgs[-1].get("content"), str):
+        last = msgs[-1]
+        size = count_tokens(last["content"])
+        # Even when the window can't hold it, send the gist rather than an empty turn
+        keep = max(size - over, min(size, MIN_TURN_TOKENS))
+        msgs[-1] = {**last, "content": compress(last["content"], keep)}
+    return msgs
@@ -0,0 +1,40 @@
+"""
+Session clipboard proposals — [MEMO: ...] extraction and de-duplication.
+Agents repeat the same fact in slightly different words; only one copy of
+each should reach MAGI Core for evaluation.
+"""
+import re
+from core.config import CONFIG
+from core.consensus import calculate_similarity
+
+MEMO_PATTERN = re.compile(r'\[MEMO:\s*([^\]]+)\]', re.IGNORECASE)
+
+# Proposals at least this similar to one already kept are treated as the same fact
+DUPLICATE_THRESHOLD = CONFIG.get("MEMO_DUPLICATE_THRESHOLD", 0.85)
+
+
+def _normalize(item: str) -> str:
+    return re.sub(r"\s+", " ", item).strip().rstrip(".;,").lower()
+
+
+def _is_duplicate(item: str, kept: list[str]) -> bool:
+    norm = _normalize(item)
+    return any(
+        norm == _normalize(k) or calculate_similarity(norm, _normalize(k)) >= DUPLICATE_THRESHOLD
+        for k in kept
+    )
+
+
+def extract_memos(text: str, existing: list[str] = ()) -> list[str]:
+    """
+    Returns the [MEMO: ...] proposals in text, in order of appearance, minus
+    near-duplicates of each other and of items already on the clipboard.
+    """
+    kept = []
+    seen = list(existing)
+    for raw in MEMO_PATTERN.findall(text):
+        item = raw.strip()
+        if item and not _is_duplicate(item, seen):
+            kept.append(item)
+            seen.append(item)
+    return kept
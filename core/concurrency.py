@@ -0,0 +1,43 @@
+"""
+Bounded fan-out for independent LLM calls.
+Runs coroutines concurrently, never more at once than the LM Studio server has
+parallel slots, and returns results in the order the coroutines were given.
+The slots are one semaphore per event loop, shared by every caller: nested
+fan-outs (memo reviews that each cast ballots) still respect the limit.
+Only wrap coroutines that make the model call themselves — a coroutine that
+holds a slot while waiting on another bounded call can deadlock.
+"""
+import asyncio
+from core.config import CONFIG
+
+# How many requests the LM Studio server can decode in parallel.
+# 1 = fully sequential (servers without parallel slots).
+PARALLEL_SLOTS = CONFIG.get("LLM_PARALLEL_SLOTS", 3)
+
+_slots: dict = {}  # event loop -> shared Semaphore(PARALLEL_SLOTS)
+
+
+def llm_slots() -> asyncio.Semaphore:
+    """The running loop's shared semaphore: `async with llm_slots():` around one model call."""
+    loop = asyncio.get_running_loop()
+    for stale in [l for l in _slots if l.is_closed()]:
+        del _slots[stale]
+    if loop not in _slots:
+        _slots[loop] = asyncio.Semaphore(max(1, PARALLEL_SLOTS))
+    return _slots[loop]
+
+
+async def gather_bounded(coros, limit: int = None) -> list:
+    """
+    Await all coroutines with at most PARALLEL_SLOTS model calls in flight
+    across the whole loop (or at most `limit` of these, with a private bound).
+    Results keep input order. A coroutine that raises does not cancel the
+    others — its exception is returned in its slot instead of a result.
+    """
+    sem = asyncio.Semaphore(max(1, limit)) if limit else llm_slots()
+
+    async def _run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros), return_exceptions=True)
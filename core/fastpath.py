@@ -0,0 +1,148 @@
+"""
+Zero-LLM fast path in front of the MAGI router.
+Rules resolve obvious small talk (with a canned reply) and obvious council
+questions; a lexical model (core/lexical_model.py) resolves confident
+"deliberate" cases. Research keywords only count once the model doesn't read
+the message as chat ("how are you today" is not a research request).
+Everything in the uncertain band falls back to the LLM router, whose
+decisions are logged so the model can be retrained and calibrated.
+"""
+import json
+import os
+import re
+from core.config import CONFIG
+from core.triggers import needs_research
+from core.lexical_model import LexicalModel
+
+MODEL_PATH = "data/router_model.json"
+LOG_PATH = "data/router_log.jsonl"
+
+# P(deliberate) at or above this skips the LLM router
+DELIBERATE_THRESHOLD = CONFIG.get("ROUTER_FAST_THRESHOLD", 0.85)
+# P(deliberate) at or below this reads as chat — research keywords alone don't promote it
+CHAT_THRESHOLD = CONFIG.get("ROUTER_CHAT_THRESHOLD", 0.3)
+
+# Whole-message small talk → canned reply. Anchored: "thanks, now explain X" is not small talk.
+_TAIL = r"[\s,!.]*(magi|there|everyone|all)?[\s!.]*$"
+SIMPLE_RULES = [
+    (re.compile(r"^(hi|hello|hey|yo|greetings|good (morning|afternoon|evening))" + _TAIL, re.I),
+     "Hello. MAGI systems online and listening."),
+    (re.compile(r"^(thanks|thank you|thx|ty|cheers|much appreciated)( (so|very) much| a lot)?" + _TAIL, re.I),
+     "You're welcome."),
+    (re.compile(r"^(ok|okay|got it|cool|nice|great|perfect|understood|noted|sounds good|alright)" + _TAIL, re.I),
+     "Acknowledged."),
+    (re.compile(r"^(bye|goodbye|see you( later)?|good night|talk later)" + _TAIL, re.I),
+     "Goodbye. MAGI standing by."),
+]
+
+# Obvious council material — mirrors the "deliberate" rules in MAGI_ROUTER_PROMPT
+CAPABILITY = re.compile(r"\b(can you|could you|are you able|do you have|will you)\b", re.I)
+LONG_QUERY_WORDS = 12
+
+_model = None
+
+
+def _get_model() -> LexicalModel:
+    """Load the on-disk model, training it from the seed set on first use."""
+    global _model
+    if _model is None:
+        _model = LexicalModel.load(MODEL_PATH)
+        if _model is None:
+            _model = train_model()
+    return _model
+
+
+def train_model(extra_samples: list[tuple[str, int]] = ()) -> LexicalModel:
+    """Train on the seed corpus plus any logged LLM decisions, and save to MODEL_PATH."""
+    global _model
+    from core.router_seed import SEED_SAMPLES
+    samples = list(SEED_SAMPLES) + list(extra_samples)
+    _model = LexicalModel().train(samples)
+    _model.save(MODEL_PATH)
+    return _model
+
+
+def classify(question: str) -> tuple[str | None, float, str]:
+    """
+    Returns (mode, p_deliberate, reason). mode is None in the uncertain band.
+    """
+    q = question.strip()
+    for pattern, _ in SIMPLE_RULES:
+        if pattern.match(q):
+            return "simple", 0.0, "rule:smalltalk"
+    if CAPABILITY.search(q):
+        return "deliberate", 1.0, "rule:capability"
+    if len(q.split()) >= LONG_QUERY_WORDS:
+        return "deliberate", 1.0, "rule:length"
+
+    p = _get_model().predict(q)
+    if p >= DELIBERATE_THRESHOLD:
+        return "deliberate", p, "model"
+    if p > CHAT_THRESHOLD and needs_research(q, whole_words=True):
+        return "deliberate", 1.0, "rule:research"
+    return None, p, "uncertain"
+
+
+def fast_route(question: str) -> dict | None:
+    """Router-shaped decision without an LLM call, or None to ask the LLM router."""
+    if not CONFIG.get("ROUTER_FAST_PATH", True):
+        return None
+    mode, _, reason = classify(question)
+    if mode == "simple":
+        reply = next(r for p, r in SIMPLE_RULES if p.match(question.strip()))
+        return {"mode": "simple", "reply": reply, "source": reason}
+    if mode == "deliberate":
+        return {"mode": "deliberate", "source": reason}
+    return None
+
+
+def record_llm_decision(question: str, mode: str) -> None:
+    """Append an LLM router decision to the log used for retraining/calibration."""
+    try:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"q": question, "mode": mode}) + "\n")
+    except OSError:
+        pass
+
+
+def load_logged_samples() -> list[tuple[str, int]]:
+    samples = []
+    try:
+        with open(LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    samples.append((row["q"], 1 if row["mode"] == "deliberate" else 0))
+                except (ValueError, KeyError):
+                    continue
+    except OSError:
+        pass
+    return samples
+
+
+def calibration_report(samples: list[tuple[str, int]]) -> dict:
+    """
+    Replays the fast path over labelled (query, label) pairs.
+    short_circuit_rate: share resolved without the LLM router.
+    misroute_rate: share of short-circuited queries routed differently from the label.
+    """
+    resolved = misroutes = 0
+    by_reason: dict[str, int] = {}
+    for q, label in samples:
+        mode, _, reason = classify(q)
+        by_reason[reason] = by_reason.get(reason, 0) + 1
+        if mode is None:
+            continue
+        resolved += 1
+        if (mode == "deliberate") != bool(label):
+            misroutes += 1
+    total = len(samples)
+    return {
+        "total": total,
+        "short_circuited": resolved,
+        "short_circuit_rate": resolved / total if total else 0.0,
+        "misroutes": misroutes,
+        "misroute_rate": misroutes / resolved if resolved else 0.0,
+        "by_reason": by_reason,
+    }
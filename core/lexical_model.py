@@ -0,0 +1,75 @@
+"""
+Tiny lexical classifier for the router fast path.
+Logistic regression over hashed character n-grams — pure Python, trains in
+milliseconds on a few hundred examples, stored on disk as sparse JSON.
+Predicts P(deliberate) for a query.
+"""
+import json
+import math
+import os
+import re
+import zlib
+
+N_FEATURES = 1 << 15
+NGRAM_SIZES = (2, 3, 4)
+
+
+def features(text: str) -> dict[int, float]:
+    """L2-normalized hashed char n-gram counts (word-boundary padded)."""
+    text = " " + re.sub(r"\s+", " ", text.lower()).strip() + " "
+    counts: dict[int, float] = {}
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            # crc32, not hash(): must be stable across processes for the saved model
+            idx = zlib.crc32(text[i:i + n].encode("utf-8")) % N_FEATURES
+            counts[idx] = counts.get(idx, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+class LexicalModel:
+    def __init__(self, weights: dict[int, float] = None, bias: float = 0.0):
+        self.weights = weights or {}
+        self.bias = bias
+
+    def predict(self, text: str) -> float:
+        """Probability that the query needs the council."""
+        return self.predict_features(features(text))
+
+    def train(self, samples: list[tuple[str, int]], epochs: int = 40,
+              lr: float = 0.5, l2: float = 1e-4) -> "LexicalModel":
+        """SGD on (text, label) pairs; label 1 = deliberate, 0 = simple."""
+        data = [(features(t), y) for t, y in samples]
+        for _ in range(epochs):
+            for feats, y in data:
+                err = self.predict_features(feats) - y
+                self.bias -= lr * err
+                for k, v in feats.items():
+                    w = self.weights.get(k, 0.0)
+                    self.weights[k] = w - lr * (err * v + l2 * w)
+        return self
+
+    def predict_features(self, feats: dict[int, float]) -> float:
+        z = self.bias + sum(self.weights.get(k, 0.0) * v for k, v in feats.items())
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "n_features": N_FEATURES,
+                "bias": self.bias,
+                "weights": {str(k): round(w, 5) for k, w in self.weights.items() if abs(w) > 1e-4},
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalModel | None":
+        """Returns None if missing or built with a different feature space."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("n_features") != N_FEATURES:
+            return None
+        return cls({int(k): w for k, w in data["weights"].items()}, data["bias"])
@@ -1,10 +1,21 @@
-import json
-from llm.client import make_api_call
+import asyncio
+import time
+import uuid
+from llm.client import make_api_call, stream_api_call
 from llm.messages import append_user, append_assistant, append_tool
 from core.personalities import MELCHIOR_PROMPT, BALTHASAR_PROMPT, CASPER_PROMPT
 from core.addressing import get_addressed_personalities
+from core.concurrency import gather_bounded, llm_slots
+from core.clipboard import extract_memos
+from core.triggers import needs_research
+from core.pipeline import PrefixWarmer, record_synthesis
+from core.prompt_assembly import assemble_briefing
+from core import budget
 from tools.schema import TOOL_SCHEMAS
 from core.config import CONFIG
+from memory.postprocess import PostProcessor
+from memory import response_cache
+from memory.db import run_async
 
 # MAGI Core — the overseer/briefer. Not a personality. A neutral reformulator.
 MAGI_CORE_SYSTEM = (
@@ -29,13 +40,8 @@ MAGI_CLIPBOARD_SYSTEM = (
     "REJECT: [one-sentence reason explaining why it is not clipboard-worthy]"
 )
 
-MAX_HISTORY_MESSAGES = 6  # Per-agent, within a single deliberation
-
-
-def _trim_history(history: list) -> list:
-    if len(history) <= MAX_HISTORY_MESSAGES:
-        return history
-    return history[-MAX_HISTORY_MESSAGES:]
+# Replies that mean the call failed — never worth caching
+_FAILED_PREFIXES = ("[ERROR", "[No response", "[Refinement failed")
 
 
 def _extract(result: dict) -> tuple[str, dict]:
@@ -50,6 +56,47 @@ def _clean_msg(msg: dict) -> dict:
     return {k: v for k, v in msg.items() if k != "reasoning_content"}
 
 
+def _format_stats(label: str, result: dict) -> str:
+    """One-line usage/speed summary for the terminal stats line."""
+    u = result.get("usage", {})
+    s = result.get("stats", {})
+    tps   = s.get("tokens_per_second", 0)
+    ttft  = s.get("time_to_first_token", 0)
+    gen_t = s.get("generation_time", 0)
+    stop  = s.get("stop_reason", "-")
+    p_tok = u.get("prompt_tokens", 0)
+    c_tok = u.get("completion_tokens", 0)
+    hit   = result.get("prefix_hit", 0)
+    return (
+        f"▸ {label} │ {tps:.1f} tok/s │ {c_tok} out / {p_tok} in "
+        f"│ TTFT {ttft:.2f}s │ gen {gen_t:.2f}s │ prefix ~{hit:.0%} │ [{stop}]"
+    )
+
+
+def _synthesis_prompt(briefing: str, casper_out: str, balthasar_out: str) -> str:
+    """MELCHIOR's first-round synthesis prompt."""
+    return (
+        f"COUNCIL BRIEFING:\n{briefing}\n\n"
+        f"CASPER:\n{casper_out}\n\n"
+        f"BALTHASAR:\n{balthasar_out}\n\n"
+        f"You are the coordinator. Synthesize their positions. "
+        f"If genuine disagreement remains that the user needs resolved, "
+        f"end with exactly: DEBATE: [one specific question to resolve]\n"
+        f"Otherwise give your final ruling directly."
+    )
+
+
+async def _streamed_call(system_prompt, messages, tools, on_delta) -> dict:
+    """Stream one call, forwarding content deltas; returns the assembled response."""
+    result = {"error": "Stream ended without a response"}
+    async for kind, value in stream_api_call(system_prompt, messages, tools):
+        if kind == "delta":
+            on_delta(value)
+        else:
+            result = value
+    return result
+
+
 class MAGIOrchestrator:
     def __init__(self):
         self.prompts = {
@@ -61,6 +108,42 @@ class MAGIOrchestrator:
         # Session clipboard — persists across queries, cleared only on app restart.
         # Agents propose items with [MEMO: ...] syntax; MAGI Core decides what stays.
         self.clipboard: list[str] = []
+        # Bookkeeping tasks that outlive process_query (clipboard review)
+        self._background: set[asyncio.Task] = set()
+        # Keypoint extraction, memory writes and compaction — off the critical path
+        self.postprocess = PostProcessor()
+        # Groups this app run's deliberations in memory (sessions table)
+        self.session_key = uuid.uuid4().hex
+        self._compaction_queued = False
+
+    def _spawn(self, coro) -> None:
+        """Run coro off the critical path; wait_background() collects it."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _queue_storage(self, query: str, responses: dict, store_text: str,
+                       turns: list = None) -> None:
+        """Hand a finished deliberation to the post-processor; compact old memory once per session."""
+        self.postprocess.submit("store", query=query, responses=responses, store_text=store_text,
+                                session=self.session_key, turns=turns)
+        if not self._compaction_queued:
+            self.postprocess.submit("compact")
+            self._compaction_queued = True
+
+    async def wait_background(self) -> None:
+        """Wait for background bookkeeping started by earlier queries to finish."""
+        while self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    async def _review_memos(self, items: list[str], log=None) -> None:
+        """Evaluate all memo proposals concurrently; approved items join in proposal order."""
+        # Not gather_bounded: each review takes the shared LLM slots per call (MAGI, then ballots)
+        verdicts = await asyncio.gather(*(self._evaluate_clipboard(i, log) for i in items),
+                                        return_exceptions=True)
+        for item, approved in zip(items, verdicts):
+            if approved is True and item not in self.clipboard:
+                self.clipboard.append(item)
 
     async def _evaluate_clipboard(self, item: str, log=None) -> bool:
         """
@@ -68,10 +151,10 @@ class MAGIOrchestrator:
         If rejected, the 3 agents vote — majority overrides MAGI.
         Returns True if item should be added.
         """
-        import asyncio
         h = []
         append_user(h, f"Should this be added to the session clipboard?\n\n\"{item}\"")
-        result = await make_api_call(MAGI_CLIPBOARD_SYSTEM, h)
+        async with llm_slots():
+            result = await make_api_call(MAGI_CLIPBOARD_SYSTEM, h)
         if "error" in result:
             return False
         verdict, _ = _extract(result)
@@ -94,14 +177,19 @@ class MAGIOrchestrator:
             f"Do you vote to override MAGI and add it anyway? YES or NO."
         )
 
-        votes = []
+        # The three votes are independent — cast them concurrently
+        ballots = []
         for name in ["MELCHIOR", "BALTHASAR", "CASPER"]:
             h2 = []
             append_user(h2, vote_prompt)
-            r = await make_api_call(VOTE_SYSTEM, h2)
-            if "error" not in r:
-                v, _ = _extract(r)
-                votes.append(v.strip().upper().startswith("YES"))
+            ballots.append(make_api_call(VOTE_SYSTEM, h2))
+
+        votes = []
+        for r in await gather_bounded(ballots):
+            if isinstance(r, Exception) or "error" in r:
+                continue  # a failed ballot is an abstention
+            v, _ = _extract(r)
+            votes.append(v.strip().upper().startswith("YES"))
 
         yes_count = sum(votes)
         override = yes_count >= 2  # majority rules
@@ -118,21 +206,32 @@ class MAGIOrchestrator:
 
     async def _call(self, name: str, user_content: str,
                     tool_callback=None, stats_callback=None,
-                    use_tools: bool = False) -> str:
+                    use_tools: bool = False, delta_callback=None) -> str:
         """
         Make one sequential call to an agent.
         Appends to that agent's history so they remember what they said this round.
         use_tools=False by default — tools are sparse, only for research phase.
+        If delta_callback is given (and STREAMING_ENABLED), the reply is streamed and
+        delta_callback(name, token) is called for every content token as it arrives.
         """
-        from core.tools_runner import execute_tool
+        from core.tools_runner import execute_tool_calls, parse_arguments
+        from tools.rank import select_passages
 
-        self.history[name] = _trim_history(self.history[name])
         append_user(self.history[name], user_content)
 
         tools = TOOL_SCHEMAS if use_tools else None
+        streaming = delta_callback is not None and CONFIG.get("STREAMING_ENABLED", True)
 
         for _ in range(2):  # max 2 tool iterations
-            result = await make_api_call(self.prompts[name], self.history[name], tools=tools)
+            # Oldest turns go first when the prompt would overflow the context window
+            self.history[name] = budget.fit_history(self.prompts[name], self.history[name], tools)
+            if streaming:
+                result = await _streamed_call(
+                    self.prompts[name], self.history[name], tools,
+                    lambda token: delta_callback(name, token)
+                )
+            else:
+                result = await make_api_call(self.prompts[name], self.history[name], tools=tools)
 
             if "error" in result:
                 reply = f"[ERROR: {result['error']}]"
@@ -143,33 +242,19 @@ class MAGIOrchestrator:
 
             # Emit stats
             if stats_callback:
-                u = result.get("usage", {})
-                s = result.get("stats", {})
-                tps   = s.get("tokens_per_second", 0)
-                ttft  = s.get("time_to_first_token", 0)
-                gen_t = s.get("generation_time", 0)
-                stop  = s.get("stop_reason", "-")
-                p_tok = u.get("prompt_tokens", 0)
-                c_tok = u.get("completion_tokens", 0)
-                stats_callback(
-                    f"▸ {name} │ {tps:.1f} tok/s │ {c_tok} out / {p_tok} in "
-                    f"│ TTFT {ttft:.2f}s │ gen {gen_t:.2f}s │ [{stop}]"
-                )
+                stats_callback(_format_stats(name, result))
 
             # Handle tool calls
             if msg.get("tool_calls") and use_tools:
                 self.history[name].append(_clean_msg(msg))
-                for tc in msg["tool_calls"]:
-                    fn = tc["function"]["name"]
-                    try:
-                        kwargs = json.loads(tc["function"]["arguments"])
-                    except Exception:
-                        kwargs = {}
-                    if tool_callback:
-                        tool_callback(f"[{name}] TOOL → {fn}({kwargs})")
-                    tool_result = execute_tool(fn, kwargs)
-                    if len(tool_result) > 800:
-                        tool_result = tool_result[:800] + "\n[truncated]"
+                calls = await execute_tool_calls(
+                    msg["tool_calls"],
+                    lambda fn, kwargs: tool_callback and tool_callback(f"[{name}] TOOL → {fn}({kwargs})")
+                )
+                for tc, fn, tool_result in calls:
+                    # Keep the passages that match what the agent asked, not the page head
+                    focus = f"{user_content} {parse_arguments(tc).get('query', '')}"
+                    tool_result = select_passages(tool_result, focus, budget.TOOL_RESULT_TOKENS)
                     append_tool(self.history[name], tc["id"], fn, tool_result)
                 continue
 
@@ -184,40 +269,13 @@ class MAGIOrchestrator:
     # ─── Research phase ────────────────────────────────────────────────────────
 
     async def _gather_research(self, query: str, tool_callback=None) -> str:
-        """One dedicated research pass before deliberation begins."""
-        from core.tools_runner import execute_tool
-
-        RESEARCHER_SYSTEM = (
-            "You are a research assistant. Your ONLY job: use search tools to gather "
-            "factual information. Do ONE focused search. Return bullet-point facts only — "
-            "key events, dates, figures, quotes. No analysis. Max 300 words."
-        )
-        h = []
-        append_user(h, f"Research and summarize the key facts:\n\n{query}")
-
-        for _ in range(2):
-            result = await make_api_call(RESEARCHER_SYSTEM, h, tools=TOOL_SCHEMAS)
-            if "error" in result:
-                return ""
-            content, msg = _extract(result)
-            if msg.get("tool_calls"):
-                h.append(_clean_msg(msg))
-                for tc in msg["tool_calls"]:
-                    fn = tc["function"]["name"]
-                    try:
-                        kwargs = json.loads(tc["function"]["arguments"])
-                    except Exception:
-                        kwargs = {}
-                    if tool_callback:
-                        tool_callback(f"[RESEARCH] {fn}({kwargs})")
-                    tool_result = execute_tool(fn, kwargs)
-                    if len(tool_result) > 1000:
-                        tool_result = tool_result[:1000] + "\n[truncated]"
-                    append_tool(h, tc["id"], fn, tool_result)
-                continue
-            return content
+        """One dedicated research pass before deliberation begins (core/research.py)."""
+        from core import research
 
-        return ""
+        facts, sources = await research.gather(query, tool_callback)
+        if tool_callback and sources:
+            tool_callback(f"[RESEARCH] {len(sources)} source(s) made the cutoff")
+        return facts
 
     # ─── Refinement (fresh, stateless) ─────────────────────────────────────────
 
@@ -231,18 +289,7 @@ class MAGIOrchestrator:
             return name, f"[ERROR: {result['error']}]"
         content, _ = _extract(result)
         if stats_callback and content:
-            u = result.get("usage", {})
-            s = result.get("stats", {})
-            p_tok = u.get("prompt_tokens", 0)
-            c_tok = u.get("completion_tokens", 0)
-            tps   = s.get("tokens_per_second", 0)
-            ttft  = s.get("time_to_first_token", 0)
-            gen_t = s.get("generation_time", 0)
-            stop  = s.get("stop_reason", "-")
-            stats_callback(
-                f"▸ {name} (refine) │ {tps:.1f} tok/s │ {c_tok} out / {p_tok} in "
-                f"│ TTFT {ttft:.2f}s │ gen {gen_t:.2f}s │ [{stop}]"
-            )
+            stats_callback(_format_stats(f"{name} (refine)", result))
         return name, content
 
     # ─── MAGI Core briefing ────────────────────────────────────────────────────
@@ -261,9 +308,8 @@ class MAGIOrchestrator:
 
     async def process_query(self, user_question, address_mode="ALL",
                             status_callback=None, tool_callback=None, stats_callback=None,
-                            context_text="", refinement_mode=False, debate_mode=False):
-        from memory.store import store_conversation
-        from memory.extract import extract_keypoints
+                            context_text="", refinement_mode=False, debate_mode=False,
+                            delta_callback=None):
         from core.router import triage_query
 
         # Fresh slate every query — AutoGen/CrewAI pattern
@@ -273,10 +319,24 @@ class MAGIOrchestrator:
             if status_callback:
                 status_callback(msg)
 
+        # ── Response cache (research queries are never cached — facts go stale) ──
+        fingerprint = None
+        if CONFIG.get("RESPONSE_CACHE_ENABLED", True) and not needs_research(user_question):
+            fingerprint = response_cache.config_fingerprint(
+                address_mode, debate_mode, refinement_mode, context_text, self.clipboard)
+            hit = await run_async(response_cache.lookup, user_question, fingerprint)
+            if hit:
+                cached, match = hit
+                log(f"⚡ CACHE HIT ({match}) — replaying stored deliberation, no model calls.")
+                cached["CACHED"] = match
+                return cached
+
         # ── Simple query triage (skip in debate mode — always engage council) ──
         if not debate_mode and address_mode == "ALL" and not context_text and not refinement_mode:
             log("MAGI Core routing query...")
             triage = await triage_query(user_question)
+            if triage.get("source"):
+                log(f"Routed locally ({triage['source']}) — no router call.")
             if triage.get("mode") == "simple":
                 log("Direct response — council not required.")
                 return {"MAGI": triage.get("reply", "")}
@@ -289,38 +349,43 @@ class MAGIOrchestrator:
             target = active[0] if len(active) == 1 else "MELCHIOR"
             log(f"Addressing {target} directly...")
             reply = await self._call(target, user_question, tool_callback, stats_callback,
-                                     use_tools=True)
+                                     use_tools=True, delta_callback=delta_callback)
             res = {target: reply, "FINAL_DECISION": reply}
+            if fingerprint and not reply.startswith(_FAILED_PREFIXES):
+                await run_async(response_cache.store, user_question, fingerprint, res)
             if CONFIG.get("MEMORY_ENABLED", True):
-                kp = await extract_keypoints(user_question, reply) if CONFIG.get("AUTO_EXTRACT_KEYPOINTS", True) else ""
-                store_conversation(user_question, res, kp)
+                self._queue_storage(user_question, res, reply)
             return res
 
         # ── MAGI Core: reframe the query as a council briefing ───────────────
         log("MAGI Core briefing council...")
-        briefing = await self._magi_briefing(user_question)
-        if context_text:
-            briefing = f"[CONTEXT INSTRUCTIONS]\n{context_text}\n[/CONTEXT INSTRUCTIONS]\n\n{briefing}"
-
-        # Inject clipboard context if we have any
-        if self.clipboard:
-            clipboard_block = "\n".join(f"  • {item}" for item in self.clipboard)
-            briefing = f"[SESSION CLIPBOARD — facts retained from earlier in this session]\n{clipboard_block}\n[/CLIPBOARD]\n\n{briefing}"
+        # Blocks are assembled most-stable-first (context → clipboard → memory →
+        # briefing → research) so consecutive queries share the longest cached prompt prefix.
+        blocks = {
+            "context": context_text,
+            "clipboard": "\n".join(f"  • {item}" for item in self.clipboard),
+            "briefing": await self._magi_briefing(user_question),
+        }
+        if CONFIG.get("MEMORY_RECALL", False):
+            from memory.retrieve import retrieve_relevant_context
+            blocks["memory"] = await retrieve_relevant_context(user_question)
 
         # ── Research phase (if needed) ───────────────────────────────────────
-        RESEARCH_TRIGGERS = [
-            "search", "google", "look up", "find", "news", "what happened",
-            "latest", "today", "this morning", "research", "headlines"
-        ]
-        needs_research = any(t in user_question.lower() for t in RESEARCH_TRIGGERS)
-
-        if needs_research and not context_text:
+        if needs_research(user_question) and not context_text:
             log("▸ MAGI Research — gathering facts...")
             facts = await self._gather_research(user_question, tool_callback)
             if facts:
-                briefing = f"{briefing}\n\n[RESEARCH FACTS]\n{facts}\n[/RESEARCH FACTS]"
+                blocks["research"] = facts
                 log("▸ Research complete — engaging council...")
 
+        # Over budget? Shrink memory first, then clipboard, context, research — never the briefing
+        priority = {"briefing": 4, "research": 3, "context": 2, "clipboard": 1, "memory": 0}
+        blocks = budget.allocate(
+            [(name, text, priority[name]) for name, text in blocks.items()],
+            budget.BRIEFING_TOKENS
+        )
+        briefing = assemble_briefing(blocks)
+
         # ── The Deliberation: Sequential Dialogue ────────────────────────────
         #
         # CASPER speaks first (wildcard / creative)
@@ -330,6 +395,13 @@ class MAGIOrchestrator:
         # ─────────────────────────────────────────────────────────────────────
 
         log("MAGI systems engaging — initiating dialogue...")
+        dialogue_start = time.perf_counter()
+
+        # Every utterance, debate rounds included — stored as the session's turns
+        transcript = []
+
+        def said(speaker: str, rnd: int, kind: str, text: str) -> None:
+            transcript.append({"speaker": speaker, "round": rnd, "kind": kind, "text": text})
 
         # Round 1 — CASPER opens
         log("CASPER speaking...")
@@ -338,11 +410,22 @@ class MAGIOrchestrator:
             f"COUNCIL BRIEFING:\n{briefing}\n\n"
             f"You speak first. Give your initial analysis, angle, or draft. "
             f"Be bold. Be specific. Don't hedge.",
-            tool_callback, stats_callback
+            tool_callback, stats_callback, delta_callback=delta_callback
         )
+        said("CASPER", 0, "opening", casper_out)
         log(f"CASPER: {casper_out[:80].replace(chr(10), ' ')}...")
 
         # BALTHASAR reads CASPER, responds to them
+        # Pipeline mode: warm MELCHIOR's prompt prefix in LM Studio's KV cache
+        # while BALTHASAR is still streaming (needs streaming to see BALTHASAR's tokens)
+        warmer = None
+        balthasar_delta = delta_callback
+        if CONFIG.get("PIPELINE_MODE", False) and CONFIG.get("STREAMING_ENABLED", True):
+            head = _synthesis_prompt(briefing, casper_out, "\x00").split("\x00")[0]
+            warmer = PrefixWarmer(self.prompts["MELCHIOR"], self.history["MELCHIOR"], head)
+            warmer.start()
+            balthasar_delta = warmer.tap(delta_callback)
+
         log("BALTHASAR responding to CASPER...")
         balthasar_out = await self._call(
             "BALTHASAR",
@@ -350,9 +433,13 @@ class MAGIOrchestrator:
             f"CASPER just said:\n{casper_out}\n\n"
             f"Respond directly to CASPER. Where do you agree? Where do you push back? "
             f"Be specific. No vague hedging.",
-            tool_callback, stats_callback
+            tool_callback, stats_callback, delta_callback=balthasar_delta
         )
+        said("BALTHASAR", 0, "response", balthasar_out)
         log(f"BALTHASAR: {balthasar_out[:80].replace(chr(10), ' ')}...")
+        if warmer:
+            await warmer.close()
+            log(f"▸ Pipeline: {warmer.warmups} MELCHIOR prefix warm-up(s) during BALTHASAR.")
 
         # MELCHIOR reads both — synthesizes or calls for debate
         max_rounds = CONFIG.get("MAX_DEBATE_ROUNDS", 2)
@@ -364,15 +451,7 @@ class MAGIOrchestrator:
 
             if rnd == 0:
                 log("MELCHIOR synthesizing...")
-                melchior_prompt = (
-                    f"COUNCIL BRIEFING:\n{briefing}\n\n"
-                    f"CASPER:\n{casper_out}\n\n"
-                    f"BALTHASAR:\n{balthasar_out}\n\n"
-                    f"You are the coordinator. Synthesize their positions. "
-                    f"If genuine disagreement remains that the user needs resolved, "
-                    f"end with exactly: DEBATE: [one specific question to resolve]\n"
-                    f"Otherwise give your final ruling directly."
-                )
+                melchior_prompt = _synthesis_prompt(briefing, casper_out, balthasar_out)
             else:
                 log(f"Consensus check — Round {rnd}...")
                 melchior_prompt = (
@@ -382,10 +461,18 @@ class MAGIOrchestrator:
                     f"{'This is the FINAL round. Give your definitive ruling now.' if is_final_round else 'Re-synthesize. If still unresolved: DEBATE: [question]. Otherwise rule.'}"
                 )
 
+            synth_start = time.perf_counter()
             melchior_out = await self._call(
-                "MELCHIOR", melchior_prompt, tool_callback, stats_callback
+                "MELCHIOR", melchior_prompt, tool_callback, stats_callback,
+                delta_callback=delta_callback
             )
+            if rnd == 0:
+                mode = "pipelined" if warmer else "sequential"
+                synth_time = time.perf_counter() - synth_start
+                record_synthesis(mode, synth_time, warmer.warmups if warmer else 0)
+                log(f"▸ MELCHIOR synthesis {synth_time:.2f}s ({mode}).")
             responses["MELCHIOR"] = melchior_out
+            said("MELCHIOR", rnd, "synthesis", melchior_out)
 
             # Check if MELCHIOR wants another debate round
             if "DEBATE:" in melchior_out and not is_final_round:
@@ -401,8 +488,9 @@ class MAGIOrchestrator:
                     f"MELCHIOR has called for debate on: {debate_q}\n\n"
                     f"BALTHASAR said:\n{balthasar_out}\n\n"
                     f"Respond. Push your position or concede specifically.",
-                    tool_callback, stats_callback
+                    tool_callback, stats_callback, delta_callback=delta_callback
                 )
+                said("CASPER", rnd + 1, "rebuttal", casper_out)
                 log(f"CASPER: {casper_out[:80].replace(chr(10), ' ')}...")
 
                 # BALTHASAR counter-rebuts
@@ -412,8 +500,9 @@ class MAGIOrchestrator:
                     f"Debate question: {debate_q}\n\n"
                     f"CASPER just said:\n{casper_out}\n\n"
                     f"Counter-rebuttal. Be specific. No retreating into generalities.",
-                    tool_callback, stats_callback
+                    tool_callback, stats_callback, delta_callback=delta_callback
                 )
+                said("BALTHASAR", rnd + 1, "counter", balthasar_out)
                 log(f"BALTHASAR: {balthasar_out[:80].replace(chr(10), ' ')}...")
 
             else:
@@ -425,6 +514,7 @@ class MAGIOrchestrator:
             final = melchior_out
 
         responses["FINAL_DECISION"] = final
+        log(f"▸ Dialogue wall time {time.perf_counter() - dialogue_start:.2f}s.")
 
         # ── Refinement pass (if enabled) ─────────────────────────────────────
         if refinement_mode:
@@ -435,18 +525,22 @@ class MAGIOrchestrator:
                 "Flowing paragraphs only. Keep all facts, kill all jargon. "
                 "Make it entertaining enough to read twice and accurate enough to cite."
             )
-            final_for_refine = final[:3000] if len(final) > 3000 else final
+            final_for_refine = budget.compress(final, budget.REFINE_INPUT_TOKENS)
             refine_prompt = f"Rewrite as described in your system prompt:\n\n{final_for_refine}"
 
+            # Three independent, stateless drafts — run them concurrently
+            names = ["MELCHIOR", "BALTHASAR", "CASPER"]
+            log(f"◈ Refining {', '.join(names)}...")
+            drafts = await gather_bounded([
+                self._fresh_query(n, refine_prompt,
+                                  system_override=REFINEMENT_SYSTEM,
+                                  stats_callback=stats_callback)
+                for n in names
+            ])
             refined = {}
-            for n in ["MELCHIOR", "BALTHASAR", "CASPER"]:
-                log(f"◈ Refining {n}...")
-                _, draft = await self._fresh_query(
-                    n, refine_prompt,
-                    system_override=REFINEMENT_SYSTEM,
-                    stats_callback=stats_callback
-                )
-                refined[n] = draft
+            for n, d in zip(names, drafts):
+                refined[n] = f"[ERROR: {d}]" if isinstance(d, Exception) else d[1]
+                said(n, 0, "draft", refined[n])
 
             log("MELCHIOR rendering refined synthesis...")
             refined_positions = "\n\n".join(
@@ -464,6 +558,7 @@ class MAGIOrchestrator:
                     stats_callback=stats_callback
                 )
                 responses["REFINED"] = refined_final
+                said("MELCHIOR", 0, "refined", refined_final)
             else:
                 responses["REFINED"] = "[Refinement failed]"
 
@@ -472,22 +567,22 @@ class MAGIOrchestrator:
         # ── Clipboard: scan for [MEMO: ...] proposals ────────────────────────
         # Agents (especially MELCHIOR) can flag important facts with [MEMO: text]
         # MAGI Core evaluates; council can override rejection by majority vote.
-        import re
+        # Review runs in the background — the answer does not wait on it.
         all_text = " ".join(str(v) for v in responses.values())
-        memo_items = re.findall(r'\[MEMO:\s*([^\]]+)\]', all_text, re.IGNORECASE)
-        for item in memo_items:
-            item = item.strip()
-            if item and item not in self.clipboard:
-                approved = await self._evaluate_clipboard(item, log)
-                if approved:
-                    self.clipboard.append(item)
+        memo_items = extract_memos(all_text, self.clipboard)
+        if memo_items:
+            log(f"[CLIPBOARD] {len(memo_items)} proposal(s) queued for review.")
+            self._spawn(self._review_memos(memo_items, log))
 
         # ── Memory storage ────────────────────────────────────────────────────
         if CONFIG.get("MEMORY_ENABLED", True):
-            log("Storing session to memory...")
-            store_text = responses.get("REFINED", final)
-            kp = await extract_keypoints(user_question, store_text) if CONFIG.get("AUTO_EXTRACT_KEYPOINTS", True) else ""
-            store_conversation(user_question, responses, kp)
+            self._queue_storage(user_question, dict(responses),
+                                responses.get("REFINED", final), transcript)
+            log(f"Session queued for memory storage (queue depth {self.postprocess.depth}).")
+
+        if fingerprint and not any(str(responses.get(k, "")).startswith(_FAILED_PREFIXES)
+                                   for k in ("FINAL_DECISION", "REFINED")):
+            await run_async(response_cache.store, user_question, fingerprint, responses)
 
         log("Deliberation complete.")
         return responses
@@ -0,0 +1,109 @@
+"""
+Speculative prefix warming for MELCHIOR's synthesis.
+While BALTHASAR is still streaming, MELCHIOR's upcoming prompt (briefing +
+CASPER + BALTHASAR-so-far) is sent to LM Studio with max_tokens=1. The server
+prefills it into its KV cache, so when the real synthesis call arrives most of
+its prompt is a cache hit and only the tail needs processing.
+Only one warm-up is in flight at a time; the next one goes out once enough new
+BALTHASAR text has arrived.
+Every synthesis time is logged to data/pipeline_log.jsonl with its mode, so
+pipelined and sequential runs can be compared (python pipeline_report.py).
+"""
+import asyncio
+import json
+import os
+import statistics
+from core.config import CONFIG
+from llm.client import make_api_call
+
+# New BALTHASAR characters needed before re-warming the longer prefix
+WARM_INTERVAL_CHARS = CONFIG.get("PIPELINE_WARM_INTERVAL", 600)
+LOG_PATH = "data/pipeline_log.jsonl"
+
+
+class PrefixWarmer:
+    def __init__(self, system_prompt: str, history: list, head: str):
+        self.system_prompt = system_prompt
+        self.history = list(history)
+        self.head = head
+        self.warmups = 0
+        self._partial: list[str] = []
+        self._chars = 0
+        self._sent_chars = 0
+        self._task = None
+
+    def start(self) -> None:
+        """Warm the part that is already known (briefing + CASPER)."""
+        self._fire()
+
+    def tap(self, delta_callback=None):
+        """Wrap a delta callback so BALTHASAR's tokens also feed the warmer."""
+        def on_delta(name, token):
+            self.feed(token)
+            if delta_callback:
+                delta_callback(name, token)
+        return on_delta
+
+    def feed(self, token: str) -> None:
+        self._partial.append(token)
+        self._chars += len(token)
+        idle = self._task is None or self._task.done()
+        if idle and self._chars - self._sent_chars >= WARM_INTERVAL_CHARS:
+            self._fire()
+
+    async def close(self) -> None:
+        """Stop warming — the real call is about to go out and needs the slot."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _fire(self) -> None:
+        self._sent_chars = self._chars
+        content = self.head + "".join(self._partial)
+        self._task = asyncio.create_task(self._warm(content))
+
+    async def _warm(self, content: str) -> None:
+        messages = self.history + [{"role": "user", "content": content}]
+        result = await make_api_call(self.system_prompt, messages, max_tokens=1)
+        if "error" not in result:
+            self.warmups += 1
+
+
+def record_synthesis(mode: str, seconds: float, warmups: int = 0) -> None:
+    """Append one MELCHIOR synthesis timing ("pipelined" or "sequential")."""
+    try:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"mode": mode, "seconds": round(seconds, 3), "warmups": warmups}) + "\n")
+    except OSError:
+        pass
+
+
+def synthesis_report() -> dict:
+    """
+    Per mode: runs, median/mean synthesis seconds and mean warm-ups.
+    saving: 1 - pipelined median / sequential median, once both modes have runs.
+    """
+    rows: dict[str, list[dict]] = {}
+    try:
+        with open(LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    rows.setdefault(row["mode"], []).append(row)
+                except (ValueError, KeyError):
+                    continue
+    except OSError:
+        pass
+    report = {}
+    for mode, runs in rows.items():
+        times = [r["seconds"] for r in runs]
+        report[mode] = {
+            "runs": len(runs),
+            "median_s": statistics.median(times),
+            "mean_s": statistics.fmean(times),
+            "mean_warmups": statistics.fmean(r.get("warmups", 0) for r in runs),
+        }
+    if "pipelined" in report and "sequential" in report and report["sequential"]["median_s"]:
+        report["saving"] = 1 - report["pipelined"]["median_s"] / report["sequential"]["median_s"]
+    return report
@@ -0,0 +1,78 @@
+"""
+Prompt assembly for KV-cache reuse.
+llama.cpp-based servers (LM Studio) reuse cached prefill only for the longest
+byte-identical prompt prefix. So: canonicalize whitespace in the system prompt
+and the briefing blocks (the parts we compose), keep tool schemas and the
+conversation itself — tool results, code, assistant replies — byte for byte,
+and order briefing blocks from most stable (session context) to least stable
+(this query's research). PrefixTracker
+estimates how much of each prompt the server could serve from cache.
+"""
+import json
+import re
+
+# Most stable first. Anything after the first changed block must be re-prefilled.
+BLOCK_ORDER = ["context", "clipboard", "memory", "briefing", "research"]
+
+_WRAPPERS = {
+    "context":   "[CONTEXT INSTRUCTIONS]\n{}\n[/CONTEXT INSTRUCTIONS]",
+    "clipboard": "[SESSION CLIPBOARD — facts retained from earlier in this session]\n{}\n[/CLIPBOARD]",
+    "memory":    "{}",  # memory/retrieve.py output is already wrapped
+    "briefing":  "{}",
+    "research":  "[RESEARCH FACTS]\n{}\n[/RESEARCH FACTS]",
+}
+
+
+def canonical(text: str) -> str:
+    """Normalize line endings and trailing/blank-line whitespace so equal content is equal bytes."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def assemble_briefing(blocks: dict[str, str]) -> str:
+    """Join the non-empty blocks in stability order, each wrapped in its tag."""
+    parts = []
+    for name in BLOCK_ORDER:
+        body = canonical(blocks.get(name) or "")
+        if body:
+            parts.append(_WRAPPERS[name].format(body))
+    return "\n\n".join(parts)
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """Binary search on slice equality — C-speed compares instead of a per-char loop."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class PrefixTracker:
+    """
+    Remembers the last few prompts sent (one per server slot) and estimates,
+    for each new prompt, the share that matches a cached prefix.
+    Character-level — a close proxy for token-level prefix reuse.
+    """
+
+    def __init__(self, slots: int = 4):
+        self.slots = slots
+        self._recent: list[str] = []
+
+    @staticmethod
+    def render(payload: dict) -> str:
+        parts = [json.dumps(payload.get("tools") or [], sort_keys=True)]
+        for m in payload["messages"]:
+            parts.append(f"<{m['role']}>{m.get('content') or ''}")
+        return "\n".join(parts)
+
+    def observe(self, payload: dict) -> float:
+        """Record the prompt; return the estimated cached-prefix ratio (0..1)."""
+        prompt = self.render(payload)
+        best = max((_common_prefix_len(prev, prompt) for prev in self._recent), default=0)
+        self._recent = ([prompt] + [p for p in self._recent if p != prompt])[:self.slots]
+        return best / len(prompt) if prompt else 0.0
@@ -0,0 +1,159 @@
+"""
+Parallel research phase.
+One planning call turns the question into a few search sub-queries. Each
+sub-query is searched and its best not-yet-claimed URL read immediately, all
+concurrently, so the phase costs about one search plus one read. Everything
+is bounded by a global deadline — whatever has arrived by then is
+synthesized into bullet facts in one final call, with the sources that made
+the cutoff listed.
+"""
+import asyncio
+import json
+import re
+from urllib.parse import quote
+from core.config import CONFIG
+from core import budget
+from core.orchestrator import _extract
+from core.tools_runner import execute_tool
+from llm.client import make_api_call
+from llm.messages import append_user
+from llm.tokens import count_tokens
+from tools.cache import normalize_url
+from tools.rank import select_passages
+
+SUBQUERIES = CONFIG.get("RESEARCH_SUBQUERIES", 3)
+READS_PER_QUERY = CONFIG.get("RESEARCH_READS_PER_QUERY", 1)
+DEADLINE = CONFIG.get("RESEARCH_DEADLINE", 25)  # seconds for all searches + reads
+
+PLANNER_SYSTEM = (
+    "You are a research planner. Break the user's question into {n} distinct, "
+    "specific web search queries that together cover it (different angles, names, "
+    "dates). Output ONLY the queries, one per line. No numbering, no commentary."
+)
+
+SYNTH_SYSTEM = (
+    "You are a research assistant. From the numbered sources below, extract the "
+    "facts relevant to the question. Return bullet-point facts only — key events, "
+    "dates, figures, quotes — each ending with its source number like [2]. "
+    "No analysis. Max 300 words."
+)
+
+
+def parse_plan(text: str, fallback: str, n: int = SUBQUERIES) -> list[str]:
+    """Planner output → up to n unique sub-queries; the question itself if none parse."""
+    queries = []
+    for line in text.splitlines():
+        line = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip().strip('"')
+        if line and line.lower() not in (q.lower() for q in queries):
+            queries.append(line)
+    return queries[:n] or [fallback]
+
+
+async def plan(query: str) -> list[str]:
+    h = []
+    append_user(h, query)
+    result = await make_api_call(PLANNER_SYSTEM.format(n=SUBQUERIES), h, max_tokens=200)
+    if "error" in result:
+        return [query]
+    return parse_plan(_extract(result)[0], query)
+
+
+class _Evidence:
+    """Sources gathered so far, in arrival order, one entry per normalized URL."""
+
+    def __init__(self):
+        self._by_url: dict[str, dict] = {}
+        self.claimed: set[str] = set()
+
+    @property
+    def sources(self) -> list[dict]:
+        return list(self._by_url.values())
+
+    def claim(self, url: str) -> bool:
+        key = normalize_url(url)
+        if key in self.claimed:
+            return False
+        self.claimed.add(key)
+        return True
+
+    def add(self, title: str, url: str, text: str) -> None:
+        """A page read replaces the search snippet for the same URL, keeping its place."""
+        if text and not text.startswith("[ERROR"):
+            self._by_url[normalize_url(url)] = {"title": title, "url": url, "text": text}
+
+
+async def _search_and_read(question: str, sub: str, ev: _Evidence, log) -> None:
+    log(f"[RESEARCH] search_web({sub!r})")
+    raw = await execute_tool("search_web", {"query": sub})
+    try:
+        hits = [r for r in json.loads(raw) if isinstance(r, dict) and r.get("href")]
+    except (ValueError, TypeError):
+        hits = []
+
+    if not hits:  # DDG unavailable or empty — Jina search returns readable content directly
+        log(f"[RESEARCH] jina_search({sub!r})")
+        text = await execute_tool("jina_search", {"query": sub})
+        ev.add(f"Search: {sub}", f"https://s.jina.ai/{quote(sub)}", select_passages(
+            text, f"{question} {sub}", budget.RESEARCH_RESULT_TOKENS))
+        return
+
+    to_read = []
+    for r in hits:
+        if ev.claim(r["href"]):
+            ev.add(r.get("title", ""), r["href"], r.get("body", ""))
+            if len(to_read) < READS_PER_QUERY:
+                to_read.append(r)
+
+    async def read(r):
+        log(f"[RESEARCH] read_url({r['href']})")
+        page = await execute_tool("read_url", {"url": r["href"]})
+        ev.add(r.get("title", ""), r["href"], select_passages(
+            page, f"{question} {sub}", budget.RESEARCH_RESULT_TOKENS))
+
+    await asyncio.gather(*(read(r) for r in to_read))
+
+
+async def gather(question: str, log=None) -> tuple[str, list[str]]:
+    """
+    Plan, search + read concurrently until the deadline, then synthesize.
+    Returns (bullet facts, source URLs that made the cutoff); ("", []) if nothing arrived.
+    """
+    log = log or (lambda _msg: None)
+    subs = await plan(question)
+    log(f"[RESEARCH] plan: {subs}")
+
+    ev = _Evidence()
+    tasks = [asyncio.create_task(_search_and_read(question, s, ev, log)) for s in subs]
+    done, pending = await asyncio.wait(tasks, timeout=DEADLINE)
+    for t in pending:
+        t.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if pending:
+        log(f"[RESEARCH] deadline {DEADLINE}s — {len(pending)} branch(es) cut off")
+    for t in done:
+        if t.exception():
+            log(f"[RESEARCH] branch failed: {t.exception()}")
+
+    # Number sources in arrival order until the synthesis budget is spent
+    blocks, urls, used = [], [], 0
+    for s in ev.sources:
+        block = f"[{len(blocks) + 1}] {s['title']} ({s['url']})\n{s['text']}"
+        cost = count_tokens(block)
+        if used + cost > budget.BRIEFING_TOKENS:
+            break
+        blocks.append(block)
+        urls.append(s["url"])
+        used += cost
+    if not blocks:
+        return "", []
+
+    h = []
+    append_user(h, f"QUESTION: {question}\n\nSOURCES:\n" + "\n\n".join(blocks))
+    result = await make_api_call(SYNTH_SYSTEM, h)
+    if "error" in result:
+        return "", []
+
+    facts, _ = _extract(result)
+    if facts:
+        facts += "\n\nSources:\n" + "\n".join(f"[{i}] {u}" for i, u in enumerate(urls, 1))
+    return facts, urls
@@ -6,6 +6,7 @@ or can be handled as a direct simple response.
 """
 import json
 from llm.client import make_api_call
+from core.fastpath import fast_route, record_llm_decision
 
 MAGI_ROUTER_PROMPT = """You are the MAGI System Core — a silent triage intelligence.
 
@@ -41,7 +42,13 @@ async def triage_query(question: str) -> dict:
     Routes the query. Returns dict with 'mode' key:
     - {"mode": "simple", "reply": "..."} — answer directly
     - {"mode": "deliberate"}             — engage the council
+    Obvious cases are resolved locally by core/fastpath.py (with a "source" key);
+    only the uncertain band costs an LLM call.
     """
+    fast = fast_route(question)
+    if fast:
+        return fast
+
     messages = [{"role": "user", "content": question}]
     result = await make_api_call(MAGI_ROUTER_PROMPT, messages)
 
@@ -61,6 +68,7 @@ async def triage_query(question: str) -> dict:
     try:
         parsed = json.loads(content)
         if parsed.get("mode") in ("simple", "deliberate"):
+            record_llm_decision(question, parsed["mode"])
             return parsed
     except Exception:
         pass
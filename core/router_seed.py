@@ -0,0 +1,85 @@
+# Seed training data for the router fast path (core/lexical_model.py).
+# Label 0 = simple (no council), 1 = deliberate. Mirrors MAGI_ROUTER_PROMPT's rules.
+# Real routing decisions logged to data/router_log.jsonl are added on retrain.
+
+SIMPLE = [
+    "hello", "hi", "hey", "hey there", "hello magi", "hi magi", "yo",
+    "good morning", "good afternoon", "good evening", "good night", "morning!",
+    "thanks", "thank you", "thanks a lot", "thank you so much", "thx", "ty", "cheers",
+    "ok", "okay", "ok thanks", "got it", "cool", "nice", "great", "awesome", "perfect",
+    "sounds good", "makes sense", "alright", "understood", "noted",
+    "bye", "goodbye", "see you", "see you later", "talk later", "good job",
+    "what is 2+2", "what's 3 times 4", "how are you", "how's it going", "what's up",
+    "lol", "haha", "nice one", "yes", "no", "sure",
+]
+
+DELIBERATE = [
+    "can you search the web for me",
+    "are you able to browse the internet",
+    "do you have access to the news",
+    "what happened in the markets this morning",
+    "find me the latest headlines about AI regulation",
+    "should I rewrite our backend in rust or keep python",
+    "what are the trade-offs between sqlite and postgres for a desktop app",
+    "explain how transformers use attention",
+    "is it ethical to use AI to grade student essays",
+    "help me plan a migration from a monolith to microservices",
+    "why does my python asyncio code freeze the event loop",
+    "write a short article about war",
+    "compare the economic policies of keynes and hayek",
+    "what is the best programming language for beginners",
+    "how should I structure a multi-agent debate system",
+    "give me a strategy for negotiating a raise",
+    "debug this stack trace for me",
+    "what would happen if the moon disappeared",
+    "design a database schema for a library",
+    "summarize the arguments for and against universal basic income",
+    "is remote work better for productivity",
+    "how do I reduce latency in an llm pipeline",
+    "what are the risks of nuclear power",
+    "write a poem about the ocean in the style of dave barry",
+    "analyze the pros and cons of electric cars",
+    "how can we improve our onboarding process",
+    "what caused the fall of the roman empire",
+    "review my business plan for a coffee shop",
+    "look up the weather in tokyo",
+    "research the history of the magi supercomputer",
+    "which laptop should I buy for machine learning",
+    "how does a vector database work",
+    "what's the difference between a process and a thread",
+    "can you help me decide between two job offers",
+    "draft an email to my landlord about a broken heater",
+    "tell me about the philosophy of stoicism and how to apply it",
+    "what is the meaning of life",
+    "explain quantum entanglement simply",
+    "critique this argument: all swans are white",
+    "build me a study schedule for the bar exam",
+]
+
+SEED_SAMPLES = [(q, 0) for q in SIMPLE] + [(q, 1) for q in DELIBERATE]
+
+# Held-out check set: never trained on, so calibration_report() over it measures
+# how the fast path generalises. Keep these out of SIMPLE / DELIBERATE.
+HELDOUT_SIMPLE = [
+    "how are you today", "thanks for finding that", "good morning, how are you today",
+    "hiya", "thanks magi", "ok cool", "nice work", "see ya", "haha nice",
+    "what's 5 plus 7", "all good", "great, thanks",
+]
+
+HELDOUT_DELIBERATE = [
+    "what happened in the news today?",
+    "search for rust news",
+    "find the latest rust release notes",
+    "look up the population of peru",
+    "should we migrate to kubernetes",
+    "what's the weather like today",
+    "what are the risks of storing secrets in environment variables",
+    "compare react and svelte for a dashboard",
+    "is it wise to take a variable rate mortgage now",
+    "explain the cap theorem",
+    "google the ferry timetable",
+    "news on nvidia",
+    "find cheap flights to lisbon",
+]
+
+HELDOUT_SAMPLES = [(q, 0) for q in HELDOUT_SIMPLE] + [(q, 1) for q in HELDOUT_DELIBERATE]
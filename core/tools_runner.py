@@ -1,25 +1,100 @@
+"""
+Async tool runtime.
+Network tools are native async (aiohttp); the synchronous DuckDuckGo client
+runs in a worker thread. Every call has its own timeout, and all tool_calls
+from one assistant message run concurrently. Results go through the on-disk
+tool cache (tools/cache.py), read and written off the event loop.
+"""
+import asyncio
+import inspect
 import json
+from core.config import CONFIG
+from memory.db import run_async
 from tools.web_search import search_web
 from tools.url_fetch import fetch_url_content
 from tools.browser import read_url, jina_search
+from tools import cache as tool_cache
 
+TOOL_TIMEOUT = CONFIG.get("TOOL_TIMEOUT", 25)  # seconds, any tool without its own entry
+TOOL_TIMEOUTS = {
+    "search_web": 15,
+    "jina_search": 25,
+    "read_url": 25,
+    "fetch_url_content": 15,
+    **CONFIG.get("TOOL_TIMEOUTS", {}),
+}
 
-def execute_tool(name: str, kwargs: dict) -> str:
+
+async def _dispatch(name: str, kwargs: dict) -> str:
+    tools = {"search_web": search_web, "jina_search": jina_search,
+             "read_url": read_url, "fetch_url_content": fetch_url_content}
+    fn = tools.get(name)
+    if fn is None:
+        return f"[ERROR: Unknown tool '{name}']"
+    try:
+        inspect.signature(fn).bind(**kwargs)
+    except TypeError as e:  # model sent arguments the tool doesn't take
+        return f"[ERROR: bad arguments for {name}: {e}]"
+
+    if name == "search_web":
+        results = await asyncio.to_thread(fn, **kwargs)
+        return json.dumps(results)
+    return await fn(**kwargs)
+
+
+async def execute_tool(name: str, kwargs: dict) -> str:
     """
     Executes the named tool with the provided kwargs.
-    Returns the result as a string for injection into message history.
+    Returns the result as a string for injection into message history —
+    timeouts and bad arguments come back as "[ERROR ...]" strings too.
     """
-    if name == "search_web":
-        results = search_web(**kwargs)
-        return json.dumps(results)
+    if not isinstance(kwargs, dict):
+        return f"[ERROR: bad arguments for {name}: expected a JSON object, got {type(kwargs).__name__}]"
+    cached = await run_async(tool_cache.get, name, kwargs)
+    if cached is not None:
+        return cached
+    if tool_cache.MODE == "offline":
+        return f"[ERROR: offline replay — no cached result for {name}({kwargs})]"
 
-    if name == "jina_search":
-        return jina_search(**kwargs)
+    timeout = TOOL_TIMEOUTS.get(name, TOOL_TIMEOUT)
+    try:
+        result = await asyncio.wait_for(_dispatch(name, kwargs), timeout)
+    except asyncio.TimeoutError:
+        return f"[ERROR: {name} timed out after {timeout}s]"
+    except Exception as e:  # a bug inside the tool, not the model's arguments
+        return f"[ERROR: {name} failed: {type(e).__name__}: {e}]"
 
-    if name == "read_url":
-        return read_url(**kwargs)
+    if _cacheable(result):
+        await run_async(tool_cache.put, name, kwargs, result)
+    return result
 
-    if name == "fetch_url_content":
-        return fetch_url_content(**kwargs)
 
-    return f"[ERROR: Unknown tool '{name}']"
+def _cacheable(result: str) -> bool:
+    """Never cache failures — including search_web's JSON-wrapped errors."""
+    return bool(result) and not result.startswith(("[ERROR", '[{"error"'))
+
+
+def parse_arguments(tool_call: dict) -> dict:
+    """The call's JSON arguments; {} if they are missing, malformed or not an object."""
+    try:
+        args = json.loads(tool_call["function"]["arguments"])
+    except Exception:
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+async def execute_tool_calls(tool_calls: list, on_call=None) -> list[tuple[dict, str, str]]:
+    """
+    Run every tool_call of one assistant message concurrently.
+    on_call(fn, kwargs) is called as each one starts.
+    Returns (tool_call, fn, result) in the original order. Cancelling the
+    caller cancels all calls still in flight.
+    """
+    async def run(tc):
+        fn = tc["function"]["name"]
+        kwargs = parse_arguments(tc)
+        if on_call:
+            on_call(fn, kwargs)
+        return tc, fn, await execute_tool(fn, kwargs)
+
+    return list(await asyncio.gather(*(run(tc) for tc in tool_calls)))
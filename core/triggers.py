@@ -0,0 +1,25 @@
+"""
+Keyword triggers shared by the router fast path, the orchestrator and the tool cache.
+"""
+import re
+
+# Queries mentioning any of these need fresh facts from the web
+RESEARCH_TRIGGERS = [
+    "search", "google", "look up", "find", "news", "what happened",
+    "latest", "today", "this morning", "research", "headlines"
+]
+
+
+# Whole words only, for the router: "find" must not fire on "finding", nor "news" on
+# "newsletter". The research phase and cache exemptions keep matching substrings, so
+# "searching for…" and "researching…" still fetch fresh facts.
+_RESEARCH_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(t).replace(r"\ ", r"\s+") for t in RESEARCH_TRIGGERS) + r")\b", re.I)
+
+
+def needs_research(text: str, whole_words: bool = False) -> bool:
+    """True if the text asks for current / searched information."""
+    if whole_words:
+        return bool(_RESEARCH_PATTERN.search(text))
+    lowered = text.lower()
+    return any(t in lowered for t in RESEARCH_TRIGGERS)
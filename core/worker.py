@@ -0,0 +1,113 @@
+"""
+Persistent asyncio worker for the GUI.
+One event loop lives on a dedicated thread for the whole app session, so the
+pooled HTTP session, the post-processing queue and background tasks outlive
+any single query. The Tk thread hands work over with submit(); jobs run one
+at a time in submission order. cancel() stops the running job — the
+CancelledError reaches the in-flight aiohttp requests, which drop their
+connections, so the server stops generating too.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from collections import deque
+
+
+class QueryWorker:
+    def __init__(self, name: str = "magi-worker"):
+        self.loop = asyncio.new_event_loop()
+        self._jobs: deque = deque()   # (future, coroutine factory) not yet started
+        self._wakeup = None           # asyncio.Event, created on the loop
+        self._current = None          # asyncio.Task of the running job
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    # ── Tk-thread API ────────────────────────────────────────────────────────
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None
+
+    @property
+    def pending(self) -> int:
+        """Jobs waiting behind the running one."""
+        return sum(1 for future, _ in list(self._jobs) if not future.cancelled())
+
+    def submit(self, factory, *args) -> concurrent.futures.Future:
+        """Queue factory(*args) — a coroutine function — to run on the worker loop."""
+        future = concurrent.futures.Future()
+        self._jobs.append((future, lambda: factory(*args)))
+        self.loop.call_soon_threadsafe(self._wakeup.set)
+        return future
+
+    def cancel(self, clear_queue: bool = True) -> int:
+        """Cancel the running job (and, by default, everything queued). Returns jobs cancelled."""
+        cancelled = 0
+        if clear_queue:
+            while self._jobs:
+                future, _ = self._jobs.popleft()
+                cancelled += future.cancel()
+        if self._current is not None:
+            cancelled += 1
+        # Scheduled even when idle: a job the loop just dequeued is its _current by then
+        self.loop.call_soon_threadsafe(self._cancel_current)
+        return cancelled
+
+    def run(self, coro, timeout: float = None):
+        """Run a coroutine on the loop right away (not queued) and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self, timeout: float = 10) -> None:
+        """Cancel everything, close the pooled HTTP session and end the loop thread."""
+        if not self._thread.is_alive():
+            return
+        self.cancel()
+        from llm.session import close_session
+        try:
+            self.run(close_session(), timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+    # ── Loop thread ──────────────────────────────────────────────────────────
+
+    def _cancel_current(self) -> None:
+        if self._current is not None:
+            self._current.cancel()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self._wakeup = asyncio.Event()
+        self.loop.create_task(self._consume())
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
+
+    async def _consume(self) -> None:
+        while True:
+            if not self._jobs:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            future, factory = self._jobs.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue  # cancelled while queued
+            self._current = asyncio.ensure_future(factory())
+            try:
+                await asyncio.wait({self._current})
+            finally:
+                task, self._current = self._current, None
+            if task.cancelled():
+                future.set_exception(asyncio.CancelledError())  # result() raises it
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
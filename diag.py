@@ -17,15 +17,17 @@ print()
 # Check exact payload sizes
 from core.personalities import MELCHIOR_PROMPT
 from tools.schema import TOOL_SCHEMAS
+from llm.tokens import count_tokens, count_messages
 import json as _json
 
 schema_str = _json.dumps(TOOL_SCHEMAS)
-print(f"MELCHIOR_PROMPT tokens (est): {len(MELCHIOR_PROMPT)//4}")
-print(f"TOOL_SCHEMAS tokens (est):    {len(schema_str)//4}")
-print(f"TOTAL before user msg:        {(len(MELCHIOR_PROMPT)+len(schema_str))//4}")
+print(f"MELCHIOR_PROMPT tokens (est): {count_tokens(MELCHIOR_PROMPT)}")
+print(f"TOOL_SCHEMAS tokens (est):    {count_tokens(schema_str)}")
+print(f"TOTAL before user msg:        {count_messages(MELCHIOR_PROMPT, [], TOOL_SCHEMAS)}")
 print()
 
 from llm.client import make_api_call
+from llm.session import close_session
 
 async def run():
     user = "write a short article about war"
@@ -48,5 +50,7 @@ async def run():
         u2 = r2.get("usage", {})
         print(f"PASS: prompt={u2.get('prompt_tokens')} completion={u2.get('completion_tokens')}")
 
+    await close_session()
+
 asyncio.run(run())
 print("DONE")
@@ -1,9 +1,14 @@
 """
 Generates all MAGI indicator images + animation frame sequences.
 States: idle (static), thinking (pulsing glow frames), speaking (rotating scan line frames)
+Output per personality:
+  images/{name}_sheet.png                  every frame of every state, packed left to right
+  images/{name}_idle.png, {name}_active.png  the static badges on their own
+plus images/indicators.json, the manifest ui/sprites.py slices the sheets by.
 Run: python generate_indicators.py
 """
 from PIL import Image, ImageDraw
+import json
 import math
 import os
 
@@ -86,32 +91,48 @@ def make_frame(name, color, glow_intensity=0.0, scan_angle=None):
     return img
 
 
-print("Generating MAGI indicators + animation frames...")
+def pack_sheet(states: dict) -> tuple[Image.Image, dict]:
+    """Lay every state's frames out in one row. Returns (sheet, {state: [first, count]})."""
+    frames = [f for seq in states.values() for f in seq]
+    sheet = Image.new("RGB", (SIZE * len(frames), SIZE), BG)
+    index, x = {}, 0
+    for state, seq in states.items():
+        index[state] = [x, len(seq)]
+        for frame in seq:
+            sheet.paste(frame, (x * SIZE, 0))
+            x += 1
+    return sheet, index
 
-for name, color in PERSONALITIES:
-    n = name.lower()
-
-    # Static idle
-    img = make_frame(name, color, glow_intensity=0.15)
-    img.save(os.path.join(IMAGES_DIR, f"{n}_idle.png"))
-
-    # Static active (bright)
-    img = make_frame(name, color, glow_intensity=1.0)
-    img.save(os.path.join(IMAGES_DIR, f"{n}_active.png"))
 
-    # Thinking animation frames — sine-wave glow pulse
-    for i in range(THINKING_FRAMES):
-        intensity = 0.4 + 0.6 * (0.5 + 0.5 * math.sin(2 * math.pi * i / THINKING_FRAMES))
-        frame = make_frame(name, color, glow_intensity=intensity)
-        frame.save(os.path.join(IMAGES_DIR, f"{n}_thinking_{i:02d}.png"))
+print("Generating MAGI indicators + animation sprite sheets...")
+manifest = {"frame_size": [SIZE, SIZE], "sprites": {}}
 
-    # Speaking animation frames — rotating scanner + pulse
-    for i in range(SPEAKING_FRAMES):
-        angle = (360 / SPEAKING_FRAMES) * i
-        intensity = 0.7 + 0.3 * (0.5 + 0.5 * math.sin(2 * math.pi * i / SPEAKING_FRAMES))
-        frame = make_frame(name, color, glow_intensity=intensity, scan_angle=angle)
-        frame.save(os.path.join(IMAGES_DIR, f"{n}_speaking_{i:02d}.png"))
+for name, color in PERSONALITIES:
+    n = name.lower()
+    states = {
+        # Static idle / active (bright)
+        "idle":   [make_frame(name, color, glow_intensity=0.15)],
+        "active": [make_frame(name, color, glow_intensity=1.0)],
+        # Thinking animation frames — sine-wave glow pulse
+        "thinking": [make_frame(name, color, glow_intensity=0.4 + 0.6 * (
+            0.5 + 0.5 * math.sin(2 * math.pi * i / THINKING_FRAMES)))
+            for i in range(THINKING_FRAMES)],
+        # Speaking animation frames — rotating scanner + pulse
+        "speaking": [make_frame(name, color, scan_angle=(360 / SPEAKING_FRAMES) * i,
+                                glow_intensity=0.7 + 0.3 * (
+                                    0.5 + 0.5 * math.sin(2 * math.pi * i / SPEAKING_FRAMES)))
+                     for i in range(SPEAKING_FRAMES)],
+    }
+    states["idle"][0].save(os.path.join(IMAGES_DIR, f"{n}_idle.png"))
+    states["active"][0].save(os.path.join(IMAGES_DIR, f"{n}_active.png"))
+
+    sheet, index = pack_sheet(states)
+    sheet.save(os.path.join(IMAGES_DIR, f"{n}_sheet.png"), optimize=True)
+    manifest["sprites"][n] = {"sheet": f"{n}_sheet.png", "states": index}
 
     print(f"  {name}: idle, active, {THINKING_FRAMES} thinking frames, {SPEAKING_FRAMES} speaking frames")
 
+with open(os.path.join(IMAGES_DIR, "indicators.json"), "w", encoding="utf-8") as f:
+    json.dump(manifest, f, indent=2)
+
 print("Done.")
@@ -1,38 +1,105 @@
-import aiohttp
 from core.config import CONFIG
+from llm.session import get_session
+from llm.streaming import parse_sse_line, StreamAssembler
+from core.prompt_assembly import canonical, PrefixTracker
+from llm import tokens
 
 # Qwen 3.5 is a reasoning model that generates 5000+ tokens by default.
 # Three agents * 5000 tokens = 15k+ input to synthesis = context overflow.
 # Cap at 1500 tokens per agent call to keep synthesis input manageable.
 MAX_AGENT_TOKENS = CONFIG.get("MAX_AGENT_TOKENS", 1500)
 
-async def make_api_call(system_prompt, messages, stream=False, tools=None, max_tokens=None):
-    """
-    Connects to the local LLM server (e.g., LM Studio) and makes an API call.
-    Returns the parsed JSON response if stream=False, or an error dict.
-    """
+# Estimates KV-cache prefix reuse per call (one remembered prompt per server slot)
+PREFIX_TRACKER = PrefixTracker(CONFIG.get("LLM_PARALLEL_SLOTS", 3))
+
+
+def _build_request(system_prompt, messages, stream, tools, max_tokens):
     url = f"{CONFIG.get('LM_STUDIO_URL', 'http://localhost:1234/v1')}/chat/completions"
     model = CONFIG.get('MODEL_NAME', 'qwen3.5-35b-a3b')
 
+    # Canonical system prompt for prefix caching; messages go out exactly as the agents saw them
     payload = {
         "model": model,
-        "messages": [{"role": "system", "content": system_prompt}] + messages,
+        "messages": [{"role": "system", "content": canonical(system_prompt)}] + list(messages),
         "stream": stream,
         "max_tokens": max_tokens or MAX_AGENT_TOKENS,
     }
+    if stream:
+        # Ask for the usage trailer so the stats line still works when streaming
+        payload["stream_options"] = {"include_usage": True}
 
     if tools:
         payload["tools"] = tools
         payload["tool_choice"] = "auto"
 
+    return url, payload, PREFIX_TRACKER.observe(payload)
+
+
+def _calibrate(payload: dict, result: dict) -> None:
+    """Feed the server's real prompt token count back into the local estimator."""
+    chars = sum(len(m.get("content") or "") for m in payload["messages"])
+    tokens.observe(chars, (result.get("usage") or {}).get("prompt_tokens", 0))
+
+
+async def make_api_call(system_prompt, messages, stream=False, tools=None, max_tokens=None):
+    """
+    Connects to the local LLM server (e.g., LM Studio) and makes an API call.
+    Reuses the pooled session from llm/session.py — no per-call connect.
+    Returns the parsed JSON response (assembled from the stream if stream=True)
+    plus "prefix_hit" — the estimated share of the prompt served from the
+    server's KV cache — or an error dict.
+    """
+    if stream:
+        result = {"error": "Stream ended without a response"}
+        async for kind, value in stream_api_call(system_prompt, messages, tools, max_tokens):
+            if kind == "done":
+                result = value
+        return result
+
+    url, payload, prefix_hit = _build_request(system_prompt, messages, False, tools, max_tokens)
+
     try:
-        timeout = aiohttp.ClientTimeout(total=300)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    return {"error": f"HTTP {response.status}: {text}"}
+        async with get_session().post(url, json=payload) as response:
+            if response.status == 200:
+                result = await response.json()
+                result["prefix_hit"] = prefix_hit
+                _calibrate(payload, result)
+                return result
+            else:
+                text = await response.text()
+                return {"error": f"HTTP {response.status}: {text}"}
     except Exception as e:
         return {"error": str(e)}
+
+
+async def stream_api_call(system_prompt, messages, tools=None, max_tokens=None):
+    """
+    Streaming variant of make_api_call. Async generator of (kind, value) events:
+      ("delta", str)  — a content token, as soon as the server emits it
+      ("done", dict)  — always last: the assembled response in make_api_call's
+                        shape (tool_calls, usage, stats, prefix_hit), or an error dict
+    """
+    url, payload, prefix_hit = _build_request(system_prompt, messages, True, tools, max_tokens)
+    assembler = StreamAssembler()
+
+    try:
+        async with get_session().post(url, json=payload) as response:
+            if response.status != 200:
+                text = await response.text()
+                yield "done", {"error": f"HTTP {response.status}: {text}"}
+                return
+            async for line in response.content:
+                data = parse_sse_line(line)
+                if not data:
+                    continue
+                token = assembler.feed(data)
+                if token:
+                    yield "delta", token
+    except Exception as e:
+        yield "done", {"error": str(e)}
+        return
+
+    result = assembler.result()
+    result["prefix_hit"] = prefix_hit
+    _calibrate(payload, result)
+    yield "done", result
@@ -4,6 +4,7 @@ Returns same response shape as llm/client.py make_api_call.
 """
 import aiohttp
 from core.config import CONFIG
+from llm.session import get_session
 
 async def make_claude_call(system_prompt: str, messages: list) -> dict:
     """
@@ -29,14 +30,14 @@ async def make_claude_call(system_prompt: str, messages: list) -> dict:
 
     try:
         timeout = aiohttp.ClientTimeout(total=120)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post("https://api.anthropic.com/v1/messages", json=payload, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    # Normalize to OpenAI shape
-                    content = data.get("content", [{}])[0].get("text", "")
-                    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
-                text = await resp.text()
-                return {"error": f"Claude HTTP {resp.status}: {text}"}
+        async with get_session().post("https://api.anthropic.com/v1/messages", json=payload,
+                                      headers=headers, timeout=timeout) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                # Normalize to OpenAI shape
+                content = data.get("content", [{}])[0].get("text", "")
+                return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+            text = await resp.text()
+            return {"error": f"Claude HTTP {resp.status}: {text}"}
     except Exception as e:
         return {"error": str(e)}
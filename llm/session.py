@@ -0,0 +1,47 @@
+"""
+Pooled HTTP session for LLM calls.
+One long-lived aiohttp.ClientSession per event loop, backed by a keep-alive
+connection pool, so every call in a deliberation reuses warm connections
+instead of opening a new TCP connection to LM Studio each time.
+"""
+import asyncio
+import aiohttp
+from core.config import CONFIG
+
+POOL_LIMIT = CONFIG.get("HTTP_POOL_LIMIT", 8)               # max open connections
+KEEPALIVE_TIMEOUT = CONFIG.get("HTTP_KEEPALIVE_TIMEOUT", 60)  # idle seconds before close
+REQUEST_TIMEOUT = CONFIG.get("HTTP_TIMEOUT", 300)             # default total timeout
+
+_sessions: dict = {}  # event loop -> ClientSession
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the pooled session for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+
+    # Forget sessions whose loop is gone — they can never be reused
+    for stale in [l for l in _sessions if l.is_closed()]:
+        del _sessions[stale]
+
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_session() -> None:
+    """
+    Close the running loop's session and its connection pool.
+    Call this before the event loop is closed (app shutdown, end of a script).
+    """
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
@@ -1,7 +1,23 @@
 """
 SSE stream parser for LM Studio streaming responses.
 Parse streaming chunks and yield content tokens.
+StreamAssembler rebuilds the full non-streamed response shape from the chunks.
 """
+import json
+
+
+def parse_sse_line(line) -> dict | None:
+    """Decode one SSE line into its JSON payload. Returns None for keep-alives and [DONE]."""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    line = line.strip()
+    if not line.startswith("data: ") or line == "data: [DONE]":
+        return None
+    try:
+        return json.loads(line[6:])
+    except json.JSONDecodeError:
+        return None
+
 
 def parse_stream(response_lines) -> str:
     """
@@ -9,23 +25,71 @@ def parse_stream(response_lines) -> str:
     Yields each content token string as it arrives.
     Usage: async for chunk in response.content: parse_stream(chunk)
     """
-    import json
-
     for line in response_lines:
-        line = line.strip()
-        if not line or line == b"data: [DONE]" or line == "data: [DONE]":
+        data = parse_sse_line(line)
+        if not data:
             continue
+        delta = (data.get("choices") or [{}])[0].get("delta", {})
+        token = delta.get("content", "")
+        if token:
+            yield token
+
+
+class StreamAssembler:
+    """
+    Accumulates streamed chunks into the same dict make_api_call returns:
+    {"choices": [{"message": {...}, "finish_reason": ...}], "usage": {...}, "stats": {...}}
+    Tool-call deltas are merged by index; usage/stats trailers are kept as they arrive.
+    """
+
+    def __init__(self):
+        self.content = []
+        self.reasoning = []
+        self.tool_calls = {}  # index -> {"id", "type", "function": {"name", "arguments"}}
+        self.finish_reason = None
+        self.usage = {}
+        self.stats = {}
+
+    def feed(self, data: dict) -> str:
+        """Merge one chunk. Returns the visible content delta ('' if none)."""
+        if data.get("usage"):
+            self.usage = data["usage"]
+        if data.get("stats"):
+            self.stats = data["stats"]
+
+        choices = data.get("choices") or []
+        if not choices:
+            return ""
+        choice = choices[0]
+        if choice.get("finish_reason"):
+            self.finish_reason = choice["finish_reason"]
+
+        delta = choice.get("delta") or {}
+        if delta.get("reasoning_content"):
+            self.reasoning.append(delta["reasoning_content"])
+        for tc in delta.get("tool_calls") or []:
+            slot = self.tool_calls.setdefault(tc.get("index", 0), {
+                "id": "", "type": "function", "function": {"name": "", "arguments": ""}
+            })
+            if tc.get("id"):
+                slot["id"] = tc["id"]
+            fn = tc.get("function") or {}
+            slot["function"]["name"] += fn.get("name") or ""
+            slot["function"]["arguments"] += fn.get("arguments") or ""
+
+        token = delta.get("content") or ""
+        if token:
+            self.content.append(token)
+        return token
 
-        if isinstance(line, bytes):
-            line = line.decode("utf-8")
-
-        if line.startswith("data: "):
-            raw = line[6:]
-            try:
-                data = json.loads(raw)
-                delta = data.get("choices", [{}])[0].get("delta", {})
-                token = delta.get("content", "")
-                if token:
-                    yield token
-            except json.JSONDecodeError:
-                continue
+    def result(self) -> dict:
+        message = {"role": "assistant", "content": "".join(self.content)}
+        if self.reasoning:
+            message["reasoning_content"] = "".join(self.reasoning)
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+        return {
+            "choices": [{"message": message, "finish_reason": self.finish_reason}],
+            "usage": self.usage,
+            "stats": self.stats,
+        }
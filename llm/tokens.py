@@ -0,0 +1,59 @@
+"""
+Token counting for prompt budgeting.
+Uses tiktoken when installed. Otherwise estimates from characters, with the
+chars-per-token ratio calibrated against the prompt_tokens the server itself
+reports (its real tokenizer) on every call.
+"""
+import json
+from functools import lru_cache
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # not installed, or encoding files unavailable offline
+    _ENCODING = None
+
+_chars_per_token = 3.6  # starting guess for English prose + markdown; refined by observe()
+CACHE_MAX_CHARS = 2000  # only short, repeated strings are memoized; long ones aren't kept alive
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if len(text) <= CACHE_MAX_CHARS:
+        return _count_cached(text)
+    return _count(text)
+
+
+@lru_cache(maxsize=4096)
+def _count_cached(text: str) -> int:
+    return _count(text)
+
+
+def _count(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return max(1, round(len(text) / _chars_per_token))
+
+
+def count_messages(system_prompt: str, messages: list, tools: list = None) -> int:
+    """Approximate prompt size of a full chat request (incl. per-message template overhead)."""
+    total = count_tokens(system_prompt) + 4
+    for m in messages:
+        total += count_tokens(m.get("content") or "") + 4
+        if m.get("tool_calls"):
+            total += count_tokens(json.dumps(m["tool_calls"]))
+    if tools:
+        total += count_tokens(json.dumps(tools))
+    return total
+
+
+def observe(prompt_chars: int, prompt_tokens: int) -> None:
+    """Calibrate the estimator from server-reported usage (ignored when tiktoken is used)."""
+    global _chars_per_token
+    if _ENCODING is not None or prompt_chars < 200 or prompt_tokens <= 0:
+        return
+    ratio = prompt_chars / prompt_tokens
+    if 1.5 <= ratio <= 8.0:  # ignore nonsense from odd templates
+        _chars_per_token = 0.8 * _chars_per_token + 0.2 * ratio
+        _count_cached.cache_clear()
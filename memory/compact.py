@@ -0,0 +1,78 @@
+"""
+Retention / compaction for stored deliberations.
+Deliberations older than MEMORY_RETENTION_DAYS are rolled up into their
+keypoints: query, final decision and keypoints stay (keypoints are extracted
+now if the row never got any), the per-agent transcript in turns is deleted.
+The row's memory vector is dropped with it and, while indexing is on,
+re-embedded from the new keypoints.
+Runs as a background post-processing job.
+"""
+from core.config import CONFIG
+from memory.db import get_connection, run_async
+
+RETENTION_DAYS = CONFIG.get("MEMORY_RETENTION_DAYS", 90)
+BATCH = 50
+
+
+def due(days: int = None, limit: int = BATCH, after: int = 0) -> list[tuple[int, str, str, str]]:
+    """(id, query, final_decision, keypoints) of old deliberations that still have turns,
+    in id order starting after id `after`."""
+    days = RETENTION_DAYS if days is None else days
+    with get_connection() as conn:
+        return conn.execute(
+            "SELECT m.id, m.user_query, m.final_decision, m.keypoints FROM conversation_memory m "
+            "WHERE m.timestamp < datetime('now', ?) AND m.id > ? "
+            "AND EXISTS (SELECT 1 FROM turns t WHERE t.memory_id = m.id) "
+            "ORDER BY m.id LIMIT ?", (f"-{days} days", after, limit)).fetchall()
+
+
+def roll_up(memory_id: int, keypoints: str) -> bool:
+    """
+    Keep the keypoints, drop the transcript (the schema triggers re-index it).
+    Returns True if the keypoints changed, i.e. the row's memory vector is stale;
+    that vector is removed here.
+    """
+    from memory import vectors
+    with get_connection() as conn:
+        old = conn.execute("SELECT keypoints FROM conversation_memory WHERE id = ?",
+                           (memory_id,)).fetchone()
+        conn.execute("UPDATE conversation_memory SET keypoints = ? WHERE id = ?",
+                     (keypoints, memory_id))
+        conn.execute("DELETE FROM turns WHERE memory_id = ?", (memory_id,))
+    if old is None or (old[0] or "").strip() == keypoints.strip():
+        return False
+    vectors.get_index().remove([memory_id])  # embedded from the old text
+    return True
+
+
+async def compact(days: int = None, log=None) -> int:
+    """Roll up every deliberation past retention. Returns how many were compacted."""
+    from memory.extract import extract_keypoints
+    done = 0
+    stale = []
+    last = 0  # walk forward by id: a row whose extraction failed is tried once per run
+    while True:
+        rows = await run_async(due, days, BATCH, last)
+        if not rows:
+            break
+        last = rows[-1][0]
+        for memory_id, query, final, keypoints in rows:
+            kp = (keypoints or "").strip()
+            if not kp:
+                kp = await extract_keypoints(query or "", final or "")
+                if not kp or kp.startswith("[Error"):
+                    continue  # keep the transcript until keypoints can be made
+            if await run_async(roll_up, memory_id, kp):
+                stale.append(memory_id)
+            done += 1
+        if log:
+            log(f"[POST] Compacted {done} old deliberation(s) so far.")
+
+    from memory import vectors
+    if stale and vectors.indexing_enabled():
+        try:
+            await vectors.reindex(stale)
+        except Exception as e:  # best effort: recall falls back to recency for these rows
+            if log:
+                log(f"[POST] Re-embedding compacted rows skipped ({e}).")
+    return done
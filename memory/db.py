@@ -1,28 +1,100 @@
-import sqlite3
+"""
+SQLite storage layer for memory/.
+One connection per thread per database file, opened on first use and kept —
+no connect or schema cost per operation. WAL journaling lets the background
+post-processor write while the UI thread reads. The schema is created and
+upgraded lazily by the numbered migrations in memory/schema.py, tracked in
+schema_version.
+run_async() is the facade for coroutines: the query runs in a worker thread
+so the event loop never waits on disk.
+"""
+import asyncio
 import os
+import sqlite3
+import threading
+from memory.schema import MIGRATIONS, unpack
 
 DB_PATH = "data/magi.db"
 
-def get_connection():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",     # durable at checkpoints; safe with WAL
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped reads
+    "PRAGMA cache_size=-16000",      # 16 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",      # wait for a writer instead of failing
+)
 
-def init_db():
-    """Initialize the MAGI SQLite database with required tables."""
-    with get_connection() as conn:
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS conversation_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                user_query TEXT,
-                melchior_response TEXT,
-                balthasar_response TEXT,
-                casper_response TEXT,
-                final_decision TEXT,
-                keypoints TEXT
-            )
-        ''')
+_local = threading.local()
+_migrated: set[str] = set()
+_migrate_lock = threading.Lock()
+
+
+def _open(path: str) -> sqlite3.Connection:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5, cached_statements=256)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    # memory_search (and the FTS triggers reading it) decompress turn bodies in SQL.
+    # Connections opened elsewhere lack it, so their writes to conversation_memory
+    # or turns fail instead of leaving memory_fts out of sync (memory/schema.py).
+    conn.create_function("unpack", 2, unpack, deterministic=True)
+    return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    This thread's connection to DB_PATH, migrated to the latest schema.
+    Use as `with get_connection() as conn:` — commits on exit, stays open.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(DB_PATH)
+    if conn is None:
+        conn = conns[DB_PATH] = _open(DB_PATH)
+    if DB_PATH not in _migrated:
+        migrate(conn)
+    return conn
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """Apply pending migrations, each in its own transaction. Once per file per process."""
+    with _migrate_lock:
+        if DB_PATH in _migrated:
+            return
+        current = schema_version(conn)
+        for version, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            with conn:
+                conn.execute("BEGIN")  # DDL included — a migration applies fully or not at all
+                for step in steps:
+                    step(conn) if callable(step) else conn.execute(step)
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
         conn.commit()
+        _migrated.add(DB_PATH)
+
+
+def init_db():
+    """Initialize the MAGI SQLite database (runs any pending migrations)."""
+    get_connection()
+
+
+def close() -> None:
+    """Close this thread's connections (end of a worker thread, tests)."""
+    for conn in getattr(_local, "conns", {}).values():
+        conn.close()
+    _local.conns = {}
+
 
-# Ensure DB is initialized on module load
-init_db()
+async def run_async(fn, *args, **kwargs):
+    """Run a blocking memory/ function in a worker thread and await its result."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
@@ -0,0 +1,57 @@
+"""
+Text embeddings for semantic memory.
+EMBEDDING_BACKEND:
+  "lmstudio" — LM Studio's OpenAI-compatible /v1/embeddings with EMBEDDING_MODEL
+  "hashed"   — offline fallback: signed feature hashing of char n-grams folded
+               into HASHED_DIM dimensions (lexical, not semantic, but free)
+All vectors come back L2-normalized float32, so dot product = cosine.
+"""
+import numpy as np
+from core.config import CONFIG
+from core.lexical_model import features
+from llm.session import get_session
+
+BACKEND = CONFIG.get("EMBEDDING_BACKEND", "lmstudio")
+MODEL = CONFIG.get("EMBEDDING_MODEL", "text-embedding-nomic-embed-text-v1.5")
+HASHED_DIM = 256
+BATCH = 32
+
+
+def model_id() -> str:
+    """Identifies the vector space — vectors from different ids never mix."""
+    return MODEL if BACKEND == "lmstudio" else f"hashed-{HASHED_DIM}"
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.where(norms == 0, 1.0, norms)
+
+
+def hashed_embed(texts: list[str]) -> np.ndarray:
+    out = np.zeros((len(texts), HASHED_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for idx, value in features(text).items():
+            sign = 1.0 if (idx >> 14) & 1 else -1.0  # top feature bit picks the sign
+            out[row, idx % HASHED_DIM] += sign * value
+    return _normalize(out)
+
+
+async def _lmstudio_embed(texts: list[str]) -> np.ndarray:
+    url = f"{CONFIG.get('LM_STUDIO_URL', 'http://localhost:1234/v1')}/embeddings"
+    rows = []
+    for i in range(0, len(texts), BATCH):
+        async with get_session().post(url, json={"model": MODEL, "input": texts[i:i + BATCH]}) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}: {await resp.text()}")
+            data = (await resp.json())["data"]
+        rows.extend(d["embedding"] for d in sorted(data, key=lambda d: d["index"]))
+    return _normalize(np.asarray(rows, dtype=np.float32))
+
+
+async def embed(texts: list[str]) -> np.ndarray:
+    """(len(texts), dim) float32, L2-normalized. Raises if the server can't embed."""
+    if not texts:
+        return np.zeros((0, HASHED_DIM), dtype=np.float32)
+    if BACKEND == "lmstudio":
+        return await _lmstudio_embed(texts)
+    return hashed_embed(texts)
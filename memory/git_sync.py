@@ -2,18 +2,27 @@
 memory/git_sync.py
 
 Syncs memory files to the configured git remote.
-Called when Git Mode is enabled after each deliberation.
+Used when Git Mode is enabled: each deliberation notifies the sync daemon,
+which runs every git command on its own thread so a query never waits on git.
 
 What gets synced:
   - memory/pinned.md    (pinned conversations)
   - memory/clipboard.json  (session clipboard items)
 
+Changes are coalesced: a commit is made once no new change has arrived for
+GIT_SYNC_DEBOUNCE seconds (or GIT_SYNC_MAX_DELAY after the first one), and
+commits are pushed every GIT_PUSH_INTERVAL seconds and on exit. A failed
+commit or push is retried with exponential backoff.
+
 On a new machine: git pull, then MAGI loads clipboard.json on startup.
 """
 import json
 import subprocess
 import os
+import threading
+import time
 from datetime import datetime
+from core.config import CONFIG
 
 # Path to the memory directory (relative to repo root)
 _MEMORY_DIR = os.path.join(os.path.dirname(__file__))
@@ -22,13 +31,19 @@ _REPO_ROOT = os.path.dirname(_MEMORY_DIR)
 CLIPBOARD_PATH = os.path.join(_MEMORY_DIR, "clipboard.json")
 PINNED_PATH = os.path.join(_MEMORY_DIR, "pinned.md")
 
+DEBOUNCE = CONFIG.get("GIT_SYNC_DEBOUNCE", 20)        # quiet seconds before a commit
+MAX_DELAY = CONFIG.get("GIT_SYNC_MAX_DELAY", 120)     # commit at the latest this long after a change
+PUSH_INTERVAL = CONFIG.get("GIT_PUSH_INTERVAL", 300)  # seconds between pushes
+RETRY_BASE = CONFIG.get("GIT_RETRY_BASE", 5)          # first backoff step, doubled per failure
+RETRY_MAX = CONFIG.get("GIT_RETRY_MAX", 900)
+
 
-def _run(cmd: list[str]) -> tuple[bool, str]:
+def _run(cmd: list[str], cwd: str = _REPO_ROOT) -> tuple[bool, str]:
     """Run a git command in the repo root. Returns (success, output)."""
     try:
         result = subprocess.run(
             cmd,
-            cwd=_REPO_ROOT,
+            cwd=cwd,
             capture_output=True,
             text=True,
             timeout=30
@@ -40,10 +55,10 @@ def _run(cmd: list[str]) -> tuple[bool, str]:
         return False, str(e)
 
 
-def save_clipboard(clipboard: list[str]) -> None:
+def save_clipboard(clipboard: list[str], path: str = CLIPBOARD_PATH) -> None:
     """Persist clipboard to disk so it can be committed and pulled on other machines."""
     try:
-        with open(CLIPBOARD_PATH, "w", encoding="utf-8") as f:
+        with open(path, "w", encoding="utf-8") as f:
             json.dump({"items": clipboard, "updated": datetime.now().isoformat()}, f, indent=2)
     except Exception:
         pass
@@ -61,43 +76,158 @@ def load_clipboard() -> list[str]:
     return []
 
 
-def pull() -> tuple[bool, str]:
-    """Pull latest changes from remote (call on startup in git mode)."""
-    return _run(["git", "pull", "--rebase", "origin"])
+def pull(repo: str = _REPO_ROOT) -> tuple[bool, str]:
+    """Pull latest changes from remote (the daemon does this once when it starts)."""
+    return _run(["git", "pull", "--rebase", "origin"], repo)
 
 
-def sync(commit_message: str = None) -> tuple[bool, str]:
-    """
-    Stage memory files, commit, and push.
-    Returns (success, status_message).
-    """
-    if not commit_message:
-        commit_message = f"MAGI memory sync [{datetime.now().strftime('%Y-%m-%d %H:%M')}]"
-
+def commit(message: str, repo: str = _REPO_ROOT, paths: list[str] = None) -> tuple[bool, str]:
+    """Stage the memory files and commit them. Never pushes. Returns (committed, status)."""
     # Stage only memory files -- never the whole repo
-    files_to_stage = []
-    for path in [CLIPBOARD_PATH, PINNED_PATH]:
-        if os.path.exists(path):
-            files_to_stage.append(path)
-
+    files_to_stage = [p for p in (paths or [CLIPBOARD_PATH, PINNED_PATH]) if os.path.exists(p)]
     if not files_to_stage:
-        return True, "Nothing to sync."
+        return False, "Nothing to sync."
 
-    ok, out = _run(["git", "add"] + files_to_stage)
+    ok, out = _run(["git", "add"] + files_to_stage, repo)
     if not ok:
-        return False, f"git add failed: {out}"
+        raise RuntimeError(f"git add failed: {out}")
 
     # Check if there's actually anything to commit
-    check_ok, check_out = _run(["git", "diff", "--cached", "--quiet"])
+    check_ok, _ = _run(["git", "diff", "--cached", "--quiet"], repo)
     if check_ok:  # exit 0 = nothing staged
-        return True, "Memory unchanged -- nothing to push."
+        return False, "Memory unchanged -- nothing to commit."
 
-    ok, out = _run(["git", "commit", "-m", commit_message])
+    ok, out = _run(["git", "commit", "-m", message], repo)
     if not ok:
-        return False, f"git commit failed: {out}"
-
-    ok, out = _run(["git", "push", "origin"])
-    if not ok:
-        return False, f"git push failed: {out}"
-
-    return True, f"Synced to git: {commit_message}"
+        raise RuntimeError(f"git commit failed: {out}")
+    return True, f"Committed: {message.splitlines()[0]}"
+
+
+class SyncDaemon:
+    """Background thread that batches memory changes into commits and pushes them."""
+
+    def __init__(self, repo: str = _REPO_ROOT, paths: list[str] = None,
+                 clipboard_path: str = CLIPBOARD_PATH, log=None,
+                 debounce: float = DEBOUNCE, max_delay: float = MAX_DELAY,
+                 push_interval: float = PUSH_INTERVAL):
+        self.repo = repo
+        self.paths = paths or [CLIPBOARD_PATH, PINNED_PATH]
+        self.clipboard_path = clipboard_path
+        self.log = log           # optional callable(str), called from the daemon thread
+        self.debounce, self.max_delay, self.push_interval = debounce, max_delay, push_interval
+        self.commits = 0
+        self.pushes = 0
+        self.failures = 0        # consecutive failed attempts (drives the backoff)
+        self._cond = threading.Condition()
+        self._messages: list[str] = []
+        self._clipboard = None
+        self._first_change = self._last_change = None
+        self._unpushed = False
+        self._next_push = 0.0
+        self._retry_at = 0.0
+        self._stopping = False
+        self._thread = None
+
+    # ── Public API (any thread, never blocks on git) ─────────────────────────
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop,
+                                            name="git-sync", daemon=True)
+            self._thread.start()
+
+    def notify(self, message: str, clipboard: list[str] = None) -> None:
+        """Record a change; it is committed once changes stop arriving."""
+        with self._cond:
+            now = time.monotonic()
+            if clipboard is not None:
+                self._clipboard = list(clipboard)
+            self._messages.append(message)
+            self._first_change = self._first_change or now
+            self._last_change = now
+            self._cond.notify()
+        self.start()
+
+    def stop(self, timeout: float = 60) -> None:
+        """Commit and push whatever is pending, then end the thread (call on exit)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ── Daemon thread ────────────────────────────────────────────────────────
+
+    def _due(self, now: float) -> tuple[bool, bool, float]:
+        """(commit due, push due, seconds until the next deadline)."""
+        deadlines = []
+        if self._messages:
+            deadlines.append(max(self._retry_at, min(self._last_change + self.debounce,
+                                                     self._first_change + self.max_delay)))
+        if self._unpushed:
+            deadlines.append(max(self._retry_at, self._next_push))
+        if self._stopping:
+            return bool(self._messages), self._unpushed, 0
+        commit_due = bool(self._messages) and deadlines[0] <= now
+        push_due = self._unpushed and deadlines[-1] <= now
+        return commit_due, push_due, (min(deadlines) - now if deadlines else None)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    commit_due, push_due, wait = self._due(time.monotonic())
+                    if commit_due or push_due or self._stopping:
+                        break
+                    self._cond.wait(wait)
+                stopping = self._stopping
+                messages, clipboard = (self._messages, self._clipboard) if commit_due else ([], None)
+                if commit_due:
+                    self._messages, self._clipboard, self._first_change = [], None, None
+
+            if messages and not self._commit(messages, clipboard):
+                with self._cond:  # put the batch back in front of newer changes
+                    self._messages[:0] = messages
+                    self._first_change = self._first_change or time.monotonic()
+            if self._unpushed and (push_due or stopping):
+                self._push()
+            if stopping:
+                return
+
+    def _commit(self, messages: list[str], clipboard) -> bool:
+        if clipboard is not None:
+            save_clipboard(clipboard, self.clipboard_path)
+        message = messages[0] if len(messages) == 1 else (
+            f"MAGI memory sync: {len(messages)} sessions [{datetime.now().strftime('%Y-%m-%d %H:%M')}]\n\n"
+            + "\n".join(f"- {m}" for m in messages))
+        try:
+            committed, status = commit(message, self.repo, self.paths)
+        except RuntimeError as e:
+            self._backoff(str(e))
+            return False
+        if committed:
+            self.commits += 1
+            self._unpushed = True
+            self._emit(f"[GIT] {status}")
+        return True
+
+    def _push(self) -> None:
+        ok, out = _run(["git", "push", "origin", "HEAD"], self.repo)
+        if not ok:
+            self._backoff(f"git push failed: {out.strip()[:200]}")
+            return
+        self.pushes += 1
+        self.failures, self._retry_at = 0, 0.0
+        self._unpushed = False
+        self._next_push = time.monotonic() + self.push_interval
+        self._emit("[GIT] Pushed memory to remote.")
+
+    def _backoff(self, error: str) -> None:
+        self.failures += 1
+        delay = min(RETRY_MAX, RETRY_BASE * 2 ** (self.failures - 1))
+        self._retry_at = time.monotonic() + delay
+        self._emit(f"[GIT] {error} — retrying in {delay:.0f}s")
+
+    def _emit(self, msg: str) -> None:
+        if self.log:
+            self.log(msg)
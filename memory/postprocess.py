@@ -0,0 +1,134 @@
+"""
+Background post-processing for finished deliberations.
+Keypoint extraction (a full LLM call), SQLite storage and compaction run on a
+queue worker instead of inline in process_query, so the user never waits on
+them. Pending jobs are persisted to disk and resumed on the next start; a
+resumed store job that already wrote its row finds it by job id and only
+redoes the steps after it.
+"""
+import asyncio
+import json
+import os
+import uuid
+from core.config import CONFIG
+
+QUEUE_PATH = "data/postprocess_queue.json"
+
+
+class PostProcessor:
+    def __init__(self, path: str = QUEUE_PATH):
+        self.path = path
+        self.log = None          # optional callable(str) for status messages
+        self.processed = 0
+        self.failed = 0
+        self._pending: dict[str, dict] = self._load()  # job id -> job, in submit order
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    @property
+    def depth(self) -> int:
+        """Jobs submitted but not yet finished (the queue-depth metric)."""
+        return len(self._pending)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def submit(self, kind: str, **data) -> str:
+        """Queue a job ('store' or 'compact'). Must be called from a running event loop."""
+        self._ensure_worker()
+        job = {"id": uuid.uuid4().hex, "kind": kind, **data}
+        self._pending[job["id"]] = job
+        self._save()
+        self._queue.put_nowait(job)
+        return job["id"]
+
+    async def flush(self) -> None:
+        """Wait until every queued job (including ones resumed from disk) is done."""
+        if self._pending:
+            self._ensure_worker()
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker and not self._worker.done():
+            return
+        # First use on this loop: resume everything still pending (incl. from disk)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        for job in self._pending.values():
+            self._queue.put_nowait(job)
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise  # loop shutting down mid-job — keep it pending on disk
+            except Exception as e:
+                self.failed += 1
+                self._emit(f"[POST] {job['kind']} job failed: {e}")
+            self._pending.pop(job["id"], None)
+            self._save()
+            self._queue.task_done()
+
+    async def _process(self, job: dict) -> None:
+        if job["kind"] == "store":
+            from memory.extract import extract_keypoints
+            from memory.store import store_conversation
+            from memory.db import run_async
+            kp = ""
+            if CONFIG.get("AUTO_EXTRACT_KEYPOINTS", True):
+                kp = await extract_keypoints(job["query"], job["store_text"])
+            # Keyed by job id: a job cut off after the insert and resumed isn't stored twice
+            await run_async(store_conversation, job["query"], job["responses"], kp,
+                            job.get("session"), job.get("turns"), job["id"])
+            self._emit(f"[POST] Stored to memory (queue depth {self.depth - 1}).")
+            from memory.vectors import indexing_enabled
+            if indexing_enabled():
+                await self._index_vectors()
+
+        elif job["kind"] == "compact":
+            from memory.compact import compact
+            done = await compact(log=self._emit)
+            if done:
+                self._emit(f"[POST] Rolled {done} old deliberation(s) up into keypoints.")
+
+        else:
+            raise ValueError(f"unknown job kind '{job['kind']}'")
+
+    async def _index_vectors(self) -> None:
+        """Incremental semantic index update. Best effort — the row is already stored."""
+        from memory import vectors
+        try:
+            added = await vectors.sync()
+            if added:
+                self._emit(f"[POST] Indexed {added} memory vector(s).")
+        except Exception as e:
+            self._emit(f"[POST] Vector index skipped ({e}); will catch up next time.")
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def _emit(self, msg: str) -> None:
+        if self.log:
+            self.log(msg)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return {job["id"]: job for job in json.load(f)}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(list(self._pending.values()), f)
+        except OSError:
+            pass
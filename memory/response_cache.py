@@ -0,0 +1,103 @@
+"""
+Response cache for repeated and near-duplicate queries.
+Keyed on the normalized query plus a fingerprint of everything else that
+shapes the answer (address mode, debate/refinement flags, context file,
+clipboard, model). Exact hits by key; near-duplicates by MinHash similarity
+within the same fingerprint. TTL + LRU eviction. Lives in data/magi.db
+(schema: memory/db.py migration 2).
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from core.config import CONFIG
+from memory.db import get_connection
+
+TTL_SECONDS = CONFIG.get("RESPONSE_CACHE_TTL", 24 * 3600)
+MAX_ENTRIES = CONFIG.get("RESPONSE_CACHE_MAX", 500)
+NEAR_THRESHOLD = CONFIG.get("RESPONSE_CACHE_NEAR_THRESHOLD", 0.9)  # 0 = exact only
+
+NUM_PERM = 64
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1998)  # fixed seed — signatures must match across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+def normalize_query(query: str) -> str:
+    """Folds case, whitespace and closing punctuation only — symbols carry meaning
+    ("C++" vs "C", "node.js", "x-ray") and stay in the key."""
+    text = re.sub(r"\s+", " ", query.lower()).strip()
+    return re.sub(r"[\s?!.]+$", "", text)
+
+
+def config_fingerprint(address_mode: str, debate_mode: bool, refinement_mode: bool,
+                       context_text: str, clipboard: list[str]) -> str:
+    state = {
+        "address": address_mode,
+        "debate": bool(debate_mode),
+        "refine": bool(refinement_mode),
+        "context": hashlib.sha256(context_text.encode("utf-8")).hexdigest(),
+        "clipboard": list(clipboard),
+        "model": CONFIG.get("MODEL_NAME", "qwen3.5-35b-a3b"),
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def minhash(query_norm: str) -> list[int]:
+    words = query_norm.split()
+    shingles = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+              for s in shingles] or [0]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def _similarity(sig1: list[int], sig2: list[int]) -> float:
+    return sum(x == y for x, y in zip(sig1, sig2)) / NUM_PERM
+
+
+def lookup(query: str, fingerprint: str) -> tuple[dict, str] | None:
+    """Returns (responses, match) where match is 'exact' or 'near 0.93', or None."""
+    norm = normalize_query(query)
+    key = hashlib.sha256(f"{fingerprint}|{norm}".encode("utf-8")).hexdigest()
+    cutoff = time.time() - TTL_SECONDS
+
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT key, responses FROM response_cache WHERE key = ? AND created >= ?",
+            (key, cutoff)).fetchone()
+        match = "exact"
+
+        if row is None and NEAR_THRESHOLD > 0:
+            sig = minhash(norm)
+            best, best_sim = None, NEAR_THRESHOLD
+            for cand_key, cand_sig, cand_resp in conn.execute(
+                    "SELECT key, signature, responses FROM response_cache "
+                    "WHERE fingerprint = ? AND created >= ?", (fingerprint, cutoff)):
+                sim = _similarity(sig, json.loads(cand_sig))
+                if sim >= best_sim:
+                    best, best_sim = (cand_key, cand_resp), sim
+            if best:
+                row, match = best, f"near {best_sim:.2f}"
+
+        if row is None:
+            return None
+        conn.execute("UPDATE response_cache SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                     (time.time(), row[0]))
+    return json.loads(row[1]), match
+
+
+def store(query: str, fingerprint: str, responses: dict) -> None:
+    """Cache a finished deliberation, then expire old rows and evict least recently used."""
+    norm = normalize_query(query)
+    key = hashlib.sha256(f"{fingerprint}|{norm}".encode("utf-8")).hexdigest()
+    now = time.time()
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache "
+            "(key, fingerprint, query_norm, signature, responses, created, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, fingerprint, norm, json.dumps(minhash(norm)), json.dumps(responses), now, now))
+        conn.execute("DELETE FROM response_cache WHERE created < ?", (now - TTL_SECONDS,))
+        conn.execute(
+            "DELETE FROM response_cache WHERE key NOT IN "
+            "(SELECT key FROM response_cache ORDER BY last_used DESC LIMIT ?)", (MAX_ENTRIES,))
@@ -1,14 +1,38 @@
-from memory.db import get_connection
+from memory.db import get_connection, run_async
+from core.budget import MEMORY_TOKENS
+from llm.tokens import count_tokens
 
-# Hard cap on injected memory to prevent context overflow
-MAX_CONTEXT_CHARS = 1200
+# Cosine score below which a "nearest" memory is unrelated noise
+MIN_RELEVANCE = 0.3
+
+
+def _format_memory(rows) -> str:
+    """(query, keypoints) rows, oldest first → the historical memory block, MEMORY_TOKENS-capped."""
+    parts = []
+    total = 0
+    for query, keypoints in rows:
+        # Skip empty keypoints — don't fall back to full responses
+        kp = (keypoints or "").strip()
+        if not kp:
+            continue
+        entry = f"Q: {query.strip()[:120]}\nKey points: {kp}\n"
+        size = count_tokens(entry)
+        if total + size > MEMORY_TOKENS:
+            break
+        parts.append(entry)
+        total += size
+
+    if not parts:
+        return ""
+
+    return "[HISTORICAL MEMORY — for reference only, do not treat as current state]\n" + "\n".join(parts) + "[/HISTORICAL MEMORY]\n\n"
 
 
 def retrieve_recent_context(limit: int = 3) -> str:
     """
     Retrieves keypoints from recent conversations as compact context.
     Uses keypoints (short bullet summaries) NOT full responses.
-    Hard-capped at MAX_CONTEXT_CHARS to prevent context overflow.
+    Hard-capped at MEMORY_TOKENS (core/budget.py) to prevent context overflow.
     """
     with get_connection() as conn:
         cursor = conn.cursor()
@@ -19,23 +43,29 @@ def retrieve_recent_context(limit: int = 3) -> str:
         )
         rows = cursor.fetchall()
 
-    if not rows:
-        return ""
+    return _format_memory(reversed(rows))
 
-    parts = []
-    total = 0
-    for query, keypoints in reversed(rows):
-        # Skip empty keypoints — don't fall back to full responses
-        kp = (keypoints or "").strip()
-        if not kp:
-            continue
-        entry = f"Q: {query.strip()[:120]}\nKey points: {kp}\n"
-        if total + len(entry) > MAX_CONTEXT_CHARS:
-            break
-        parts.append(entry)
-        total += len(entry)
 
-    if not parts:
-        return ""
+def _rows_by_id(ids: list[int]) -> list[tuple[str, str]]:
+    with get_connection() as conn:
+        found = dict((i, (q, kp)) for i, q, kp in conn.execute(
+            f"SELECT id, user_query, keypoints FROM conversation_memory "
+            f"WHERE id IN ({','.join('?' * len(ids))})", ids))
+    return [found[i] for i in ids if i in found]
 
-    return "[HISTORICAL MEMORY — for reference only, do not treat as current state]\n" + "\n".join(parts) + "[/HISTORICAL MEMORY]\n\n"
+
+async def retrieve_relevant_context(query: str, limit: int = 3) -> str:
+    """
+    Keypoints of the past conversations most similar to this query
+    (memory/vectors.py), best match first. Falls back to the most recent
+    ones when the index is empty, nothing is relevant, or embedding fails.
+    """
+    from memory import vectors
+    try:
+        hits = [(i, s) for i, s in await vectors.search(query, limit) if s >= MIN_RELEVANCE]
+    except Exception:
+        hits = []
+    if not hits:
+        return await run_async(retrieve_recent_context, limit)
+    rows = await run_async(_rows_by_id, [i for i, _ in hits])
+    return _format_memory(rows)
@@ -0,0 +1,263 @@
+"""
+Schema migrations for data/magi.db, applied in order by memory/db.py.
+A step is SQL or a callable(conn). Append only; never edit a shipped one.
+
+Layout since migration 4:
+  sessions             one row per app session
+  conversation_memory  one row per deliberation: query, final decision, keypoints
+  turns                one row per agent utterance (debate rounds included),
+                       body zlib-compressed above a size threshold
+  memory_fts           full-text index over the memory_search view, which
+                       joins each deliberation with its decompressed turns;
+                       kept in sync by triggers on both tables (migration 6)
+  response_cache       memory/response_cache.py (migration 2)
+  tool_cache           tools/cache.py (migration 5)
+"""
+import sqlite3
+import zlib
+
+COMPRESS_THRESHOLD = 512  # bytes; smaller bodies aren't worth the CPU
+
+
+def pack(text: str) -> tuple[bytes, int]:
+    """Text → (body, compressed flag)."""
+    raw = (text or "").encode("utf-8")
+    if len(raw) > COMPRESS_THRESHOLD:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return packed, 1
+    return raw, 0
+
+
+def unpack(body, compressed) -> str:
+    """Inverse of pack(); also registered as the SQL function unpack(body, compressed)."""
+    if body is None:
+        return ""
+    return (zlib.decompress(body) if compressed else bytes(body)).decode("utf-8")
+
+
+def _create_fts_v1(conn: sqlite3.Connection) -> None:
+    """Full-text index over conversation_memory, synced by triggers, backfilled once."""
+    columns = ("user_query", "melchior_response", "balthasar_response",
+               "casper_response", "final_decision", "keypoints")
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    try:
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                {cols},
+                content='conversation_memory', content_rowid='id',
+                tokenize='porter unicode61'
+            )''')
+    except sqlite3.OperationalError:
+        return  # SQLite built without FTS5 — memory/search.py falls back to LIKE
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS memory_fts_ai AFTER INSERT ON conversation_memory BEGIN
+            INSERT INTO memory_fts(rowid, {cols}) VALUES (new.id, {new});
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS memory_fts_ad AFTER DELETE ON conversation_memory BEGIN
+            INSERT INTO memory_fts(memory_fts, rowid, {cols}) VALUES ('delete', old.id, {old});
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS memory_fts_au AFTER UPDATE ON conversation_memory BEGIN
+            INSERT INTO memory_fts(memory_fts, rowid, {cols}) VALUES ('delete', old.id, {old});
+            INSERT INTO memory_fts(rowid, {cols}) VALUES (new.id, {new});
+        END''')
+    conn.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")  # backfill
+
+
+FTS_COLUMNS = ("user_query", "responses", "final_decision", "keypoints")
+
+
+def _split_turns(conn: sqlite3.Connection) -> None:
+    """Sessions + turns tables; move the per-agent columns of existing rows into turns."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT UNIQUE,
+            started DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_active DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS turns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            memory_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            speaker TEXT,
+            round INTEGER DEFAULT 0,
+            kind TEXT,
+            body BLOB,
+            compressed INTEGER DEFAULT 0,
+            is_final INTEGER DEFAULT 0,
+            chars INTEGER DEFAULT 0
+        )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_turns_memory ON turns(memory_id, seq)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(last_active)")
+    conn.execute("ALTER TABLE conversation_memory ADD COLUMN session_id INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_session "
+                 "ON conversation_memory(session_id, timestamp)")
+
+    legacy = conn.execute(
+        "SELECT id, casper_response, balthasar_response, melchior_response, final_decision "
+        "FROM conversation_memory").fetchall()
+    if legacy:
+        conn.execute("INSERT INTO sessions (key) VALUES ('legacy')")
+        session_id = conn.execute("SELECT id FROM sessions WHERE key = 'legacy'").fetchone()[0]
+        conn.execute("UPDATE conversation_memory SET session_id = ?", (session_id,))
+    for memory_id, *agents, final in legacy:
+        seq = 0
+        for speaker, text in zip(("CASPER", "BALTHASAR", "MELCHIOR"), agents):
+            if text:
+                is_final = int(text == final)  # already stored as final_decision
+                body, z = pack("" if is_final else text)
+                conn.execute(
+                    "INSERT INTO turns (memory_id, seq, speaker, round, kind, body, compressed, "
+                    "is_final, chars) VALUES (?, ?, ?, 0, 'reply', ?, ?, ?, ?)",
+                    (memory_id, seq, speaker, body, z, is_final, len(text)))
+                seq += 1
+    conn.execute("UPDATE conversation_memory SET melchior_response = NULL, "
+                 "balthasar_response = NULL, casper_response = NULL")
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS turns_cleanup AFTER DELETE ON conversation_memory BEGIN
+            DELETE FROM turns WHERE memory_id = old.id;
+        END''')
+
+
+def _reindex_fts(conn: sqlite3.Connection) -> None:
+    """Point memory_fts at the memory_search view (deliberation + decompressed turns)."""
+    conn.execute('''
+        CREATE VIEW IF NOT EXISTS memory_search AS
+        SELECT m.id AS id, m.user_query AS user_query,
+               (SELECT group_concat(t, ' ') FROM (
+                    SELECT unpack(body, compressed) AS t FROM turns
+                    WHERE memory_id = m.id ORDER BY seq)) AS responses,
+               m.final_decision AS final_decision, m.keypoints AS keypoints
+        FROM conversation_memory m''')
+    for trigger in ("memory_fts_ai", "memory_fts_ad", "memory_fts_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS memory_fts")
+
+    cols = ", ".join(FTS_COLUMNS)
+    try:
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE memory_fts USING fts5(
+                {cols}, content='memory_search', content_rowid='id',
+                tokenize='porter unicode61'
+            )''')
+    except sqlite3.OperationalError:
+        return  # no FTS5 — LIKE fallback
+    # Inserts are indexed by memory/store.py once the turns exist.
+    # Deletes/updates remove the old entry while the old turns are still readable.
+    delete_old = (f"INSERT INTO memory_fts(memory_fts, rowid, {cols}) "
+                  f"SELECT 'delete', id, {cols} FROM memory_search WHERE id = old.id;")
+    conn.execute(f'''
+        CREATE TRIGGER memory_fts_bd BEFORE DELETE ON conversation_memory BEGIN
+            {delete_old}
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER memory_fts_bu BEFORE UPDATE ON conversation_memory BEGIN
+            {delete_old}
+        END''')
+    conn.execute(f'''
+        CREATE TRIGGER memory_fts_au AFTER UPDATE ON conversation_memory BEGIN
+            INSERT INTO memory_fts(rowid, {cols})
+            SELECT id, {cols} FROM memory_search WHERE id = new.id;
+        END''')
+    conn.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")
+
+
+def _sync_fts_by_triggers(conn: sqlite3.Connection) -> None:
+    """
+    Every write to conversation_memory or turns re-indexes the deliberation it
+    touches: BEFORE triggers remove the entry while the old text is still
+    readable through memory_search, AFTER triggers add it back from the new text.
+    The triggers read memory_search, which calls the unpack() SQL function. So
+    every write must go through a connection from memory/db.py, which
+    registers it. A bare sqlite3 connection (CLI, sqlite3.connect) can read, but
+    its writes fail with "no such function: unpack" and change nothing. The index
+    can't drift out of sync that way.
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'memory_fts'").fetchone():
+        return  # no FTS5 — LIKE fallback
+    for trigger in ("memory_fts_bd", "memory_fts_bu", "memory_fts_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    cols = ", ".join(FTS_COLUMNS)
+
+    def remove(memory_id: str) -> str:
+        return (f"INSERT INTO memory_fts(memory_fts, rowid, {cols}) "
+                f"SELECT 'delete', id, {cols} FROM memory_search WHERE id = {memory_id};")
+
+    def add(memory_id: str) -> str:
+        return f"INSERT INTO memory_fts(rowid, {cols}) SELECT id, {cols} FROM memory_search WHERE id = {memory_id};"
+
+    triggers = [
+        ("memory_fts_ai", "AFTER INSERT ON conversation_memory", add("new.id")),
+        ("memory_fts_bu", "BEFORE UPDATE ON conversation_memory", remove("old.id")),
+        ("memory_fts_au", "AFTER UPDATE ON conversation_memory", add("new.id")),
+        ("memory_fts_bd", "BEFORE DELETE ON conversation_memory", remove("old.id")),
+        ("turns_fts_bi", "BEFORE INSERT ON turns", remove("new.memory_id")),
+        ("turns_fts_ai", "AFTER INSERT ON turns", add("new.memory_id")),
+        ("turns_fts_bu", "BEFORE UPDATE ON turns", remove("old.memory_id")),
+        ("turns_fts_au", "AFTER UPDATE ON turns", add("new.memory_id")),
+        ("turns_fts_bd", "BEFORE DELETE ON turns", remove("old.memory_id")),
+        ("turns_fts_ad", "AFTER DELETE ON turns", add("old.memory_id")),
+    ]
+    for name, when, body in triggers:
+        conn.execute(f"CREATE TRIGGER {name} {when} BEGIN {body} END")
+    conn.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")  # drop any drift
+
+
+MIGRATIONS = [
+    (1, [
+        '''CREATE TABLE IF NOT EXISTS conversation_memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            user_query TEXT,
+            melchior_response TEXT,
+            balthasar_response TEXT,
+            casper_response TEXT,
+            final_decision TEXT,
+            keypoints TEXT
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_memory_timestamp ON conversation_memory(timestamp)",
+    ]),
+    (2, [
+        '''CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            query_norm TEXT,
+            signature TEXT,
+            responses TEXT,
+            created REAL,
+            last_used REAL,
+            hits INTEGER DEFAULT 0
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_cache_fp ON response_cache(fingerprint)",
+        "CREATE INDEX IF NOT EXISTS idx_cache_used ON response_cache(last_used)",
+    ]),
+    (3, [_create_fts_v1]),
+    (4, [_split_turns, _reindex_fts]),
+    (5, [
+        '''CREATE TABLE IF NOT EXISTS tool_cache (
+            key TEXT PRIMARY KEY,
+            tool TEXT,
+            request TEXT,
+            body BLOB,
+            size INTEGER,
+            created REAL,
+            expires REAL,
+            last_used REAL,
+            hits INTEGER DEFAULT 0
+        )''',
+        "CREATE INDEX IF NOT EXISTS idx_tool_cache_used ON tool_cache(last_used)",
+    ]),
+    (6, [_sync_fts_by_triggers]),
+    (7, [
+        # Post-processing job that stored the row: a resumed job doesn't store it twice
+        "ALTER TABLE conversation_memory ADD COLUMN job_id TEXT",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_memory_job ON conversation_memory(job_id)",
+    ]),
+]
@@ -1,27 +1,80 @@
+import re
+import sqlite3
 from memory.db import get_connection
 
+# Column weights for bm25() (query, responses, decision, keypoints): query weighs most
+_BM25_WEIGHTS = "2.0, 1.0, 1.5, 1.5"
+
+
+def to_fts_query(text: str, any_term: bool = False) -> str:
+    """
+    User text → safe FTS5 MATCH expression.
+    "quoted phrases" stay phrases, word* is a prefix query, every other term is
+    quoted so FTS syntax characters can't break the query. Terms are ANDed
+    (or ORed with any_term=True).
+    """
+    parts = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text):
+        if phrase:
+            parts.append('"' + phrase.replace('"', "") + '"')
+            continue
+        prefix = word.endswith("*")
+        word = re.sub(r"[^\w]", "", word)
+        if word:
+            parts.append(f'"{word}"' + ("*" if prefix else ""))
+    return (" OR " if any_term else " ").join(parts)
+
+
+def _has_fts(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'memory_fts'").fetchone() is not None
+
+
 def search_memory(keyword: str, limit=5) -> list:
     """
-    Performs a basic text search against past conversations.
-    Returns a list of dicts with timestamp, query, and decision.
+    Full-text search over past conversations (query, all three agents,
+    decision, keypoints), best BM25 match first. Supports "exact phrases"
+    and prefix* terms; falls back to any-term matching when all terms
+    together find nothing.
+    Returns a list of dicts with timestamp, query, decision and a snippet.
     """
-    results = []
     with get_connection() as conn:
-        cursor = conn.cursor()
-        search_pattern = f"%{keyword}%"
-        cursor.execute('''
-            SELECT timestamp, user_query, final_decision 
-            FROM conversation_memory 
-            WHERE user_query LIKE ? OR final_decision LIKE ?
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        ''', (search_pattern, search_pattern, limit))
-        
-        for row in cursor.fetchall():
-            results.append({
-                "timestamp": row[0],
-                "query": row[1],
-                "decision": row[2]
-            })
-            
-    return results
+        if not _has_fts(conn):
+            return _search_like(conn, keyword, limit)
+
+        rows = []
+        for any_term in (False, True):
+            match = to_fts_query(keyword, any_term)
+            if not match:
+                return []
+            try:
+                rows = conn.execute(f'''
+                    SELECT m.timestamp, m.user_query, m.final_decision,
+                           snippet(memory_fts, -1, '[', ']', '…', 12)
+                    FROM memory_fts
+                    JOIN conversation_memory m ON m.id = memory_fts.rowid
+                    WHERE memory_fts MATCH ?
+                    ORDER BY bm25(memory_fts, {_BM25_WEIGHTS})
+                    LIMIT ?
+                ''', (match, limit)).fetchall()
+            except sqlite3.OperationalError:
+                return _search_like(conn, keyword, limit)
+            if rows:
+                break
+
+    return [{"timestamp": r[0], "query": r[1], "decision": r[2], "snippet": r[3]}
+            for r in rows]
+
+
+def _search_like(conn, keyword: str, limit: int) -> list:
+    """Unindexed fallback for SQLite builds without FTS5."""
+    search_pattern = f"%{keyword}%"
+    rows = conn.execute('''
+        SELECT timestamp, user_query, final_decision
+        FROM conversation_memory
+        WHERE user_query LIKE ? OR final_decision LIKE ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    ''', (search_pattern, search_pattern, limit)).fetchall()
+    return [{"timestamp": r[0], "query": r[1], "decision": r[2], "snippet": (r[2] or "")[:120]}
+            for r in rows]
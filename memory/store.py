@@ -1,24 +1,65 @@
 from memory.db import get_connection
+from memory.schema import pack, unpack
 
-def store_conversation(query: str, responses: dict, keypoints: str = ""):
+AGENTS = ("CASPER", "BALTHASAR", "MELCHIOR")
+
+
+def _session_id(conn, key: str | None) -> int | None:
+    if not key:
+        return None
+    conn.execute("INSERT OR IGNORE INTO sessions (key) VALUES (?)", (key,))
+    conn.execute("UPDATE sessions SET last_active = CURRENT_TIMESTAMP WHERE key = ?", (key,))
+    return conn.execute("SELECT id FROM sessions WHERE key = ?", (key,)).fetchone()[0]
+
+
+def store_conversation(query: str, responses: dict, keypoints: str = "",
+                       session: str = None, turns: list = None, job_id: str = None) -> int:
     """
-    Stores a deliberation cycle into the database.
+    Stores a deliberation cycle into the database. Returns its row id.
     responses is a dict mapping AI names to their final text.
+    turns is the full transcript — dicts with speaker, round, kind, text —
+    one row per utterance; without it each agent's last reply is stored.
+    A turn identical to the final decision isn't stored twice.
+    job_id makes the call idempotent: if a row with that id exists, its id is
+    returned and nothing is written.
     """
+    final = responses.get("FINAL_DECISION", "")
+    if turns is None:
+        turns = [{"speaker": n, "round": 0, "kind": "reply", "text": responses[n]}
+                 for n in AGENTS if responses.get(n)]
+
+    with get_connection() as conn:
+        if job_id:
+            row = conn.execute("SELECT id FROM conversation_memory WHERE job_id = ?",
+                               (job_id,)).fetchone()
+            if row:
+                return row[0]
+        cursor = conn.execute(
+            "INSERT INTO conversation_memory (user_query, final_decision, keypoints, session_id, "
+            "job_id) VALUES (?, ?, ?, ?, ?)",
+            (query, final, keypoints, _session_id(conn, session), job_id))
+        memory_id = cursor.lastrowid
+        rows = []
+        for seq, turn in enumerate(turns):
+            text = turn.get("text") or ""
+            is_final = int(bool(final) and text == final)
+            body, compressed = pack("" if is_final else text)
+            rows.append((memory_id, seq, turn.get("speaker"), turn.get("round", 0),
+                         turn.get("kind", "reply"), body, compressed, is_final, len(text)))
+        conn.executemany(
+            "INSERT INTO turns (memory_id, seq, speaker, round, kind, body, compressed, "
+            "is_final, chars) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return memory_id
+
+
+def load_turns(memory_id: int) -> list[dict]:
+    """The stored transcript of one deliberation, in speaking order."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO conversation_memory (
-                user_query, melchior_response, balthasar_response, 
-                casper_response, final_decision, keypoints
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            query,
-            responses.get("MELCHIOR", ""),
-            responses.get("BALTHASAR", ""),
-            responses.get("CASPER", ""),
-            responses.get("FINAL_DECISION", ""),
-            keypoints
-        ))
-        conn.commit()
-    return True
+        final = conn.execute("SELECT final_decision FROM conversation_memory WHERE id = ?",
+                             (memory_id,)).fetchone()
+        rows = conn.execute(
+            "SELECT speaker, round, kind, body, compressed, is_final FROM turns "
+            "WHERE memory_id = ? ORDER BY seq", (memory_id,)).fetchall()
+    return [{"speaker": s, "round": r, "kind": k,
+             "text": final[0] if is_final else unpack(body, z)}
+            for s, r, k, body, z, is_final in rows]
@@ -0,0 +1,242 @@
+"""
+Vector index for semantic memory retrieval.
+Lives next to data/magi.db:
+  memory_vectors.f16      float16 matrix, one row per conversation, memory-mapped
+  memory_vectors.ids      int64 conversation_memory ids, row-aligned
+  memory_vectors.json     {"model", "dim", "ivf_trained_at"}
+  memory_vectors.ivf.npz  IVF centroids + list assignment per row
+Below IVF_THRESHOLD rows search is brute-force NumPy; above it an IVF index
+(spherical k-means lists) probes only the IVF_PROBES nearest lists.
+Adding is incremental: sync() embeds every conversation newer than the last
+indexed id, so a failed embedding call is simply retried on the next sync.
+Rows whose text changes later (compaction) are dropped with remove() and
+re-embedded with reindex().
+Indexing only runs while MEMORY_RECALL is on — nothing else reads the vectors.
+"""
+import asyncio
+import json
+import os
+import threading
+import numpy as np
+from core.config import CONFIG
+from memory import embeddings
+from memory.db import get_connection, run_async
+
+BASE_PATH = "data/memory_vectors"
+IVF_THRESHOLD = CONFIG.get("VECTOR_IVF_THRESHOLD", 20000)
+IVF_PROBES = CONFIG.get("VECTOR_IVF_PROBES", 8)
+SYNC_BATCH = 256
+_CHUNK = 16384  # rows scored per NumPy step — bounds float32 scratch memory
+
+
+def indexing_enabled() -> bool:
+    """Vectors cost an embeddings call per stored query; only worth it when recall reads them."""
+    return bool(CONFIG.get("MEMORY_RECALL", False) and CONFIG.get("VECTOR_INDEX_ENABLED", True))
+
+
+class VectorIndex:
+    def __init__(self, base: str):
+        self.base = base
+        self.model, self.dim, self.ivf_trained_at = None, 0, 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.vecs = np.zeros((0, 0), dtype=np.float16)
+        self.centroids, self.assign = None, None
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def last_id(self) -> int:
+        return int(self.ids.max()) if self.count else 0
+
+    # ── Storage ──────────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if not os.path.exists(self.base + ".json"):
+            return
+        with open(self.base + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.model, self.dim = meta["model"], meta["dim"]
+        self.ivf_trained_at = meta.get("ivf_trained_at", 0)
+        ids = (np.fromfile(self.base + ".ids", dtype=np.int64)
+               if os.path.exists(self.base + ".ids") else np.zeros(0, dtype=np.int64))
+        rows = (os.path.getsize(self.base + ".f16") // (2 * self.dim)
+                if os.path.exists(self.base + ".f16") else 0)
+        n = min(len(ids), rows)  # a crash between the two appends leaves one longer
+        self.ids = ids[:n]
+        self.vecs = (np.memmap(self.base + ".f16", dtype=np.float16, mode="r", shape=(rows, self.dim))[:n]
+                     if n else np.zeros((0, self.dim), dtype=np.float16))
+        if self.ivf_trained_at and os.path.exists(self.base + ".ivf.npz"):
+            data = np.load(self.base + ".ivf.npz")
+            self.centroids, self.assign = data["centroids"], data["assign"][:n]
+
+    def _save_meta(self) -> None:
+        with open(self.base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim,
+                       "ivf_trained_at": self.ivf_trained_at}, f)
+
+    def reset(self, model: str, dim: int) -> None:
+        """Start an empty index for a new vector space (embedding model changed)."""
+        with self._lock:
+            for ext in (".f16", ".ids", ".ivf.npz"):
+                if os.path.exists(self.base + ext):
+                    os.remove(self.base + ext)
+            os.makedirs(os.path.dirname(self.base) or ".", exist_ok=True)
+            self.model, self.dim, self.ivf_trained_at = model, dim, 0
+            self.centroids, self.assign = None, None
+            self._save_meta()
+            self.ids = np.zeros(0, dtype=np.int64)
+            self.vecs = np.zeros((0, dim), dtype=np.float16)
+
+    def add(self, ids: list[int], vecs: np.ndarray) -> None:
+        """Append rows (vectors must already be L2-normalized)."""
+        with self._lock:
+            self.vecs = None  # drop the old mapping before the file grows (Windows)
+            with open(self.base + ".f16", "ab") as f:
+                f.write(vecs.astype(np.float16).tobytes())
+            with open(self.base + ".ids", "ab") as f:
+                f.write(np.asarray(ids, dtype=np.int64).tobytes())
+            old_assign = self.assign
+            self._load()
+            if self.count >= IVF_THRESHOLD and self.count >= 2 * self.ivf_trained_at:
+                self._train_ivf()  # first time over the threshold, or doubled since training
+            elif self.centroids is not None:
+                new = self._nearest_lists(vecs.astype(np.float32), 1)[:, 0]
+                self.assign = np.concatenate([old_assign, new]).astype(np.int32)
+                np.savez(self.base + ".ivf.npz", centroids=self.centroids, assign=self.assign)
+
+    def remove(self, ids: list[int]) -> int:
+        """Drop the rows for these conversation ids (rewrites the files). Returns rows removed."""
+        with self._lock:
+            keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+            removed = int(self.count - keep.sum())
+            if not removed:
+                return 0
+            kept_ids = self.ids[keep]
+            kept_vecs = np.asarray(self.vecs[keep], dtype=np.float16)
+            kept_assign = self.assign[keep] if self.assign is not None else None
+            self.vecs = None  # release the mapping before rewriting the file
+            kept_vecs.tofile(self.base + ".f16")
+            kept_ids.tofile(self.base + ".ids")
+            if kept_assign is not None:
+                np.savez(self.base + ".ivf.npz", centroids=self.centroids, assign=kept_assign)
+            self._load()
+            return removed
+
+    # ── IVF ──────────────────────────────────────────────────────────────────
+
+    def _nearest_lists(self, q: np.ndarray, n: int) -> np.ndarray:
+        return np.argsort(-(q @ self.centroids.T), axis=1)[:, :n]
+
+    def _train_ivf(self, iterations: int = 10) -> None:
+        n_lists = max(8, int(np.sqrt(self.count)))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(self.vecs[rng.choice(self.count, min(self.count, 64 * n_lists), replace=False)],
+                            dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(iterations):  # spherical k-means: assign by cosine, renormalize means
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-9)
+        self.centroids = centroids
+        self.assign = np.concatenate([
+            np.argmax(np.asarray(self.vecs[i:i + _CHUNK], dtype=np.float32) @ centroids.T, axis=1)
+            for i in range(0, self.count, _CHUNK)]).astype(np.int32)
+        self.ivf_trained_at = self.count
+        np.savez(self.base + ".ivf.npz", centroids=self.centroids, assign=self.assign)
+        self._save_meta()
+
+    # ── Search ───────────────────────────────────────────────────────────────
+
+    def search(self, query_vec: np.ndarray, k: int = 3) -> list[tuple[int, float]]:
+        """Top-k (conversation id, cosine score), best first."""
+        with self._lock:
+            if not self.count:
+                return []
+            q = query_vec.astype(np.float32).reshape(-1)
+            if self.centroids is not None:
+                lists = self._nearest_lists(q[None, :], IVF_PROBES)[0]
+                rows = np.flatnonzero(np.isin(self.assign, lists))
+                scores = np.asarray(self.vecs[rows], dtype=np.float32) @ q
+            else:
+                rows = np.arange(self.count)
+                scores = np.concatenate([np.asarray(self.vecs[i:i + _CHUNK], dtype=np.float32) @ q
+                                         for i in range(0, self.count, _CHUNK)])
+            top = np.argsort(-scores)[:k]
+            return [(int(self.ids[rows[i]]), float(scores[i])) for i in top]
+
+
+_indexes: dict[str, VectorIndex] = {}
+
+
+def get_index() -> VectorIndex:
+    if BASE_PATH not in _indexes:
+        _indexes[BASE_PATH] = VectorIndex(BASE_PATH)
+    return _indexes[BASE_PATH]
+
+
+def _texts(rows) -> list[tuple[int, str]]:
+    # Keypoints are the distilled memory; fall back to the head of the decision
+    return [(i, f"{q or ''}\n{(kp or '').strip() or (fd or '')[:1000]}") for i, q, kp, fd in rows]
+
+
+def _rows_after(last_id: int, limit: int) -> list[tuple[int, str]]:
+    with get_connection() as conn:
+        return _texts(conn.execute(
+            "SELECT id, user_query, keypoints, final_decision FROM conversation_memory "
+            "WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)).fetchall())
+
+
+def _rows_by_id(ids: list[int]) -> list[tuple[int, str]]:
+    marks = ", ".join("?" * len(ids))
+    with get_connection() as conn:
+        return _texts(conn.execute(
+            "SELECT id, user_query, keypoints, final_decision FROM conversation_memory "
+            f"WHERE id IN ({marks}) ORDER BY id", list(ids)).fetchall())
+
+
+async def sync() -> int:
+    """Embed and index every conversation not yet in the index. Returns rows added."""
+    index = get_index()
+    added = 0
+    while True:
+        rows = await run_async(_rows_after, index.last_id, SYNC_BATCH)
+        if not rows:
+            return added
+        vecs = await embeddings.embed([text for _, text in rows])
+        if index.model != embeddings.model_id() or index.dim != vecs.shape[1]:
+            index.reset(embeddings.model_id(), vecs.shape[1])
+            continue  # new vector space — re-embed from the first conversation
+        await asyncio.to_thread(index.add, [i for i, _ in rows], vecs)
+        added += len(rows)
+
+
+async def reindex(ids: list[int]) -> int:
+    """Re-embed conversations whose text changed; their old rows must be removed first.
+    Ids at or below last_id are never picked up by sync(), so this is their only way back."""
+    index = get_index()
+    if not ids or index.model != embeddings.model_id():
+        return 0  # empty index or another vector space: the next sync() rebuilds everything
+    rows = await run_async(_rows_by_id, ids)
+    if not rows:
+        return 0
+    vecs = await embeddings.embed([text for _, text in rows])
+    if vecs.shape[1] != index.dim:
+        return 0
+    await asyncio.to_thread(index.add, [i for i, _ in rows], vecs)
+    return len(rows)
+
+
+async def search(query: str, k: int = 3) -> list[tuple[int, float]]:
+    """Top-k (conversation id, score) for the query; [] if the index is empty or stale."""
+    index = get_index()
+    if not index.count or index.model != embeddings.model_id():
+        return []
+    vec = await embeddings.embed([query])
+    return await asyncio.to_thread(index.search, vec[0], k)
@@ -0,0 +1,26 @@
+"""
+Pipelined-synthesis measurement report.
+Summarises the MELCHIOR synthesis timings logged to data/pipeline_log.jsonl
+(one row per council deliberation) by mode, and the median saving of
+PIPELINE_MODE over sequential synthesis. Run a few council queries with
+PIPELINE_MODE off, then on, against the same model, then:
+Run: python pipeline_report.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.pipeline import synthesis_report
+
+report = synthesis_report()
+if not report:
+    print("No synthesis timings logged yet (data/pipeline_log.jsonl).")
+for mode in ("sequential", "pipelined"):
+    if mode in report:
+        r = report[mode]
+        print(f"=== {mode.upper()} ({r['runs']} runs) ===")
+        print(f"  median synthesis: {r['median_s']:.2f}s   mean: {r['mean_s']:.2f}s")
+        print(f"  mean warm-ups:    {r['mean_warmups']:.1f}\n")
+if "saving" in report:
+    print(f"Pipelining saves {report['saving']:.1%} of the median synthesis time.")
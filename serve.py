@@ -0,0 +1,18 @@
+"""
+Headless MAGI server — the council over HTTP, no GUI (see api/server.py).
+Run: python serve.py [--host 127.0.0.1] [--port 8080]
+"""
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from api.server import run
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the MAGI council over HTTP.")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+    run(args.host, args.port)
@@ -0,0 +1,80 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core import budget
+from llm import tokens
+from llm.tokens import count_tokens, count_messages
+
+
+def test_truncate_and_compress():
+    print("--- Testing token truncation / compression ---")
+    text = " ".join(f"word{i}" for i in range(2000))
+    cut = budget.truncate_to_tokens(text, 100)
+    print(f"truncate: {count_tokens(text)} -> {count_tokens(cut)} tokens")
+    assert cut.endswith("[truncated]") and count_tokens(cut) <= 105
+
+    short = budget.compress(text, 120)
+    print(f"compress: {count_tokens(text)} -> {count_tokens(short)} tokens")
+    assert short.startswith("word0 ") and short.endswith("word1999")
+    assert count_tokens(short) <= 140
+    assert budget.compress("tiny", 50) == "tiny"
+
+
+def test_allocate_lowest_priority_first():
+    print("--- Testing priority allocation ---")
+    big = "fact " * 1000
+    out = budget.allocate([
+        ("briefing", "Query: ship it?", 4),
+        ("context", big, 2),
+        ("clipboard", big, 1),
+    ], count_tokens(big) + 50)
+    sizes = {k: count_tokens(v) for k, v in out.items()}
+    print(f"sizes: {sizes}")
+    assert out["briefing"] == "Query: ship it?"
+    assert out["context"] == big           # higher priority left intact
+    assert sizes["clipboard"] < 60         # lowest priority absorbed the overflow
+
+
+def test_fit_history():
+    print("--- Testing history fitting ---")
+    filler = "lorem ipsum " * 2000
+    history = [
+        {"role": "user", "content": filler},
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "1", "function": {"name": "x", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "1", "content": filler},
+        {"role": "user", "content": "latest question"},
+    ]
+    fitted = budget.fit_history("sys", history, max_tokens=budget.CONTEXT_WINDOW - 1000)
+    print(f"kept {len(fitted)} of {len(history)} messages, "
+          f"{count_messages('sys', fitted)} tokens")
+    assert fitted[-1]["content"] == "latest question"
+    assert fitted[0]["role"] != "tool"     # no orphaned tool results
+    assert count_messages("sys", fitted) <= 1000
+
+    # The newest message alone overflows the window: compressed, but never to nothing
+    huge = [{"role": "user", "content": "start " + filler + " end"}]
+    fitted = budget.fit_history("sys", huge, max_tokens=budget.CONTEXT_WINDOW - 10)
+    kept = count_tokens(fitted[0]["content"])
+    print(f"oversized turn kept at {kept} tokens")
+    assert fitted[0]["content"].startswith("start ") and fitted[0]["content"].endswith(" end")
+    assert budget.MIN_TURN_TOKENS - 20 <= kept <= budget.MIN_TURN_TOKENS
+
+
+def test_count_cache_keeps_only_short_texts():
+    print("--- Testing token count memoization ---")
+    tokens._count_cached.cache_clear()
+    long_text = "tool output " * 2000
+    assert count_tokens(long_text) == count_tokens(long_text) > 0
+    assert count_tokens("short prompt") > 0
+    cached = tokens._count_cached.cache_info().currsize
+    print(f"memoized entries: {cached}")
+    assert cached == 1  # the long text was counted but not kept alive
+
+
+if __name__ == "__main__":
+    test_truncate_and_compress()
+    test_allocate_lowest_priority_first()
+    test_fit_history()
+    test_count_cache_keeps_only_short_texts()
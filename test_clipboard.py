@@ -0,0 +1,65 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.clipboard import extract_memos
+from core import concurrency
+import core.orchestrator as orchestrator
+
+
+def test_extract_memos():
+    print("--- Testing [MEMO: ...] extraction ---")
+    text = (
+        "Answer first. [MEMO: The user deploys on Kubernetes 1.29.]\n"
+        "[memo: the user deploys on kubernetes 1.29]  "     # same fact, different case/punctuation
+        "[MEMO: Budget is capped at $500/month] "
+        "[MEMO:   ] "                                        # empty proposal
+        "[MEMO: Prefers Python over Go.]"
+    )
+    memos = extract_memos(text, existing=["Prefers Python over Go"])
+    print(f"Extracted: {memos}")
+    assert memos == ["The user deploys on Kubernetes 1.29.", "Budget is capped at $500/month"]
+    assert extract_memos("no proposals here") == []
+    print("Order kept, duplicates and existing items dropped: OK")
+
+
+def test_review_memos_concurrent_and_bounded():
+    print("--- Testing concurrent memo review under the shared LLM slots ---")
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    async def fake_call(system, messages, **kwargs):
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.02)
+        state["active"] -= 1
+        prompt = messages[-1]["content"]
+        if system == orchestrator.MAGI_CLIPBOARD_SYSTEM:
+            verdict = "APPROVE" if "keep" in prompt else "REJECT: not useful"
+        else:
+            verdict = "YES" if "override" in prompt and "vote-yes" in prompt else "NO"
+        return {"choices": [{"message": {"content": verdict}}]}
+
+    items = ["keep alpha", "vote-yes beta", "drop gamma", "keep delta"]
+    original = orchestrator.make_api_call
+    orchestrator.make_api_call = fake_call
+    try:
+        orch = orchestrator.MAGIOrchestrator()
+        orch.clipboard = ["keep delta"]  # already present — not added twice
+        asyncio.run(orch._review_memos(items))
+    finally:
+        orchestrator.make_api_call = original
+
+    print(f"Clipboard: {orch.clipboard}  calls: {state['calls']}  peak in flight: {state['peak']}")
+    # 4 MAGI verdicts + 3 ballots for each of the 2 rejected items
+    assert state["calls"] == 4 + 2 * 3
+    assert state["peak"] == concurrency.PARALLEL_SLOTS  # concurrent, yet never over the limit
+    assert orch.clipboard == ["keep delta", "keep alpha", "vote-yes beta"]
+    print("Reviews run concurrently, ballots share the same slots: OK")
+
+
+if __name__ == "__main__":
+    test_extract_memos()
+    test_review_memos_concurrent_and_bounded()
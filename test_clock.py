@@ -0,0 +1,156 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from ui import clock as clock_mod
+from ui.clock import AnimationClock, get_clock
+from ui import animations
+
+
+class FakeRoot:
+    """Just enough of a Tk window: a virtual-time after() queue and a visibility flag."""
+    def __init__(self):
+        self.time = 0.0
+        self.timers = {}
+        self._next = 0
+        self.hidden = False
+        self.configured = []
+
+    def after(self, ms, fn):
+        self._next += 1
+        self.timers[self._next] = (self.time + ms, fn)
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def state(self):
+        return "iconic" if self.hidden else "normal"
+
+    def winfo_viewable(self):
+        return not self.hidden
+
+    def winfo_toplevel(self):
+        return self
+
+    def configure(self, **kw):
+        self.configured.append(kw)
+
+    def advance(self, ms):
+        end = self.time + ms
+        while self.timers:
+            after_id, (due, fn) = min(self.timers.items(), key=lambda t: t[1][0])
+            if due > end:
+                break
+            del self.timers[after_id]
+            self.time = due
+            fn()
+        self.time = end
+
+
+def _clock(root):
+    c = AnimationClock(root)
+    c.now = lambda: root.time
+    return c
+
+
+def test_single_timer_for_all_animations():
+    print("--- Testing shared animation clock ---")
+    root = FakeRoot()
+    c = _clock(root)
+    calls = {"a": 0, "b": 0, "c": 0}
+    for key in calls:
+        c.register(key, lambda now, k=key: calls.__setitem__(k, calls[k] + 1), 80)
+    assert len(root.timers) == 1  # three animations, one Tk timer
+    root.advance(1000)
+    print(f"Ticks in 1s: {c.ticks}, pending timers: {len(root.timers)}")
+    assert c.ticks == 1000 // 80 + 1  # one wake-up per 80 ms frame, none in between
+    assert calls["a"] == calls["b"] == calls["c"] == c.ticks
+
+    c.unregister("a")
+    c.register("b", lambda now: False, 80)  # replaced step finishes on its next tick
+    root.advance(100)
+    assert "b" not in c._steps and "c" in c._steps
+    c.unregister("c")
+    assert not root.timers  # idle clock schedules nothing
+    print("One timer, steps unregister themselves, idle clock stops: OK")
+
+
+def test_wakes_at_earliest_frame_boundary():
+    print("--- Testing tick scheduling across frame intervals ---")
+    root = FakeRoot()
+    c = _clock(root)
+    seen = {"fast": [], "slow": []}
+    c.register("slow", seen["slow"].append, 600)
+    root.advance(0)
+    assert min(d for d, _ in root.timers.values()) == 600  # a lone pulse wakes once per flip
+    c.register("fast", seen["fast"].append, 80)
+    root.advance(1000)
+    print(f"Tick times: {seen['slow']}")
+    # registering ticks at once; then every 80 ms frame plus the 600 ms flip, nothing else
+    assert seen["slow"] == [0, 0] + sorted(set(range(80, 1000, 80)) | {600})
+    assert seen["fast"] == seen["slow"][1:]
+
+    def broken(now):
+        raise RuntimeError("invalid command name")  # widget destroyed under the animation
+    c.register("broken", broken, 40)
+    root.advance(200)
+    assert "broken" not in c._steps and {"fast", "slow"} <= set(c._steps)
+    assert seen["fast"][-1] == 1200  # the others kept ticking
+    print("Wakes at the earliest boundary, a failing step is dropped alone: OK")
+
+
+def test_hidden_window_throttles():
+    print("--- Testing throttling while minimized ---")
+    root = FakeRoot()
+    c = _clock(root)
+    steps = []
+    c.register("x", steps.append, 80)
+    root.advance(0)
+    root.hidden = True
+    before = len(steps)
+    root.advance(2000)
+    assert len(steps) == before  # no redraws while hidden
+    assert len(root.timers) == 1 and min(d for d, _ in root.timers.values()) - root.time <= clock_mod.HIDDEN_INTERVAL
+    root.hidden = False
+    root.advance(clock_mod.HIDDEN_INTERVAL)
+    assert len(steps) > before  # resumes once visible again
+    print("Hidden window: steps paused, slow polling: OK")
+
+
+def test_pulse_redraws_only_on_flip():
+    print("--- Testing pulse through the shared clock ---")
+    root = FakeRoot()
+    root._animation_clock = _clock(root)
+    animations.start_pulse(root, "#00d4ff")
+    animations.start_pulse(root, "#00d4ff")  # second start doesn't restart it
+    root.advance(2400)
+    print(f"Configure calls over 2.4s at 600ms: {len(root.configured)}")
+    assert len(root.configured) == 5  # initial + 4 flips, not one per tick
+    assert root.configured[0] == {"fg_color": "#00d4ff"}
+    assert root.configured[1] == {"fg_color": animations._dim("#00d4ff")}
+    assert root._animation_clock.ticks == 5  # the clock only woke for the flips
+    animations.stop_pulse(root)
+    assert not root.timers and get_clock(root) is root._animation_clock
+
+    # configure() fails (widget torn down): the pulse is dropped and can be started again
+    def destroyed(**kw):
+        raise RuntimeError("invalid command name")
+    root.configure = destroyed
+    animations.start_pulse(root, "#00d4ff")
+    root.advance(0)
+    assert root not in animations._pulse_jobs and not root.timers
+    del root.configure
+    animations.start_pulse(root, "#00d4ff")
+    root.advance(0)
+    assert root in animations._pulse_jobs and root.configured[-1] == {"fg_color": "#00d4ff"}
+    animations.stop_pulse(root)
+    print("Pulse reconfigures only when it flips: OK")
+
+
+if __name__ == "__main__":
+    test_single_timer_for_all_animations()
+    test_wakes_at_earliest_frame_boundary()
+    test_hidden_window_throttles()
+    test_pulse_redraws_only_on_flip()
@@ -0,0 +1,40 @@
+import sys
+import os
+import asyncio
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.concurrency import gather_bounded
+
+
+async def _job(i, delay, active, peak):
+    active[0] += 1
+    peak[0] = max(peak[0], active[0])
+    await asyncio.sleep(delay)
+    active[0] -= 1
+    if i == 2:
+        raise RuntimeError("slot 2 failed")
+    return i
+
+
+def test_gather_bounded():
+    print("--- Testing bounded concurrent fan-out ---")
+    active, peak = [0], [0]
+    # Later jobs finish first — results must still come back in input order
+    delays = [0.05, 0.04, 0.03, 0.02, 0.01]
+    start = time.perf_counter()
+    results = asyncio.run(gather_bounded(
+        [_job(i, d, active, peak) for i, d in enumerate(delays)], limit=2
+    ))
+    elapsed = time.perf_counter() - start
+    print(f"Results: {results}  peak in flight: {peak[0]}  elapsed: {elapsed:.3f}s")
+
+    assert results[:2] == [0, 1] and results[3:] == [3, 4]
+    assert isinstance(results[2], RuntimeError)  # failure isolated to its slot
+    assert peak[0] == 2
+    assert elapsed < sum(delays)
+
+
+if __name__ == "__main__":
+    test_gather_bounded()
@@ -0,0 +1,85 @@
+import sys
+import os
+import contextlib
+import asyncio
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from memory.store import store_conversation
+from memory.search import search_memory
+
+
+@contextlib.contextmanager
+def _temp_db(path=None):
+    """Point memory.db at a throwaway database; the real path is restored afterwards."""
+    saved = db.DB_PATH
+    db.DB_PATH = path or os.path.join(tempfile.mkdtemp(), "magi.db")
+    try:
+        yield db.DB_PATH
+    finally:
+        db.DB_PATH = saved
+
+
+def test_connection_manager():
+    print("--- Testing SQLite connection manager ---")
+    with _temp_db():
+        conn = db.get_connection()
+        assert db.get_connection() is conn  # reused, not reopened
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        version = db.schema_version(conn)
+        print(f"journal_mode={mode} schema_version={version}")
+        assert mode == "wal"
+        assert version == db.MIGRATIONS[-1][0]
+
+        # Each thread gets its own connection; a reader isn't blocked by a writer
+        seen, errors = [], []
+
+        def worker(i):
+            try:
+                seen.append(id(db.get_connection()))
+                store_conversation(f"question {i}", {"FINAL_DECISION": f"answer {i}"})
+                search_memory("question")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors, errors
+        assert id(conn) not in seen
+
+        rows = asyncio.run(db.run_async(search_memory, "answer", 20))
+        print(f"Rows via async facade: {len(rows)}")
+        assert len(rows) == 8
+
+
+def test_lazy_migration_upgrades_old_db():
+    print("--- Testing migration of a pre-versioning database ---")
+    import sqlite3
+    path = os.path.join(tempfile.mkdtemp(), "magi.db")
+    old = sqlite3.connect(path)
+    old.execute(db.MIGRATIONS[0][1][0])  # the original table, no schema_version
+    old.execute("INSERT INTO conversation_memory (user_query) VALUES ('kept')")
+    old.commit()
+    old.close()
+
+    with _temp_db(path):
+        conn = db.get_connection()
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        print(f"Tables: {sorted(tables)}")
+        assert {"conversation_memory", "response_cache", "schema_version"} <= tables
+        assert conn.execute("SELECT user_query FROM conversation_memory").fetchall() == [("kept",)]
+        # Existing rows are backfilled into the full-text index
+        assert conn.execute("SELECT rowid FROM memory_fts WHERE memory_fts MATCH 'kept'").fetchall() == [(1,)]
+
+
+if __name__ == "__main__":
+    test_connection_manager()
+    test_lazy_migration_upgrades_old_db()
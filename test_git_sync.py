@@ -0,0 +1,101 @@
+import sys
+import os
+import subprocess
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from memory.git_sync import SyncDaemon
+
+
+def _git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def _clone_of_bare():
+    """A bare repo as the remote and a working clone with one pushed commit."""
+    tmp = tempfile.mkdtemp()
+    remote, work = os.path.join(tmp, "remote.git"), os.path.join(tmp, "work")
+    _git("init", "--bare", "-q", remote, cwd=tmp)
+    _git("clone", "-q", remote, work, cwd=tmp)
+    _git("config", "user.email", "magi@example.com", cwd=work)
+    _git("config", "user.name", "MAGI", cwd=work)
+    with open(os.path.join(work, "pinned.md"), "w") as f:
+        f.write("# Pinned\n")
+    _git("add", "pinned.md", cwd=work)
+    _git("commit", "-q", "-m", "init", cwd=work)
+    _git("push", "-q", "origin", "HEAD", cwd=work)
+    return remote, work
+
+
+def _daemon(work, **kw):
+    paths = [os.path.join(work, "clipboard.json"), os.path.join(work, "pinned.md")]
+    return SyncDaemon(repo=work, paths=paths, clipboard_path=paths[0], **kw)
+
+
+def _wait(cond, timeout=10):
+    end = time.monotonic() + timeout
+    while not cond() and time.monotonic() < end:
+        time.sleep(0.05)
+    return cond()
+
+
+def test_debounced_batch_commit_and_push():
+    print("--- Testing git sync debounce, batching and push ---")
+    remote, work = _clone_of_bare()
+    daemon = _daemon(work, debounce=0.5, max_delay=5, push_interval=0)
+
+    start = time.perf_counter()
+    for i in range(3):
+        daemon.notify(f"MAGI session [q{i}]", clipboard=[f"item {i}"])
+    elapsed = time.perf_counter() - start
+    print(f"3 notifications took {elapsed * 1000:.1f}ms")
+    assert elapsed < 0.5  # never blocks on git
+
+    assert _wait(lambda: daemon.pushes == 1)
+    assert daemon.commits == 1  # three changes, one commit
+    log = _git("log", "--format=%B", "-1", cwd=remote)
+    assert "3 sessions" in log and "q0" in log and "q2" in log
+    assert '"item 2"' in _git("show", "HEAD:clipboard.json", cwd=remote)
+    daemon.stop()
+    print("Batch commit pushed to bare remote: OK")
+
+
+def test_push_on_exit():
+    print("--- Testing git sync commit + push on stop ---")
+    remote, work = _clone_of_bare()
+    daemon = _daemon(work, debounce=60, max_delay=60, push_interval=3600)
+    daemon.notify("MAGI session [late]", clipboard=["late item"])
+    time.sleep(0.2)
+    assert daemon.commits == 0  # still inside the debounce window
+    daemon.stop()
+    assert daemon.commits == 1 and daemon.pushes == 1
+    assert "late" in _git("log", "--format=%s", "-1", cwd=remote)
+    print("Pending change flushed on exit: OK")
+
+
+def test_push_failure_backs_off():
+    print("--- Testing git sync retry with backoff ---")
+    remote, work = _clone_of_bare()
+    _git("remote", "set-url", "origin", os.path.join(work, "missing.git"), cwd=work)
+    logs = []
+    daemon = _daemon(work, debounce=0.1, max_delay=1, push_interval=0, log=logs.append)
+    daemon.notify("MAGI session [offline]", clipboard=["x"])
+    assert _wait(lambda: daemon.failures >= 1)
+    time.sleep(0.5)
+    assert daemon.failures == 1  # next attempt waits for the backoff, no hot loop
+    assert daemon.commits == 1 and daemon.pushes == 0
+    assert any("retrying in" in m for m in logs)
+
+    # Remote comes back: the next attempt (here forced by exit) pushes the commit
+    _git("remote", "set-url", "origin", remote, cwd=work)
+    daemon.stop()
+    assert daemon.pushes == 1 and daemon.failures == 0
+    print("Failed push retried after backoff: OK")
+
+
+if __name__ == "__main__":
+    test_debounced_batch_commit_and_push()
+    test_push_on_exit()
+    test_push_failure_backs_off()
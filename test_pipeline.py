@@ -0,0 +1,122 @@
+import sys
+import os
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import core.pipeline as pipeline
+import core.orchestrator as orchestrator
+from core.config import CONFIG
+from core.personalities import MELCHIOR_PROMPT
+
+
+def test_warm_cadence():
+    print("--- Testing prefix warm-up cadence ---")
+    calls = []
+    gate = {"event": None}
+
+    async def fake_call(system, messages, max_tokens=None, **kwargs):
+        calls.append((messages[-1]["content"], max_tokens))
+        if gate["event"] is not None:
+            await gate["event"].wait()
+        return {"choices": [{"message": {"content": "."}}]}
+
+    async def run():
+        warmer = pipeline.PrefixWarmer("SYS", [{"role": "user", "content": "earlier"}], "HEAD|")
+        warmer.start()
+        await asyncio.sleep(0)
+        assert calls == [("HEAD|", 1)]
+
+        for _ in range(59):
+            warmer.feed("x" * 10)      # 590 new chars — not enough yet
+        await asyncio.sleep(0)
+        assert len(calls) == 1
+        warmer.feed("y" * 10)          # 600 → re-warm the longer prefix
+        await asyncio.sleep(0)
+        assert calls[-1] == ("HEAD|" + "x" * 590 + "y" * 10, 1)
+
+        # One warm-up in flight at a time: tokens pile up behind it
+        gate["event"] = asyncio.Event()
+        warmer.feed("z" * 600)
+        await asyncio.sleep(0)
+        assert len(calls) == 3
+        warmer.feed("w" * 1200)
+        await asyncio.sleep(0)
+        assert len(calls) == 3
+        gate["event"].set()
+        await asyncio.sleep(0)
+        warmer.feed("v")               # idle again and 1201 chars behind → fires with everything
+        await asyncio.sleep(0)
+        assert len(calls) == 4 and calls[-1][0].endswith("w" * 1200 + "v")
+        await warmer.close()
+        assert warmer.warmups == 4
+        assert all(max_tokens == 1 for _, max_tokens in calls)
+
+    original = pipeline.make_api_call
+    pipeline.make_api_call = fake_call
+    try:
+        asyncio.run(run())
+    finally:
+        pipeline.make_api_call = original
+    print(f"{len(calls)} warm-ups, every {pipeline.WARM_INTERVAL_CHARS} chars, max_tokens=1: OK")
+
+
+def test_warmer_cancelled_before_synthesis():
+    print("--- Testing warm-up is cancelled before MELCHIOR's real call ---")
+    events = []
+
+    async def fake_warm(system, messages, max_tokens=None, **kwargs):
+        events.append("warm")
+        try:
+            await asyncio.Event().wait()  # a prefill that outlasts BALTHASAR
+        except asyncio.CancelledError:
+            events.append("warm cancelled")
+            raise
+
+    async def fake_call(system, messages, **kwargs):  # MAGI Core briefing
+        return {"choices": [{"message": {"content": "OBJECTIVE: test"}}]}
+
+    async def fake_stream(system, messages, tools=None, max_tokens=None):
+        name = "MELCHIOR" if system == MELCHIOR_PROMPT else "other"
+        events.append(f"{name} call")
+        for _ in range(70):
+            await asyncio.sleep(0)    # tokens arrive over time
+            yield "delta", "b" * 10
+        yield "done", {"choices": [{"message": {"content": "Ruling."}}]}
+
+    overrides = {"PIPELINE_MODE": True, "STREAMING_ENABLED": True, "RESPONSE_CACHE_ENABLED": False,
+                 "MEMORY_ENABLED": False, "MEMORY_RECALL": False}
+    saved = {k: CONFIG.get(k, None) for k in overrides}
+    patched = [(pipeline, "make_api_call", fake_warm), (orchestrator, "make_api_call", fake_call),
+               (orchestrator, "stream_api_call", fake_stream),
+               (pipeline, "LOG_PATH", os.path.join(tempfile.mkdtemp(), "pipeline_log.jsonl"))]
+    originals = [(mod, attr, getattr(mod, attr)) for mod, attr, _ in patched]
+    CONFIG.update(overrides)
+    for mod, attr, value in patched:
+        setattr(mod, attr, value)
+    try:
+        orch = orchestrator.MAGIOrchestrator()
+        result = asyncio.run(orch.process_query("Plan the release", debate_mode=True,
+                                                delta_callback=lambda n, t: None))
+        report = pipeline.synthesis_report()
+    finally:
+        for mod, attr, value in originals:
+            setattr(mod, attr, value)
+        for k, v in saved.items():
+            if v is None:
+                CONFIG.pop(k, None)
+            else:
+                CONFIG[k] = v
+
+    print(f"Events: {events}")
+    assert result["FINAL_DECISION"] == "Ruling."
+    assert events.index("warm cancelled") < events.index("MELCHIOR call")
+    assert events.count("warm") == 1  # BALTHASAR's tokens queued behind the one in flight
+    assert report["pipelined"]["runs"] == 1 and "sequential" not in report
+    print("In-flight warm-up cancelled first, synthesis timing logged: OK")
+
+
+if __name__ == "__main__":
+    test_warm_cadence()
+    test_warmer_cancelled_before_synthesis()
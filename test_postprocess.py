@@ -0,0 +1,75 @@
+import sys
+import os
+import asyncio
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.config import CONFIG
+from memory.postprocess import PostProcessor
+from memory.store import store_conversation
+import memory.db as db
+
+
+def test_resume_pending_jobs():
+    print("--- Testing post-processing queue persistence ---")
+    tmp = tempfile.mkdtemp()
+    saved = db.DB_PATH, dict(CONFIG)
+    db.DB_PATH = os.path.join(tmp, "magi.db")
+    queue_path = os.path.join(tmp, "queue.json")
+    CONFIG["AUTO_EXTRACT_KEYPOINTS"] = False  # no LM Studio needed
+    CONFIG["VECTOR_INDEX_ENABLED"] = False
+    try:
+        _check_resume(queue_path)
+    finally:
+        db.DB_PATH = saved[0]
+        CONFIG.clear()
+        CONFIG.update(saved[1])
+
+
+def _check_resume(queue_path):
+    db.init_db()
+
+    async def submit_only():
+        p = PostProcessor(queue_path)
+        p.submit("store", query="what is MAGI?", responses={"FINAL_DECISION": "A council."},
+                 store_text="A council.")
+        p._worker.cancel()  # app "exits" before the worker picks the job up
+        return p.depth
+
+    assert asyncio.run(submit_only()) == 1
+
+    # A fresh processor (next app start) resumes the persisted job
+    p2 = PostProcessor(queue_path)
+    print(f"Resumed queue depth: {p2.depth}")
+    assert p2.depth == 1
+    asyncio.run(p2.flush())
+    assert p2.depth == 0 and p2.processed == 1
+
+    rows = sqlite3.connect(db.DB_PATH).execute(
+        "SELECT user_query, final_decision FROM conversation_memory").fetchall()
+    print(f"Stored rows: {rows}")
+    assert rows == [("what is MAGI?", "A council.")]
+
+    # Cut off after the insert (e.g. during the vector sync): the resumed job doesn't store it again
+    async def store_then_exit():
+        p = PostProcessor(queue_path)
+        job_id = p.submit("store", query="is it idempotent?", responses={"FINAL_DECISION": "Yes."},
+                          store_text="Yes.")
+        p._worker.cancel()
+        return job_id
+
+    job_id = asyncio.run(store_then_exit())
+    store_conversation("is it idempotent?", {"FINAL_DECISION": "Yes."}, job_id=job_id)
+    p3 = PostProcessor(queue_path)
+    assert p3.depth == 1
+    asyncio.run(p3.flush())
+    count = sqlite3.connect(db.DB_PATH).execute(
+        "SELECT COUNT(*) FROM conversation_memory WHERE user_query = 'is it idempotent?'").fetchone()[0]
+    print(f"Rows after resuming an already-stored job: {count}")
+    assert p3.depth == 0 and count == 1
+
+
+if __name__ == "__main__":
+    test_resume_pending_jobs()
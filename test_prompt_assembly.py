@@ -0,0 +1,72 @@
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core.prompt_assembly import assemble_briefing, canonical, PrefixTracker
+from llm import client
+
+SYSTEM = "You are CASPER.  \r\nBe bold.\n\n\n\nNo hedging.\n"
+
+
+def _prefix(a: str, b: str) -> str:
+    return os.path.commonprefix([a, b])
+
+
+def test_briefing_blocks():
+    print("--- Testing briefing block order and canonical whitespace ---")
+    a = assemble_briefing({"research": "fact 1", "briefing": "OBJECTIVE: x  \r\n",
+                           "clipboard": "  • a", "context": "Use British spelling.\r\n\r\n\r\n"})
+    b = assemble_briefing({"context": "Use British spelling.", "clipboard": "  • a",
+                           "briefing": "OBJECTIVE: x", "research": "fact 1"})
+    print(a)
+    assert a == b  # insertion order and stray whitespace don't change the bytes
+    assert a.index("[CONTEXT INSTRUCTIONS]") < a.index("[SESSION CLIPBOARD") < a.index("OBJECTIVE") \
+        < a.index("[RESEARCH FACTS]")
+    assert canonical(SYSTEM) == "You are CASPER.\nBe bold.\n\nNo hedging."
+
+
+def test_request_prefix_byte_identical():
+    print("--- Testing consecutive requests share a byte-identical prefix ---")
+    shared = {"context": "Project: MAGI", "clipboard": "  • Deploys on k8s", "briefing": "OBJECTIVE: plan"}
+    first = assemble_briefing({**shared, "research": "Release is Friday."})
+    second = assemble_briefing({**shared, "research": "Release slipped to Monday."})
+    bodies = []
+    for system, briefing in ((SYSTEM, first), (SYSTEM.replace("bold.", "bold.   ") + "\n\n", second)):
+        _, payload, _ = client._build_request(system, [{"role": "user", "content": briefing}],
+                                              False, None, None)
+        bodies.append(json.dumps(payload["messages"], ensure_ascii=False))
+    common = _prefix(*bodies)
+    print(f"Shared prefix: {len(common)} of {len(bodies[0])} chars")
+    # Everything up to the research block is the same bytes; only the research differs
+    assert common.endswith("[RESEARCH FACTS]\\nRelease ")
+    assert bodies[0].split("[RESEARCH FACTS]")[0] == bodies[1].split("[RESEARCH FACTS]")[0]
+
+    tracker = PrefixTracker(slots=2)
+    tracker.observe({"messages": [{"role": "user", "content": first}]})
+    assert tracker.observe({"messages": [{"role": "user", "content": second}]}) > 0.8
+
+
+def test_conversation_content_untouched():
+    print("--- Testing tool results, code and assistant replies are sent verbatim ---")
+    code = "```python\ndef f(x):   \n\n\n\n    return x  \n```\n"
+    messages = [
+        {"role": "user", "content": "  indented question\r\n"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "c1", "type": "function", "function": {"name": "read_url", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "c1", "content": "col1  \ncol2\t\n\n\n\nend  "},
+        {"role": "assistant", "content": code},
+    ]
+    snapshot = json.loads(json.dumps(messages))
+    _, payload, _ = client._build_request(SYSTEM, messages, True, None, None)
+    assert payload["messages"][0]["content"] == canonical(SYSTEM)
+    assert payload["messages"][1:] == snapshot
+    assert messages == snapshot  # caller's history not mutated either
+    print("Only the system prompt was normalized: OK")
+
+
+if __name__ == "__main__":
+    test_briefing_blocks()
+    test_request_prefix_byte_identical()
+    test_conversation_content_untouched()
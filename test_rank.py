@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from tools.rank import split_passages, bm25_scores, select_passages
+from llm.tokens import count_tokens
+
+PAGE = "\n\n".join([
+    "Home | News | Sport | Weather | Sign in | Subscribe | Accept cookies",
+    "Menu: Politics, Business, Technology, Science, Health, Entertainment, Travel.",
+    "The Artemis II mission will carry four astronauts around the Moon. NASA confirmed "
+    "the launch window opens in April, with the Orion capsule stacked on the SLS rocket.",
+    "Related: ten recipes for a quick weeknight dinner that the whole family will love.",
+    "Crew members Reid Wiseman, Victor Glover, Christina Koch and Jeremy Hansen have "
+    "trained for the lunar flyby for more than two years.",
+    "Newsletter: sign up for our daily briefing delivered to your inbox every morning.",
+] * 3)
+
+
+def test_bm25_ranks_relevant_passages():
+    print("--- Testing BM25 passage scoring ---")
+    passages = split_passages(PAGE)
+    scores = bm25_scores("Artemis II launch astronauts Moon", passages)
+    best = passages[max(range(len(passages)), key=scores.__getitem__)]
+    print(f"{len(passages)} passages; best: {best[:60]}...")
+    assert "Artemis II" in best
+
+
+def test_select_passages_packs_budget():
+    print("--- Testing budgeted passage selection ---")
+    out = select_passages(PAGE, "Who is the Artemis II crew?", 120)
+    print(f"{count_tokens(PAGE)} -> {count_tokens(out)} tokens:\n{out}")
+    assert count_tokens(out) <= 125
+    assert "Artemis II" in out and "Wiseman" in out
+    assert "Accept cookies" not in out  # head truncation would have kept the nav
+
+    assert select_passages("short page", "anything", 100) == "short page"
+    err = "[ERROR reading x: timeout]"
+    assert select_passages(err, "x", 1) == err
+
+
+if __name__ == "__main__":
+    test_bm25_ranks_relevant_passages()
+    test_select_passages_packs_budget()
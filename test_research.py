@@ -0,0 +1,67 @@
+import sys
+import os
+import asyncio
+import json
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from core import research
+
+
+def _reply(text):
+    return {"choices": [{"message": {"content": text}}]}
+
+
+def test_parallel_research():
+    print("--- Testing parallel research phase ---")
+    synth_prompts, reads, cut_off, logs = [], [], [], []
+
+    async def fake_llm(system, messages, **kwargs):
+        if system.startswith("You are a research planner"):
+            return _reply("1. artemis ii crew\n- artemis ii launch date\nArtemis II crew\norion heat shield")
+        synth_prompts.append(messages[-1]["content"])
+        return _reply("- Four astronauts fly around the Moon [1]")
+
+    async def fake_tool(name, kwargs):
+        if name == "search_web":
+            await asyncio.sleep(0.05)
+            if "heat shield" in kwargs["query"]:
+                try:
+                    await asyncio.Event().wait()  # a hung branch — must not hold up the rest
+                except asyncio.CancelledError:
+                    cut_off.append(kwargs["query"])
+                    raise
+            return json.dumps([
+                {"title": "NASA Artemis II", "href": "https://www.nasa.gov/artemis-ii#crew", "body": "Crew of four."},
+                {"title": kwargs["query"], "href": f"https://news.example/{kwargs['query'].replace(' ', '-')}", "body": "Snippet."},
+            ])
+        if name == "read_url":
+            reads.append(kwargs["url"])
+            await asyncio.sleep(0.05)
+            return f"Page text about {kwargs['url']}"
+        raise AssertionError(name)
+
+    saved = (research.make_api_call, research.execute_tool, research.DEADLINE)
+    research.make_api_call, research.execute_tool, research.DEADLINE = fake_llm, fake_tool, 2
+    try:
+        facts, sources = asyncio.run(research.gather("Who is flying on Artemis II and when?",
+                                                     lambda m: (print(m), logs.append(m))))
+    finally:
+        research.make_api_call, research.execute_tool, research.DEADLINE = saved
+
+    print(f"reads {reads}  cut off {cut_off}\n{facts}")
+    assert research.parse_plan("1. a\n- A\n\nb", "q") == ["a", "b"]
+    assert reads.count("https://www.nasa.gov/artemis-ii#crew") == 1  # deduplicated across branches
+    assert len(reads) == 2                      # one read per live sub-query
+    assert sources[0] == "https://www.nasa.gov/artemis-ii#crew"
+    assert len(sources) == len(set(sources)) == 3   # page reads replace their snippets
+    assert "Sources:" in facts and "[1]" in facts
+    assert len(synth_prompts) == 1              # one synthesis call
+    # The deadline cancelled only the hung branch; the others finished search + read
+    assert cut_off == ["orion heat shield"]
+    assert any("1 branch(es) cut off" in m for m in logs)
+    assert "Page text about https://news.example/artemis-ii-launch-date" in synth_prompts[0]
+
+
+if __name__ == "__main__":
+    test_parallel_research()
@@ -0,0 +1,79 @@
+import sys
+import os
+import contextlib
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from memory import response_cache as cache
+
+
+@contextlib.contextmanager
+def _temp_db(path=None):
+    """Point memory.db at a throwaway database; the real path is restored afterwards."""
+    saved = db.DB_PATH
+    db.DB_PATH = path or os.path.join(tempfile.mkdtemp(), "magi.db")
+    try:
+        yield db.DB_PATH
+    finally:
+        db.DB_PATH = saved
+
+
+def test_response_cache():
+    print("--- Testing response cache ---")
+    with _temp_db():
+        fp = cache.config_fingerprint("ALL", True, False, "", [])
+        answer = {"MELCHIOR": "Python.", "FINAL_DECISION": "Python."}
+        cache.store("What is the best programming language?", fp, answer)
+
+        exact = cache.lookup("what is the best   programming language", fp)
+        print(f"Exact: {exact}")
+        assert exact == (answer, "exact")
+
+        long_q = "Please explain the main differences between TCP and UDP for real time multiplayer games"
+        cache.store(long_q, fp, {"FINAL_DECISION": "UDP."})
+        near = cache.lookup(long_q + " now?", fp)
+        print(f"Near-duplicate: {near}")
+        assert near is not None and near[0] == {"FINAL_DECISION": "UDP."} and near[1].startswith("near 0.9")
+        # Rewording past the threshold is a miss, not a guess
+        assert cache.lookup("What is the very best programming language?", fp) is None
+
+        # Same question under a different configuration is a different answer
+        other_fp = cache.config_fingerprint("ALL", True, True, "", [])
+        assert cache.lookup("What is the best programming language?", other_fp) is None
+        assert cache.lookup("How do rockets work?", fp) is None
+
+
+def test_symbols_stay_in_key():
+    print("--- Testing symbols are part of the cache key ---")
+    with _temp_db():
+        assert cache.normalize_query("  Is C++ better than  C#?! ") == "is c++ better than c#"
+        fp = cache.config_fingerprint("ALL", True, False, "", [])
+        cache.store("Is C++ better than C#?", fp, {"FINAL_DECISION": "Depends on the platform."})
+        assert cache.lookup("is c++ better than c#", fp) is not None
+        # Regression: stripping symbols made these the same key
+        assert cache.lookup("Is C better than C?", fp) is None
+        print("C++/C# and C/C no longer collide: OK")
+
+
+def test_lru_eviction():
+    print("--- Testing LRU eviction ---")
+    with _temp_db():
+        old_max, cache.MAX_ENTRIES = cache.MAX_ENTRIES, 2
+        fp = cache.config_fingerprint("CASPER", False, False, "", [])
+        try:
+            cache.store("question one", fp, {"FINAL_DECISION": "1"})
+            cache.store("question two", fp, {"FINAL_DECISION": "2"})
+            cache.lookup("question one", fp)  # touch → most recently used
+            cache.store("question three", fp, {"FINAL_DECISION": "3"})
+            assert cache.lookup("question two", fp) is None
+            assert cache.lookup("question one", fp) is not None
+        finally:
+            cache.MAX_ENTRIES = old_max
+
+
+if __name__ == "__main__":
+    test_response_cache()
+    test_symbols_stay_in_key()
+    test_lru_eviction()
@@ -0,0 +1,84 @@
+import sys
+import os
+import sqlite3
+import contextlib
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from memory.store import store_conversation
+from memory.search import search_memory, to_fts_query
+
+
+@contextlib.contextmanager
+def _temp_db(path=None):
+    """Point memory.db at a throwaway database; the real path is restored afterwards."""
+    saved = db.DB_PATH
+    db.DB_PATH = path or os.path.join(tempfile.mkdtemp(), "magi.db")
+    try:
+        yield db.DB_PATH
+    finally:
+        db.DB_PATH = saved
+
+
+def test_fts_search():
+    print("--- Testing FTS5 memory search ---")
+    with _temp_db():
+        for i in range(20000):  # through the real insert path, so every row is indexed
+            store_conversation(f"filler question {i}",
+                               {"CASPER": f"filler reply {i}", "FINAL_DECISION": f"filler answer {i}"})
+        store_conversation("Should we migrate to Kubernetes?",
+                           {"CASPER": "Containers everywhere!", "FINAL_DECISION": "Stay on VMs for now."},
+                           "- cluster ops cost too high")
+        store_conversation("Best pizza in Naples?",
+                           {"MELCHIOR": "Kubernetes is irrelevant here.", "FINAL_DECISION": "Da Michele."})
+
+        t0 = time.perf_counter()
+        hits = search_memory("kubernetes")
+        elapsed = (time.perf_counter() - t0) * 1000
+        print(f"{len(hits)} hits in {elapsed:.1f} ms: {hits}")
+        assert [h["query"] for h in hits] == ["Should we migrate to Kubernetes?", "Best pizza in Naples?"]
+        assert "[Kubernetes]" in hits[0]["snippet"]
+
+        assert search_memory("\"cluster ops\"")[0]["decision"] == "Stay on VMs for now."
+        assert search_memory("contain*")[0]["query"] == "Should we migrate to Kubernetes?"  # prefix
+        assert search_memory("pizza kubernetes")[0]["query"] == "Best pizza in Naples?"   # AND
+        assert search_memory("pizza zeppelin")[0]["query"] == "Best pizza in Naples?"     # OR fallback
+        assert search_memory('AND OR "') == []
+        assert to_fts_query('c++ "state machine" near*') == '"c" "state machine" "near"*'
+
+        with db.get_connection() as conn:
+            indexed = conn.execute("SELECT COUNT(*) FROM memory_fts WHERE memory_fts MATCH 'filler'").fetchone()[0]
+        assert indexed == 20000
+        assert search_memory("reply 19999")[0]["query"] == "filler question 19999"
+
+        # Triggers keep the index in sync with deletes, updates and turns written later
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM conversation_memory WHERE user_query LIKE 'Best pizza%'")
+            conn.execute("UPDATE conversation_memory SET keypoints = '- zeppelin hangar' WHERE id = 7")
+            conn.execute("INSERT INTO turns (memory_id, seq, speaker, body, compressed) "
+                         "VALUES (8, 5, 'CASPER', CAST('late quokka' AS BLOB), 0)")
+            conn.execute("DELETE FROM turns WHERE memory_id = 9")
+        assert len(search_memory("kubernetes")) == 1
+        assert search_memory("zeppelin")[0]["query"] == "filler question 6"
+        assert search_memory("quokka")[0]["query"] == "filler question 7"
+        assert search_memory('"reply 8"') == []
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO memory_fts(memory_fts, rank) VALUES ('integrity-check', 1)")
+
+        # Outside memory/db.py there is no unpack(): writes are refused, not left unindexed
+        raw = sqlite3.connect(db.DB_PATH)
+        try:
+            raw.execute("DELETE FROM conversation_memory WHERE id = 1")
+            assert False, "write without unpack() should fail"
+        except sqlite3.OperationalError as e:
+            assert "unpack" in str(e)
+        finally:
+            raw.close()
+        assert search_memory("reply 0")[0]["query"] == "filler question 0"
+
+
+if __name__ == "__main__":
+    test_fts_search()
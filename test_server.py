@@ -0,0 +1,232 @@
+import sys
+import os
+import asyncio
+import json
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from aiohttp.test_utils import TestClient, TestServer
+from api import server
+
+
+class FakePostProcessor:
+    depth = 0
+
+    async def flush(self):
+        pass
+
+
+class FakeCouncil:
+    """Stands in for MAGIOrchestrator: same process_query contract, no model server."""
+    calls = []
+    gate = None  # asyncio.Event that holds deliberations open when set
+    review = None  # asyncio.Event that holds the background clipboard review open when set
+    log = []
+
+    def __init__(self):
+        self.postprocess = FakePostProcessor()
+        self.session_key = "s"
+        self.clipboard = []
+
+    async def process_query(self, user_question, address_mode="ALL", status_callback=None,
+                            tool_callback=None, stats_callback=None, context_text="",
+                            refinement_mode=False, debate_mode=False, delta_callback=None):
+        FakeCouncil.calls.append((user_question, address_mode, debate_mode, refinement_mode, context_text))
+        if status_callback:
+            status_callback("BRIEFING")
+        if tool_callback:
+            tool_callback("[CASPER] TOOL → search_web")
+        if FakeCouncil.gate is not None:
+            try:
+                await FakeCouncil.gate.wait()
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.05)  # in-flight model calls take a moment to unwind
+                FakeCouncil.log.append("cancelled")
+                raise
+        if delta_callback:
+            for token in ("Ye", "s."):
+                delta_callback("CASPER", token)
+        if stats_callback:
+            stats_callback("CASPER: 2 tok")
+        seen = list(self.clipboard)
+        self.clipboard.append(f"memo from {user_question}")
+        return {"CASPER": "Yes.", "FINAL_DECISION": f"Answer to {user_question}", "clipboard": seen}
+
+    async def wait_background(self):
+        FakeCouncil.log.append("released")
+        if FakeCouncil.review is not None:
+            await FakeCouncil.review.wait()
+
+
+def _client(size=2):
+    return TestClient(TestServer(server.create_app(FakeCouncil, size)))
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_query_and_health():
+    print("--- Testing headless server /query and /health ---")
+
+    async def run():
+        async with _client() as client:
+            r = await client.get("/health")
+            assert r.status == 200 and (await r.json())["limit"] == 2
+
+            r = await client.post("/query", json={"query": " Ship it? ", "address_mode": "casper",
+                                                  "debate": True, "context": "ctx"})
+            body = await r.json()
+            assert r.status == 200, body
+            assert body["results"]["FINAL_DECISION"] == "Answer to Ship it?"
+            assert FakeCouncil.calls[-1] == ("Ship it?", "CASPER", True, False, "ctx")
+
+            for bad in ({"query": ""}, {"query": "x", "address_mode": "NOBODY"}, ["x"]):
+                r = await client.post("/query", json=bad)
+                assert r.status == 400 and "error" in await r.json()
+            r = await client.post("/query", data="not json")
+            assert r.status == 400
+
+    asyncio.run(run())
+    print("JSON request/response, option mapping and validation: OK")
+
+
+def test_stream_events():
+    print("--- Testing /query/stream Server-Sent Events ---")
+
+    async def run():
+        async with _client() as client:
+            r = await client.post("/query/stream", json={"query": "Stream it"})
+            assert r.headers["Content-Type"].startswith("text/event-stream")
+            events = _events(await r.text())
+            kinds = [kind for kind, _ in events]
+            print(f"Events: {kinds}")
+            assert kinds == ["status", "tool", "delta", "delta", "stats", "result"]
+            assert events[2][1] == {"agent": "CASPER", "token": "Ye"}
+            assert events[-1][1]["results"]["CASPER"] == "Yes."
+
+    asyncio.run(run())
+    print("Status, tool, delta and stats callbacks streamed, result last: OK")
+
+
+def test_stream_disconnect():
+    print("--- Testing client disconnect mid-stream ---")
+
+    async def run():
+        FakeCouncil.gate, FakeCouncil.log = asyncio.Event(), []
+        async with _client(size=1) as client:
+            r = await client.post("/query/stream", json={"query": "Walk away"})
+            first = await r.content.readuntil(b"\n\n")
+            assert first.startswith(b"event: status")
+            r.close()  # drop the connection while the council is still deliberating
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if (await (await client.get("/health")).json())["active"] == 0:
+                    break
+            print(f"Order: {FakeCouncil.log}")
+            assert FakeCouncil.log == ["cancelled", "released"]  # unwound before the slot came back
+            FakeCouncil.gate = None
+            r = await client.post("/query", json={"query": "next"})
+            assert r.status == 200
+        FakeCouncil.gate = None
+
+    asyncio.run(run())
+    print("Deliberation cancelled and finished before the orchestrator is released: OK")
+
+
+def test_concurrency_limit():
+    print("--- Testing concurrency limit ---")
+    old_waiting, old_timeout = server.MAX_WAITING, server.QUEUE_TIMEOUT
+
+    async def run():
+        FakeCouncil.gate = asyncio.Event()
+        async with _client(size=1) as client:
+            first = asyncio.create_task(client.post("/query", json={"query": "one"}))
+            second = asyncio.create_task(client.post("/query", json={"query": "two"}))
+            await asyncio.sleep(0.2)
+            health = await (await client.get("/health")).json()
+            print(f"Health while busy: {health}")
+            assert health["active"] == 1 and health["waiting"] == 1
+
+            r = await client.post("/query", json={"query": "three"})  # queue is full
+            assert r.status == 503
+
+            FakeCouncil.gate.set()
+            assert (await first).status == 200 and (await second).status == 200
+            health = await (await client.get("/health")).json()
+            assert health["active"] == 0 and health["waiting"] == 0
+        FakeCouncil.gate = None
+
+    server.MAX_WAITING, server.QUEUE_TIMEOUT = 1, 5
+    try:
+        asyncio.run(run())
+    finally:
+        server.MAX_WAITING, server.QUEUE_TIMEOUT = old_waiting, old_timeout
+    print("One in flight, one waiting, overflow rejected with 503: OK")
+
+
+def test_clipboard_shared_across_pool():
+    print("--- Testing one clipboard for every pool slot ---")
+
+    async def run():
+        async with _client(size=2) as client:
+            seen = []
+            for q in ("one", "two", "three"):  # consecutive requests rotate through both slots
+                r = await client.post("/query", json={"query": q})
+                seen.append((await r.json())["results"]["clipboard"])
+                await asyncio.sleep(0.05)
+            print(f"Clipboard seen by each request: {seen}")
+            assert seen == [[], ["memo from one"], ["memo from one", "memo from two"]]
+
+    asyncio.run(run())
+    print("Every request sees the same clipboard, whichever orchestrator it gets: OK")
+
+
+def test_response_not_held_by_review():
+    print("--- Testing responses go out before the clipboard review finishes ---")
+
+    async def run():
+        FakeCouncil.review = asyncio.Event()
+        async with _client(size=2) as client:
+            r = await asyncio.wait_for(client.post("/query", json={"query": "one"}), 2)
+            assert r.status == 200 and (await r.json())["results"]["CASPER"] == "Yes."
+            r = await asyncio.wait_for(client.post("/query/stream", json={"query": "two"}), 2)
+            kinds = [kind for kind, _ in _events(await asyncio.wait_for(r.text(), 2))]
+            assert kinds[-1] == "result"
+            health = await (await client.get("/health")).json()
+            print(f"Health during review: {health}")
+            assert health["active"] == 2  # both slots are still held by their reviews...
+
+            FakeCouncil.review.set()
+            await asyncio.sleep(0.05)
+            health = await (await client.get("/health")).json()
+            assert health["active"] == 0  # ...and freed once it is done
+        FakeCouncil.review = None
+
+    asyncio.run(run())
+    print("Response and stream close first, slots released after the review: OK")
+
+
+def test_no_ui_imports():
+    print("--- Testing server imports no GUI code ---")
+    import subprocess
+    code = ("import sys; sys.path.insert(0, '.'); import api.server as s; s.create_app(); "
+            "bad = [m for m in sys.modules if m.split('.')[0] in ('ui', 'tkinter', 'customtkinter')]; "
+            "print(bad); sys.exit(1 if bad else 0)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    print("No ui/, tkinter or customtkinter modules loaded: OK")
+
+
+if __name__ == "__main__":
+    test_query_and_health()
+    test_stream_events()
+    test_stream_disconnect()
+    test_concurrency_limit()
+    test_clipboard_shared_across_pool()
+    test_response_not_held_by_review()
+    test_no_ui_imports()
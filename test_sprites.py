@@ -0,0 +1,96 @@
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from PIL import Image, ImageChops
+from ui import sprites
+
+NAMES = ("melchior", "balthasar", "casper")
+COUNTS = {"idle": 1, "active": 1, "thinking": 12, "speaking": 16}
+
+
+def _reset(images_dir="images"):
+    sprites.IMAGES_DIR = images_dir
+    sprites._images.clear()
+    sprites._frames.clear()
+    sprites._manifests.clear()
+
+
+def test_sheet_frames_match_generator():
+    print("--- Testing sprite sheet manifest and slicing ---")
+    _reset()
+    for name in NAMES:
+        for state, count in COUNTS.items():
+            assert sprites.frame_count(name.upper(), state) == count
+    # The static badges are still shipped on their own: the sheet must hold the same pixels
+    for name in NAMES:
+        for state in ("idle", "active"):
+            loose = Image.open(f"images/{name}_{state}.png").convert("RGB")
+            assert ImageChops.difference(sprites.frame(name, state, 0), loose).getbbox() is None
+    assert sprites.frame("melchior", "speaking", 15).size == (150, 150)
+    assert sprites.frame("melchior", "speaking", 16) is None
+    print("Manifest counts and frame pixels: OK")
+
+
+def test_lazy_shared_frames():
+    print("--- Testing lazy, shared frame cache ---")
+    _reset()
+    sprites.frame_count("casper", "idle")
+    assert not sprites._images  # counting frames decodes nothing
+    a = sprites.frame("casper", "thinking", 3)
+    assert sprites.frame("CASPER", "thinking", 3) is a  # same object for every widget
+    assert len(sprites._images) == 1  # one sheet decoded, not one file per frame
+    assert len(sprites._frames) == 1  # only the frame asked for was cropped
+    print("One decode per sheet, frames cropped on demand: OK")
+
+
+def test_faster_than_loose_files():
+    print("--- Testing startup cost vs. loose per-frame PNGs ---")
+    tmp = tempfile.mkdtemp()
+    _reset()
+    for name in NAMES:  # recreate the old layout: one PNG per frame
+        for state, count in COUNTS.items():
+            for i in range(count):
+                suffix = "" if count == 1 else f"_{i:02d}"
+                sprites.frame(name, state, i).save(os.path.join(tmp, f"{name}_{state}{suffix}.png"))
+
+    def startup(images_dir):
+        # What three indicators need before the window shows: counts + the idle frame
+        _reset(images_dir)
+        start = time.perf_counter()
+        for name in NAMES:
+            counts = {state: sprites.frame_count(name, state) for state in COUNTS}
+            sprites.frame(name, "idle", 0)
+        return time.perf_counter() - start, counts, len(sprites._frames)
+
+    def old_startup(images_dir):
+        start = time.perf_counter()
+        frames = [Image.open(os.path.join(images_dir, f)).convert("RGB")
+                  for f in sorted(os.listdir(images_dir))]
+        return time.perf_counter() - start, len(frames)
+
+    old_time, old_frames = old_startup(tmp)
+    new_time, counts, new_frames = startup("images")
+    print(f"Old: {old_frames} frames decoded in {old_time * 1000:.1f}ms; "
+          f"sheets: {new_frames} frames in {new_time * 1000:.1f}ms")
+    assert counts == COUNTS
+    assert new_frames == 3 and old_frames == 90
+    assert new_time < old_time
+
+    # Loose-file fallback when no manifest is present
+    _reset(tmp)
+    assert sprites.frame_count("melchior", "speaking") == 16
+    assert sprites.frame("melchior", "speaking", 5).size == (150, 150)
+    shutil.rmtree(tmp)
+    _reset()
+    print("Sprite sheets beat per-frame loading; loose-file fallback works: OK")
+
+
+if __name__ == "__main__":
+    test_sheet_frames_match_generator()
+    test_lazy_shared_frames()
+    test_faster_than_loose_files()
@@ -0,0 +1,53 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from llm.streaming import parse_stream, StreamAssembler, parse_sse_line
+
+# Captured shape of an LM Studio stream: content, a split tool call, usage/stats trailer
+SSE_LINES = [
+    b'data: {"choices":[{"delta":{"role":"assistant","content":"Hel"}}]}\n',
+    b'data: {"choices":[{"delta":{"content":"lo"}}]}\n',
+    b'\n',
+    b'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"id":"call_1","function":{"name":"search_web","arguments":"{\\"query\\":"}}]}}]}\n',
+    b'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"function":{"arguments":"\\"magi\\"}"}}]}}]}\n',
+    b'data: {"choices":[{"delta":{},"finish_reason":"tool_calls"}]}\n',
+    b'data: {"choices":[],"usage":{"prompt_tokens":12,"completion_tokens":5},"stats":{"tokens_per_second":40.0}}\n',
+    b'data: [DONE]\n',
+]
+
+
+def test_parse_stream():
+    print("--- Testing SSE token parsing ---")
+    tokens = list(parse_stream(SSE_LINES))
+    print(f"Tokens: {tokens}")
+    assert tokens == ["Hel", "lo"]
+    assert parse_sse_line(b"data: [DONE]") is None
+
+
+def test_assembler():
+    print("--- Testing stream assembly ---")
+    asm = StreamAssembler()
+    deltas = []
+    for line in SSE_LINES:
+        data = parse_sse_line(line)
+        if data:
+            token = asm.feed(data)
+            if token:
+                deltas.append(token)
+    result = asm.result()
+    msg = result["choices"][0]["message"]
+    print(f"Assembled: {result}")
+    assert deltas == ["Hel", "lo"]
+    assert msg["content"] == "Hello"
+    assert msg["tool_calls"][0]["id"] == "call_1"
+    assert msg["tool_calls"][0]["function"]["arguments"] == '{"query":"magi"}'
+    assert result["choices"][0]["finish_reason"] == "tool_calls"
+    assert result["usage"]["completion_tokens"] == 5
+    assert result["stats"]["tokens_per_second"] == 40.0
+
+
+if __name__ == "__main__":
+    test_parse_stream()
+    test_assembler()
@@ -0,0 +1,133 @@
+import sys
+import os
+import asyncio
+import contextlib
+import tempfile
+import threading
+import time
+import zlib
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from core import tools_runner
+from tools import cache as tool_cache
+
+
+@contextlib.contextmanager
+def _fresh_cache():
+    """Empty cache in a temp magi.db; the real DB path is restored afterwards."""
+    saved = db.DB_PATH
+    db.DB_PATH = os.path.join(tempfile.mkdtemp(), "magi.db")
+    tool_cache.MODE = "normal"
+    for k in tool_cache.counters:
+        tool_cache.counters[k] = 0
+    try:
+        yield
+    finally:
+        db.DB_PATH = saved
+
+
+def test_keys_and_freshness():
+    print("--- Testing tool cache keys / freshness ---")
+    with _fresh_cache():
+        url = "HTTPS://Docs.Python.org/3/library/asyncio.html?b=2&a=1&utm_source=x#top"
+        print(f"normalized: {tool_cache.normalize_url(url)}")
+        assert tool_cache.normalize_url(url) == "https://docs.python.org/3/library/asyncio.html?a=1&b=2"
+
+        tool_cache.put("read_url", {"url": url}, "asyncio docs")
+        assert tool_cache.get("read_url", {"url": "https://docs.python.org/3/library/asyncio.html/?a=1&b=2"}) == "asyncio docs"
+        assert tool_cache.get("jina_search", {"url": url}) is None  # tool is part of the key
+
+        # News-flavoured queries expire fast, reference lookups don't
+        assert tool_cache.ttl_for({"query": "latest news on the election"}) == tool_cache.FRESH_TTL
+        assert tool_cache.ttl_for({"query": "python asyncio semaphore"}) == tool_cache.STABLE_TTL
+
+        tool_cache.FRESH_TTL, saved = -1, tool_cache.FRESH_TTL
+        try:
+            tool_cache.put("jina_search", {"query": "today's headlines"}, "old news")
+        finally:
+            tool_cache.FRESH_TTL = saved
+        assert tool_cache.get("jina_search", {"query": "Today's   headlines"}) is None
+
+        s = tool_cache.stats()
+        print(f"stats: {s}")
+        assert s["hits"] == 1 and s["misses"] == 2 and s["entries"] == 2
+
+
+def test_key_normalization_is_narrow():
+    print("--- Testing only tracking params and the search query are folded ---")
+    url = "https://github.com/org/repo/compare?ref=v2&gclid=1&fbclid=2&utm_medium=m"
+    assert tool_cache.normalize_url(url) == "https://github.com/org/repo/compare?ref=v2"
+    assert tool_cache._key("read_url", {"url": url}) != \
+        tool_cache._key("read_url", {"url": url.replace("ref=v2", "ref=v3")})
+    # Search text is case-insensitive; other string arguments keep their case
+    assert tool_cache._key("jina_search", {"query": "Rust  News"}) == \
+        tool_cache._key("jina_search", {"query": "rust news"})
+    assert tool_cache._key("fetch_url_content", {"url": "https://x.org", "mode": "Raw"}) != \
+        tool_cache._key("fetch_url_content", {"url": "https://x.org", "mode": "raw"})
+    print("?ref= kept, case-sensitive arguments distinct: OK")
+
+
+def test_lru_eviction():
+    print("--- Testing size-bounded LRU eviction ---")
+    with _fresh_cache():
+        bodies = [os.urandom(600).hex() for _ in range(4)]  # incompressible, ~650 bytes each
+        saved = tool_cache.MAX_BYTES
+        tool_cache.MAX_BYTES = 3 * len(zlib.compress(bodies[0].encode(), 6)) + 100  # room for three
+        try:
+            for i in range(3):
+                tool_cache.put("read_url", {"url": f"https://x.org/{i}"}, bodies[i])
+                time.sleep(0.01)
+            tool_cache.get("read_url", {"url": "https://x.org/0"})  # touch the oldest
+            tool_cache.put("read_url", {"url": "https://x.org/3"}, bodies[3])
+        finally:
+            tool_cache.MAX_BYTES = saved
+        kept = [i for i in range(4) if tool_cache.get("read_url", {"url": f"https://x.org/{i}"})]
+        print(f"kept: {kept}  evictions: {tool_cache.counters['evictions']}")
+        assert 0 in kept and 3 in kept and 1 not in kept
+
+
+def test_runner_replay():
+    print("--- Testing read-through + offline replay ---")
+    with _fresh_cache():
+        calls = []
+
+        async def fake_read(url):
+            calls.append(url)
+            return f"page {url}"
+
+        threads = set()
+        real_get, real_put = tool_cache.get, tool_cache.put
+
+        def spy(fn):
+            def wrapper(*args):
+                threads.add(threading.current_thread())
+                return fn(*args)
+            return wrapper
+
+        original = tools_runner.read_url
+        tools_runner.read_url = fake_read
+        tool_cache.get, tool_cache.put = spy(real_get), spy(real_put)
+        try:
+            first = asyncio.run(tools_runner.execute_tool("read_url", {"url": "https://a.org/"}))
+            second = asyncio.run(tools_runner.execute_tool("read_url", {"url": "https://a.org"}))
+            tool_cache.MODE = "offline"
+            replay = asyncio.run(tools_runner.execute_tool("read_url", {"url": "https://a.org"}))
+            missing = asyncio.run(tools_runner.execute_tool("read_url", {"url": "https://b.org"}))
+        finally:
+            tools_runner.read_url = original
+            tool_cache.get, tool_cache.put = real_get, real_put
+            tool_cache.MODE = "normal"
+        print(f"fetches: {calls}  replay: {replay!r}  missing: {missing[:40]!r}")
+        assert first == second == replay == "page https://a.org/"
+        assert len(calls) == 1
+        assert missing.startswith("[ERROR: offline replay")
+        assert threads and threading.main_thread() not in threads  # sqlite never on the event loop
+
+
+if __name__ == "__main__":
+    test_keys_and_freshness()
+    test_key_normalization_is_narrow()
+    test_lru_eviction()
+    test_runner_replay()
@@ -1,10 +1,19 @@
 import sys
 import os
+import asyncio
 
 sys.path.insert(0, os.path.abspath('.'))
 
 from tools.web_search import search_web
 from tools.url_fetch import fetch_url_content
+from llm.session import close_session
+
+
+async def _fetch(url, max_chars):
+    try:
+        return await fetch_url_content(url, max_chars=max_chars)
+    finally:
+        await close_session()
 
 def test_tools():
     print("--- Testing Phase 6 Tools ---")
@@ -17,8 +26,8 @@ def test_tools():
     else:
         print("Search failed or returned no results. Check internet connection/dependencies.")
         
-    print("\n[TEST 2] URL Fetch (BeautifulSoup)")
-    text = fetch_url_content("https://en.wikipedia.org/wiki/Neon_Genesis_Evangelion", max_chars=200)
+    print("\n[TEST 2] URL Fetch (streaming extractor)")
+    text = asyncio.run(_fetch("https://en.wikipedia.org/wiki/Neon_Genesis_Evangelion", 200))
     print(f"Extracted Text:\n{text}")
 
 if __name__ == "__main__":
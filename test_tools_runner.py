@@ -0,0 +1,82 @@
+import sys
+import os
+import asyncio
+import time
+import json
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from core import tools_runner
+
+
+def _call(fn, **kwargs):
+    return {"id": fn, "function": {"name": fn, "arguments": json.dumps(kwargs)}}
+
+
+def test_concurrent_tool_calls():
+    print("--- Testing concurrent tool execution ---")
+
+    async def slow_read(url):
+        await asyncio.sleep(0.2)
+        return f"read {url}"
+
+    def blocking_search(query, max_results=None):
+        time.sleep(0.2)  # sync DDG client — must run in a thread
+        return [{"title": query}]
+
+    async def hung_fetch(url, max_chars=5000):
+        if url == "broken":
+            return len(None)  # TypeError from inside the tool, arguments were fine
+        await asyncio.sleep(10)
+
+    originals = (tools_runner.read_url, tools_runner.search_web, tools_runner.fetch_url_content)
+    tools_runner.read_url = slow_read
+    tools_runner.search_web = blocking_search
+    tools_runner.fetch_url_content = hung_fetch
+    tools_runner.TOOL_TIMEOUTS["fetch_url_content"] = 0.3
+    saved_db = db.DB_PATH
+    db.DB_PATH = os.path.join(tempfile.mkdtemp(), "magi.db")
+    try:
+        started = []
+        calls = [
+            _call("read_url", url="a"),
+            _call("search_web", query="magi"),
+            _call("read_url", url="b"),
+            _call("fetch_url_content", url="c"),
+            _call("read_url", bogus=1),
+            _call("nope"),
+            _call("fetch_url_content", url="broken"),
+            {"id": "list", "function": {"name": "read_url", "arguments": "[1, 2]"}},  # not an object
+        ]
+        t0 = time.perf_counter()
+        results = asyncio.run(tools_runner.execute_tool_calls(
+            calls, lambda fn, kw: started.append(fn)))
+        elapsed = time.perf_counter() - t0
+        direct = asyncio.run(tools_runner.execute_tool("search_web", [1, 2]))
+    finally:
+        tools_runner.read_url, tools_runner.search_web, tools_runner.fetch_url_content = originals
+        tools_runner.TOOL_TIMEOUTS["fetch_url_content"] = 15
+        db.DB_PATH = saved_db
+
+    for tc, fn, out in results:
+        print(f"{fn}: {out[:60]}")
+    print(f"elapsed: {elapsed:.2f}s")
+
+    outs = [out for _, _, out in results]
+    assert [fn for _, fn, _ in results] == [c["function"]["name"] for c in calls]
+    assert outs[0] == "read a" and outs[2] == "read b"
+    assert '"magi"' in outs[1]
+    assert outs[3].startswith("[ERROR") and "timed out" in outs[3]
+    assert outs[4].startswith("[ERROR: bad arguments")
+    assert outs[5].startswith("[ERROR: Unknown tool")
+    assert outs[6].startswith("[ERROR: fetch_url_content failed: TypeError")
+    assert outs[7].startswith("[ERROR: bad arguments for read_url")
+    assert direct.startswith("[ERROR: bad arguments for search_web: expected a JSON object")
+    assert len(started) == len(calls)
+    assert elapsed < 0.6  # run together, not 0.2 + 0.2 + 0.2 + 0.3
+
+
+if __name__ == "__main__":
+    test_concurrent_tool_calls()
@@ -0,0 +1,122 @@
+import sys
+import os
+import contextlib
+import asyncio
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import memory.db as db
+from memory.schema import MIGRATIONS
+from memory.store import store_conversation, load_turns
+from memory.search import search_memory
+from memory.compact import compact
+
+LONG = "The cluster autoscaler keeps thrashing under bursty load. " * 40
+
+TRANSCRIPT = [
+    {"speaker": "CASPER", "round": 0, "kind": "opening", "text": "Go serverless!"},
+    {"speaker": "BALTHASAR", "round": 0, "kind": "response", "text": LONG},
+    {"speaker": "MELCHIOR", "round": 0, "kind": "synthesis", "text": "DEBATE: cost?"},
+    {"speaker": "CASPER", "round": 1, "kind": "rebuttal", "text": "Lambda is cheap."},
+    {"speaker": "BALTHASAR", "round": 1, "kind": "counter", "text": "Not at our volume."},
+    {"speaker": "MELCHIOR", "round": 1, "kind": "synthesis", "text": "Stay on VMs."},
+]
+
+
+@contextlib.contextmanager
+def _temp_db(path=None):
+    """Point memory.db at a throwaway database; the real path is restored afterwards."""
+    saved = db.DB_PATH
+    db.DB_PATH = path or os.path.join(tempfile.mkdtemp(), "magi.db")
+    try:
+        yield db.DB_PATH
+    finally:
+        db.DB_PATH = saved
+
+
+def test_turns_storage_and_compaction():
+    print("--- Testing sessions / turns storage ---")
+    with _temp_db():
+        mid = store_conversation("Should we go serverless?", {"FINAL_DECISION": "Stay on VMs."},
+                                 "- stay on VMs", session="s1", turns=TRANSCRIPT)
+        store_conversation("Second question", {"MELCHIOR": "Yes.", "FINAL_DECISION": "Yes."}, session="s1")
+
+        assert load_turns(mid) == TRANSCRIPT  # debate rounds survive, in order
+        with db.get_connection() as conn:
+            rows = conn.execute("SELECT speaker, compressed, is_final, length(body), chars FROM turns "
+                                "WHERE memory_id = ? ORDER BY seq", (mid,)).fetchall()
+            sessions = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        print(f"turn rows: {rows}")
+        assert rows[1][1] == 1 and rows[1][3] < rows[1][4] // 10   # long body compressed
+        assert rows[5][2] == 1 and rows[5][3] == 0                 # final not stored twice
+        assert sessions == 1
+
+        hits = search_memory("autoscaler")  # agent text is still searchable
+        print(f"search hits: {[(h['query'], h['snippet'][:40]) for h in hits]}")
+        assert [h["query"] for h in hits] == ["Should we go serverless?"]
+
+        # Age the first deliberation past retention → transcript rolled up into keypoints
+        with db.get_connection() as conn:
+            conn.execute("UPDATE conversation_memory SET timestamp = datetime('now', '-400 days') "
+                         "WHERE id = ?", (mid,))
+        assert asyncio.run(compact(days=90)) == 1
+        assert load_turns(mid) == []
+        assert search_memory("autoscaler") == []
+        assert search_memory("serverless")[0]["decision"] == "Stay on VMs."
+        assert len(load_turns(mid + 1)) == 1  # recent ones untouched
+
+
+def test_compaction_tries_failed_rows_once():
+    print("--- Testing compaction retries a failed extraction at most once per run ---")
+    import memory.compact as compact_mod
+    import memory.extract as extract
+    calls = []
+
+    async def flaky_extract(query, text):
+        calls.append(query)
+        return "[Error: model offline]" if query.startswith("bad") else f"- {query}"
+
+    original = extract.extract_keypoints, compact_mod.BATCH
+    extract.extract_keypoints, compact_mod.BATCH = flaky_extract, 3
+    try:
+        with _temp_db():
+            for i in range(7):
+                store_conversation(f"{'bad' if i < 4 else 'good'} {i}", {"MELCHIOR": "m", "FINAL_DECISION": "d"})
+            with db.get_connection() as conn:
+                conn.execute("UPDATE conversation_memory SET timestamp = datetime('now', '-400 days')")
+            done = asyncio.run(compact(days=90))
+    finally:
+        extract.extract_keypoints, compact_mod.BATCH = original
+    print(f"compacted {done}, extraction calls: {calls}")
+    assert done == 3
+    assert calls == [f"{'bad' if i < 4 else 'good'} {i}" for i in range(7)]  # each row once
+
+
+def test_migration_from_wide_table():
+    print("--- Testing migration of per-agent columns into turns ---")
+    path = os.path.join(tempfile.mkdtemp(), "magi.db")
+    old = sqlite3.connect(path)
+    for sql in MIGRATIONS[0][1]:
+        old.execute(sql)
+    old.execute("INSERT INTO conversation_memory (user_query, casper_response, balthasar_response, "
+                "melchior_response, final_decision) VALUES ('q', 'c says', 'b says', 'm rules', 'm rules')")
+    old.commit()
+    old.close()
+
+    with _temp_db(path):
+        turns = load_turns(1)
+        print(f"migrated turns: {turns}")
+        assert [(t["speaker"], t["text"]) for t in turns] == [
+            ("CASPER", "c says"), ("BALTHASAR", "b says"), ("MELCHIOR", "m rules")]
+        with db.get_connection() as conn:
+            wide = conn.execute("SELECT casper_response, melchior_response FROM conversation_memory").fetchone()
+        assert wide == (None, None)
+        assert search_memory("says")[0]["query"] == "q"
+
+
+if __name__ == "__main__":
+    test_turns_storage_and_compaction()
+    test_compaction_tries_failed_rows_once()
+    test_migration_from_wide_table()
@@ -0,0 +1,69 @@
+import sys
+import os
+import asyncio
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from aiohttp import web
+from tools.url_fetch import fetch_url_content, TextExtractor
+from llm.session import close_session
+
+
+def test_extractor_strips_boilerplate():
+    print("--- Testing streaming HTML extraction ---")
+    html = ("<html><head><style>p{color:red}</style><script>var x='<p>no</p>';</script></head>"
+            "<body><nav><a>Home</a><a>About</a></nav><h1>Title</h1><p>First&nbsp;para"
+            "graph.</p><p>Second<br/>line</p><footer>(c) 2024</footer></body></html>")
+    parser = TextExtractor(limit=1000)
+    for i in range(0, len(html), 7):  # tiny chunks split tags and words
+        parser.feed(html[i:i + 7])
+    parser.close()
+    print(f"Text: {parser.text()!r}")
+    assert parser.text() == "Title First paragraph. Second line"
+
+
+async def _serve_and_fetch(max_chars):
+    async def big_page(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/html; charset=iso-8859-1"})
+        await resp.prepare(request)
+        await resp.write("<html><body><script>junk()</script>".encode("latin-1"))
+        try:
+            for i in range(400):  # ~260 KB, trickled out over ~2 s if read to the end
+                chunk = f"<p>Café paragraph {i} with some filler words.</p>".encode("latin-1") * 12
+                await resp.write(chunk)
+                await asyncio.sleep(0.005)
+        except (ConnectionResetError, ConnectionError):
+            pass  # client stopped reading — the point of the test
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/big", big_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        t0 = time.perf_counter()
+        text = await fetch_url_content(f"http://127.0.0.1:{port}/big", max_chars=max_chars)
+        elapsed = time.perf_counter() - t0
+    finally:
+        await close_session()
+        await runner.cleanup()
+    return text, elapsed
+
+
+def test_early_cutoff_and_charset():
+    print("--- Testing early cutoff + charset ---")
+    text, elapsed = asyncio.run(_serve_and_fetch(500))
+    print(f"Got {len(text)} chars in {elapsed:.2f}s")
+    assert text.startswith("Café paragraph 0")
+    assert "junk" not in text
+    assert text.endswith("[TRUNCATED]")
+    assert elapsed < 1.0  # stopped after the first chunks, didn't wait for the whole page
+
+
+if __name__ == "__main__":
+    test_extractor_strips_boilerplate()
+    test_early_cutoff_and_charset()
@@ -0,0 +1,148 @@
+import sys
+import os
+import contextlib
+import asyncio
+import tempfile
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import numpy as np
+import memory.db as db
+from memory import embeddings, vectors
+from memory.store import store_conversation
+from memory.retrieve import retrieve_relevant_context
+from memory.postprocess import PostProcessor
+from memory.compact import compact
+from core.config import CONFIG
+
+TOPICS = [
+    ("How do I bake sourdough bread?", "- long fermentation\n- levain starter"),
+    ("Should we migrate the cluster to Kubernetes?", "- stay on VMs\n- ops cost"),
+    ("Best hiking trails near Denver?", "- Mount Falcon\n- Red Rocks"),
+]
+
+
+@contextlib.contextmanager
+def _isolate():
+    """Temp database and index, offline embeddings; module state restored afterwards."""
+    tmp = tempfile.mkdtemp()
+    saved = db.DB_PATH, vectors.BASE_PATH, embeddings.BACKEND
+    db.DB_PATH = os.path.join(tmp, "magi.db")
+    vectors.BASE_PATH = os.path.join(tmp, "memory_vectors")
+    embeddings.BACKEND = "hashed"  # offline, deterministic
+    try:
+        yield
+    finally:
+        db.DB_PATH, vectors.BASE_PATH, embeddings.BACKEND = saved
+
+
+def test_incremental_index_and_recall():
+    print("--- Testing semantic memory index ---")
+    with _isolate():
+        for q, kp in TOPICS:
+            store_conversation(q, {"FINAL_DECISION": "..."}, kp)
+
+        assert asyncio.run(vectors.sync()) == 3
+        assert asyncio.run(vectors.sync()) == 0  # nothing new
+        store_conversation("Kubernetes helm chart layout?", {"FINAL_DECISION": "..."}, "- one chart per service")
+        assert asyncio.run(vectors.sync()) == 1  # incremental add
+
+        index = vectors.get_index()
+        print(f"rows={index.count} dim={index.dim} model={index.model} vecs={type(index.vecs).__name__}")
+        assert index.count == 4 and index.vecs.dtype == np.float16
+        assert isinstance(index.vecs, np.memmap)
+
+        hits = asyncio.run(vectors.search("kubernetes cluster migration", 2))
+        print(f"hits: {hits}")
+        assert hits[0][0] == 2
+
+        context = asyncio.run(retrieve_relevant_context("sourdough starter", limit=1))
+        print(context)
+        assert "sourdough" in context and "Kubernetes" not in context
+
+        # Reopening from disk gives the same answers
+        vectors._indexes.clear()
+        assert asyncio.run(vectors.search("kubernetes cluster migration", 2)) == hits
+
+
+def test_ivf_matches_brute_force():
+    print("--- Testing IVF index ---")
+    with _isolate():
+        rng = np.random.default_rng(1)
+        data = rng.normal(size=(3000, 32)).astype(np.float32)
+        data /= np.linalg.norm(data, axis=1, keepdims=True)
+
+        saved = vectors.IVF_THRESHOLD
+        vectors.IVF_THRESHOLD = 2000
+        try:
+            index = vectors.VectorIndex(vectors.BASE_PATH)
+            index.reset("test", 32)
+            index.add(list(range(1, 1501)), data[:1500])
+            assert index.centroids is None           # brute force below the threshold
+            index.add(list(range(1501, 2501)), data[1500:2500])
+            assert index.centroids is not None       # trained once over it
+            index.add(list(range(2501, 3001)), data[2500:])
+            assert len(index.assign) == 3000         # new rows assigned incrementally
+        finally:
+            vectors.IVF_THRESHOLD = saved
+
+        found = 0
+        for i in range(0, 3000, 150):
+            q = data[i] + rng.normal(scale=0.05, size=32).astype(np.float32)
+            found += index.search(q / np.linalg.norm(q), 1)[0][0] == i + 1
+        print(f"IVF recall@1: {found}/20")
+        assert found >= 18
+
+        assert index.remove([1, 151, 99999]) == 2   # unknown ids are ignored
+        assert index.count == len(index.assign) == 2998 and 151 not in index.ids
+        reopened = vectors.VectorIndex(vectors.BASE_PATH)
+        assert reopened.count == 2998 and reopened.search(data[300], 1)[0][0] == 301
+
+
+def test_indexing_follows_recall_and_compaction():
+    print("--- Testing vector indexing is gated on MEMORY_RECALL and refreshed by compaction ---")
+    import memory.extract as extract
+    saved_config, saved_extract = dict(CONFIG), extract.extract_keypoints
+
+    async def fake_keypoints(query, text):
+        return "- levain starter\n- overnight proof"
+
+    async def store(p, query):
+        p.submit("store", query=query, responses={"FINAL_DECISION": "Bake it slowly."},
+                 store_text="Bake it slowly.",
+                 turns=[{"speaker": "MELCHIOR", "round": 0, "kind": "synthesis", "text": "Bake it slowly."}])
+        await p.flush()
+
+    with _isolate():
+        tmp = tempfile.mkdtemp()
+        CONFIG.update({"AUTO_EXTRACT_KEYPOINTS": False, "MEMORY_RECALL": False})
+        extract.extract_keypoints = fake_keypoints
+        try:
+            asyncio.run(store(PostProcessor(os.path.join(tmp, "q1.json")), "How do I bake sourdough bread?"))
+            assert vectors.get_index().count == 0  # recall off: no embeddings call per query
+
+            CONFIG["MEMORY_RECALL"] = True
+            asyncio.run(store(PostProcessor(os.path.join(tmp, "q2.json")), "Best hiking trails near Denver?"))
+            index = vectors.get_index()
+            assert sorted(index.ids.tolist()) == [1, 2]  # catches up on what it missed
+            before = asyncio.run(vectors.search("levain starter overnight proof", 1))
+
+            with db.get_connection() as conn:
+                conn.execute("UPDATE conversation_memory SET timestamp = datetime('now', '-400 days') "
+                             "WHERE id = 1")
+            assert asyncio.run(compact(days=90)) == 1
+            after = asyncio.run(vectors.search("levain starter overnight proof", 1))
+        finally:
+            extract.extract_keypoints = saved_extract
+            CONFIG.clear()
+            CONFIG.update(saved_config)
+
+    print(f"before compaction: {before}  after: {after}")
+    assert sorted(index.ids.tolist()) == [1, 2]   # stale row replaced, not duplicated
+    assert after[0][0] == 1 and after[0][1] > before[0][1]  # now embedded from the keypoints
+
+
+if __name__ == "__main__":
+    test_incremental_index_and_recall()
+    test_ivf_matches_brute_force()
+    test_indexing_follows_recall_and_compaction()
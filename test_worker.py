@@ -0,0 +1,95 @@
+import sys
+import os
+import asyncio
+import concurrent.futures
+import time
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from aiohttp import web
+from core.worker import QueryWorker
+from llm.session import get_session
+
+
+def test_jobs_run_in_order_on_one_loop():
+    print("--- Testing persistent worker loop ---")
+    worker = QueryWorker()
+    seen = []
+
+    async def job(n):
+        await asyncio.sleep(0.05 if n == 0 else 0)
+        seen.append((n, asyncio.get_running_loop(), id(get_session())))
+        return n * 10
+
+    futures = [worker.submit(job, n) for n in range(3)]
+    assert [f.result(5) for f in futures] == [0, 10, 20]
+    assert [n for n, _, _ in seen] == [0, 1, 2]  # one at a time, in submission order
+    assert len({loop for _, loop, _ in seen}) == 1 and seen[0][1] is worker.loop
+    assert len({sid for _, _, sid in seen}) == 1  # the pooled HTTP session outlives each query
+    worker.stop()
+    assert not worker._thread.is_alive() and worker.loop.is_closed()
+    print("Same loop and HTTP session across queries: OK")
+
+
+def test_cancel_running_and_queued():
+    print("--- Testing query cancellation ---")
+    state = {"started": 0, "disconnected": 0}
+
+    async def slow(request):  # a generation that would take 30s
+        state["started"] += 1
+        response = web.StreamResponse()
+        await response.prepare(request)
+        try:
+            for _ in range(300):
+                await response.write(b"data: tok\n\n")
+                await asyncio.sleep(0.1)
+        except (ConnectionResetError, asyncio.CancelledError):
+            state["disconnected"] += 1  # the client dropped the connection
+        return response
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/", slow)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, site._server.sockets[0].getsockname()[1]
+
+    worker = QueryWorker()
+    runner, port = worker.run(serve())
+
+    async def query():
+        async with get_session().get(f"http://127.0.0.1:{port}/") as response:
+            async for _ in response.content:
+                pass
+        return "finished"
+
+    running = worker.submit(query)
+    queued = worker.submit(query)
+    while not state["started"]:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    assert worker.cancel() == 2
+    try:
+        running.result(5)
+        assert False, "running query should have been cancelled"
+    except (asyncio.CancelledError, concurrent.futures.CancelledError):
+        pass
+    assert queued.cancelled()
+    time.sleep(0.3)
+    print(f"Cancelled in {(time.perf_counter() - start) * 1000:.0f}ms; "
+          f"server saw {state['disconnected']} disconnect(s)")
+    assert state["disconnected"] == 1 and state["started"] == 1  # queued one never ran
+
+    # The loop keeps serving after a cancel
+    assert worker.submit(asyncio.sleep, 0, "next").result(5) == "next"
+    worker.run(runner.cleanup())
+    worker.stop()
+    print("Stop cancels the in-flight request and the queue: OK")
+
+
+if __name__ == "__main__":
+    test_jobs_run_in_order_on_one_loop()
+    test_cancel_running_and_queued()
@@ -3,11 +3,15 @@ Web reader tool using Jina AI Reader API.
 Standard AI agent pattern — single HTTP GET to r.jina.ai/{url}
 Returns clean LLM-ready markdown. No browser, no dependencies.
 Also provides Jina Search (s.jina.ai) for Google-style search with full content.
+Both are native async over the pooled aiohttp session — they never block the loop.
 """
-import urllib.request
 import urllib.parse
+import aiohttp
+from llm.session import get_session
 
-MAX_CONTENT_CHARS = 1200
+# Generous — tools/rank.py picks the relevant passages out of this for the prompt
+MAX_CONTENT_CHARS = 12000
+READ_TIMEOUT = 20
 
 JINA_HEADERS = {
     "Accept": "text/plain",
@@ -16,16 +20,20 @@ JINA_HEADERS = {
 }
 
 
-def read_url(url: str) -> str:
+async def _get_text(url: str) -> str:
+    timeout = aiohttp.ClientTimeout(total=READ_TIMEOUT)
+    async with get_session().get(url, headers=JINA_HEADERS, timeout=timeout) as resp:
+        resp.raise_for_status()
+        return await resp.text(errors="replace")
+
+
+async def read_url(url: str) -> str:
     """
     Fetches a URL through Jina AI Reader and returns clean markdown content.
     Works on JS-heavy pages, news sites, docs — anything with real content.
     """
     try:
-        jina_url = f"https://r.jina.ai/{url}"
-        req = urllib.request.Request(jina_url, headers=JINA_HEADERS)
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            content = resp.read().decode("utf-8", errors="replace")
+        content = await _get_text(f"https://r.jina.ai/{url}")
         if len(content) > MAX_CONTENT_CHARS:
             content = content[:MAX_CONTENT_CHARS] + "\n[Content truncated]"
         return content
@@ -33,18 +41,14 @@ def read_url(url: str) -> str:
         return f"[ERROR reading {url}: {e}]"
 
 
-def jina_search(query: str) -> str:
+async def jina_search(query: str) -> str:
     """
     Searches the web via Jina AI Search (s.jina.ai) — returns clean results
     with titles, URLs, and full page summaries. Better than raw DuckDuckGo
     for finding and reading information in one step.
     """
     try:
-        encoded = urllib.parse.quote(query)
-        jina_url = f"https://s.jina.ai/{encoded}"
-        req = urllib.request.Request(jina_url, headers=JINA_HEADERS)
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            content = resp.read().decode("utf-8", errors="replace")
+        content = await _get_text(f"https://s.jina.ai/{urllib.parse.quote(query)}")
         if len(content) > MAX_CONTENT_CHARS:
             content = content[:MAX_CONTENT_CHARS] + "\n[Results truncated]"
         return content
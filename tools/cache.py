@@ -0,0 +1,121 @@
+"""
+On-disk cache for web tool results (search_web, jina_search, read_url,
+fetch_url_content), shared across agents and sessions.
+Keyed on tool name + normalized URL/query; bodies are zlib-compressed in the
+tool_cache table of data/magi.db (schema: memory/schema.py migration 5), on
+memory/db.py's per-thread connections — call get/put from coroutines through
+memory.db.run_async. Freshness depends on the request: anything the research
+triggers flag as news/latest expires quickly, everything else (docs,
+reference pages) lives long. Size-bounded, least recently used rows go first.
+
+TOOL_CACHE_MODE:
+  "normal"  — read through the cache, fetch on miss
+  "offline" — replay only: serve cached results regardless of age, never fetch
+  "off"     — no caching
+"""
+import hashlib
+import json
+import re
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from core.config import CONFIG
+from core.triggers import needs_research
+from memory.db import get_connection
+
+MODE = CONFIG.get("TOOL_CACHE_MODE", "normal")
+FRESH_TTL = CONFIG.get("TOOL_CACHE_NEWS_TTL", 30 * 60)          # news / latest
+STABLE_TTL = CONFIG.get("TOOL_CACHE_TTL", 7 * 24 * 3600)         # docs, reference
+MAX_BYTES = CONFIG.get("TOOL_CACHE_MAX_BYTES", 50 * 1024 * 1024)  # compressed total
+
+_URL_ARGS = ("url",)
+_QUERY_ARGS = ("query",)  # search text: case-insensitive; every other argument is kept as sent
+# Pure tracking — parameters like ?ref= select content on some sites and stay in the key
+_TRACKING = re.compile(r"^(utm_\w+|fbclid|gclid)$")
+
+counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop fragment and tracking params, sort the query string."""
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _TRACKING.match(k))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def _normalize_args(kwargs: dict) -> dict:
+    out = {}
+    for k, v in kwargs.items():
+        if k in _URL_ARGS and isinstance(v, str):
+            v = normalize_url(v)
+        elif k in _QUERY_ARGS and isinstance(v, str):
+            v = re.sub(r"\s+", " ", v.lower()).strip()
+        out[k] = v
+    return out
+
+
+def _key(tool: str, kwargs: dict) -> tuple[str, str]:
+    request = json.dumps(_normalize_args(kwargs), sort_keys=True)
+    return hashlib.sha256(f"{tool}|{request}".encode("utf-8")).hexdigest(), request
+
+
+def ttl_for(kwargs: dict) -> int:
+    """Short freshness window for news/latest requests, long for everything else."""
+    text = " ".join(str(v) for v in kwargs.values())
+    return FRESH_TTL if needs_research(text) else STABLE_TTL
+
+
+def get(tool: str, kwargs: dict) -> str | None:
+    """Cached result, or None. Offline mode ignores expiry."""
+    if MODE == "off":
+        return None
+    key, _ = _key(tool, kwargs)
+    now = time.time()
+    with get_connection() as conn:
+        row = conn.execute("SELECT body, expires FROM tool_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (MODE != "offline" and row[1] < now):
+            counters["misses"] += 1
+            return None
+        conn.execute("UPDATE tool_cache SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                     (now, key))
+    counters["hits"] += 1
+    return zlib.decompress(row[0]).decode("utf-8")
+
+
+def put(tool: str, kwargs: dict, result: str) -> None:
+    """Store a result, then evict least recently used rows beyond MAX_BYTES."""
+    if MODE != "normal":
+        return
+    key, request = _key(tool, kwargs)
+    body = zlib.compress(result.encode("utf-8"), 6)
+    now = time.time()
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tool_cache "
+            "(key, tool, request, body, size, created, expires, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, tool, request, body, len(body), now, now + ttl_for(kwargs), now))
+        counters["stores"] += 1
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_cache").fetchone()[0]
+        if total > MAX_BYTES:
+            victims = []
+            for old_key, size in conn.execute(
+                    "SELECT key, size FROM tool_cache ORDER BY last_used ASC"):
+                if total <= MAX_BYTES:
+                    break
+                victims.append((old_key,))
+                total -= size
+            conn.executemany("DELETE FROM tool_cache WHERE key = ?", victims)
+            counters["evictions"] += len(victims)
+
+
+def stats() -> dict:
+    """Hit/miss counters for this process plus on-disk totals."""
+    with get_connection() as conn:
+        rows, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM tool_cache").fetchone()
+    lookups = counters["hits"] + counters["misses"]
+    return {**counters, "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": rows, "bytes": size}
@@ -0,0 +1,122 @@
+"""
+Passage ranking for tool output.
+Instead of keeping the head of a page (often nav text and cookie banners),
+split it into passages, score each against what the agent is looking for
+with BM25 over a throwaway in-memory index, and pack the best passages into
+the token budget — emitted in document order so the text still reads.
+"""
+import math
+import re
+from collections import Counter
+from llm.tokens import count_tokens
+
+PASSAGE_CHARS = 400      # long paragraphs are cut into sentence runs of about this size
+MIN_PASSAGE_CHARS = 40   # shorter fragments are joined onto the next passage
+K1 = 1.5
+B = 0.75
+GAP = "\n[…]\n"
+
+_STOPWORDS = set(
+    "a an and are as at be by for from has have how i in is it its of on or that the "
+    "this to was were what when where which who why will with you your do does did can "
+    "about into than then them they their there these those not no but if so we our".split()
+)
+
+
+def terms(text: str) -> list[str]:
+    return [t for t in re.findall(r"\w+", text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def split_passages(text: str, target: int = PASSAGE_CHARS) -> list[str]:
+    """
+    One passage per paragraph. Long paragraphs are cut into runs of whole
+    sentences of ~target chars; fragments under MIN_PASSAGE_CHARS (stray
+    headings, link labels) are joined onto the next passage.
+    """
+    passages = []
+    for para in re.split(r"\n\s*\n|\n(?=#|\*|-|\d+\.)", text):
+        para = para.strip()
+        if not para:
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", para) if len(para) > target else [para]:
+            if current and len(current) + len(sentence) + 1 > target:
+                passages.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        passages.append(current)
+
+    merged, carry = [], ""
+    for p in passages:
+        p = f"{carry} {p}" if carry else p
+        if len(p) < MIN_PASSAGE_CHARS:
+            carry = p
+        else:
+            merged.append(p)
+            carry = ""
+    if carry:
+        merged.append(carry)
+    return merged
+
+
+def bm25_scores(query: str, passages: list[str]) -> list[float]:
+    docs = [Counter(terms(p)) for p in passages]
+    q_terms = set(terms(query))
+    if not docs or not q_terms:
+        return [0.0] * len(passages)
+    n = len(docs)
+    avg_len = sum(sum(d.values()) for d in docs) / n or 1.0
+    df = Counter(t for d in docs for t in q_terms if t in d)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in q_terms}
+
+    scores = []
+    for d in docs:
+        length = sum(d.values())
+        s = 0.0
+        for t in q_terms:
+            tf = d.get(t, 0)
+            if tf:
+                s += idf[t] * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_len))
+        scores.append(s)
+    return scores
+
+
+def select_passages(text: str, query: str, token_limit: int) -> str:
+    """
+    Return text unchanged if it fits token_limit; otherwise the highest-scoring
+    passages that fit, in original order, with gaps marked.
+    Errors pass through; text with no query terms at all falls back to its head.
+    """
+    if count_tokens(text) <= token_limit or text.startswith("[ERROR"):
+        return text
+    from core.budget import truncate_to_tokens  # core.budget imports llm.client — keep tools/ light
+
+    passages = split_passages(text)
+    scores = bm25_scores(query, passages)
+    if not any(scores):
+        return truncate_to_tokens(text, token_limit)
+    # Highest score first; earlier passages win ties (titles/leads sit at the top)
+    order = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+
+    chosen, used, seen = [], 0, set()
+    gap_cost = count_tokens(GAP)
+    for i in order:
+        if passages[i] in seen or scores[i] == 0:
+            continue  # repeated boilerplate; filler with no matching terms
+        seen.add(passages[i])
+        cost = count_tokens(passages[i]) + gap_cost
+        if used + cost > token_limit:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen:  # even the best passage is over budget on its own
+        return truncate_to_tokens(passages[order[0]], token_limit)
+
+    chosen.sort()
+    out = passages[chosen[0]] if chosen[0] == 0 else GAP.lstrip() + passages[chosen[0]]
+    for prev, i in zip(chosen, chosen[1:]):
+        out += ("\n" if i == prev + 1 else GAP) + passages[i]
+    if chosen[-1] != len(passages) - 1:
+        out += GAP.rstrip()
+    return out
@@ -1,34 +1,115 @@
-import urllib.request
-from bs4 import BeautifulSoup
+"""
+Plain-text page fetcher.
+Reads the response in chunks, decodes incrementally with the page's charset,
+and feeds a streaming HTMLParser that drops script/style/nav boilerplate as it
+goes. Stops reading the socket as soon as max_chars of readable text exist —
+large pages are never downloaded or held in memory in full.
+"""
+import codecs
 import re
+import aiohttp
+from html.parser import HTMLParser
+from llm.session import get_session
 
-def fetch_url_content(url: str, max_chars=5000) -> str:
+FETCH_TIMEOUT = 10
+CHUNK_BYTES = 16 * 1024
+MAX_DOWNLOAD_BYTES = 4 * 1024 * 1024  # hard stop for text-poor pages
+
+# Everything inside these is boilerplate or non-text
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe",
+             "nav", "header", "footer", "aside", "form", "button", "select"}
+# Tags that separate words visually — emit a space so text doesn't run together
+BREAK_TAGS = {"p", "div", "br", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5",
+              "h6", "section", "article", "blockquote", "pre", "dd", "dt", "hr"}
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.I)
+
+
+class TextExtractor(HTMLParser):
+    """Incremental HTML → text. Call feed() per chunk; check .done; read .text()."""
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self._skip = 0
+        self._parts: list[str] = []
+        self._chars = 0
+
+    @property
+    def done(self) -> bool:
+        return self._chars > self.limit
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BREAK_TAGS:
+            self._parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BREAK_TAGS:  # <br/>, <hr/> — never opens a skipped region
+            self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BREAK_TAGS:
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self._parts.append(data)
+        self._chars += len(data.strip())
+
+    def text(self) -> str:
+        return re.sub(r"\s+", " ", "".join(self._parts)).strip()
+
+
+def _charset(declared: str | None, head: bytes) -> str:
+    """Header charset, else <meta charset> in the first bytes, else UTF-8 — whichever Python knows."""
+    candidates = [declared]
+    m = _META_CHARSET.search(head[:2048])
+    if m:
+        candidates.append(m.group(1).decode("ascii", "ignore"))
+    for name in filter(None, candidates):
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+async def fetch_url_content(url: str, max_chars=12000) -> str:
     """
     Fetches the content of a URL and extracts the readable text.
     Strips raw HTML and returns plain text up to max_chars.
     """
     try:
-        req = urllib.request.Request(
-            url, 
-            headers={'User-Agent': 'Mozilla/5.0'}
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            html = response.read().decode('utf-8')
-            
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.extract()
-            
-        text = soup.get_text()
-        
-        # Collapse whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
+        timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+        parser = TextExtractor(max_chars)
+        decoder = None
+        read = 0
+        async with get_session().get(
+            url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+                if decoder is None:
+                    encoding = _charset(response.charset, chunk)
+                    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                read += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                # Leaving the block early closes the connection — the rest is never read
+                if parser.done or read >= MAX_DOWNLOAD_BYTES:
+                    break
+        if decoder is not None:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+
+        text = parser.text()
         if len(text) > max_chars:
             text = text[:max_chars] + "... [TRUNCATED]"
-            
+
         return text
     except Exception as e:
         return f"[ERROR FETCHING URL: {str(e)}]"
@@ -1,39 +1,43 @@
 """
 Indicator animation effects — glow/pulse for active state.
-Uses CTk's after() loop for non-blocking animation.
+Driven by the shared clock in ui/clock.py: no per-widget after() loop, and
+the widget is only reconfigured when the pulse actually flips.
 """
+from ui.clock import get_clock
 
 _pulse_jobs = {}
 
 def pulse_indicator(indicator_widget, color: str, interval_ms: int = 600) -> None:
     """Start a pulse animation on an indicator widget by alternating active/dim states."""
-    _pulse_step(indicator_widget, color, bright=True, interval_ms=interval_ms)
-
-def _pulse_step(widget, color: str, bright: bool, interval_ms: int) -> None:
-    if widget not in _pulse_jobs:
-        return  # Animation was cancelled
-
-    if bright:
-        widget.configure(fg_color=color)
-    else:
-        widget.configure(fg_color=_dim(color))
-
-    job = widget.after(interval_ms, lambda: _pulse_step(widget, color, not bright, interval_ms))
-    _pulse_jobs[widget] = job
+    clock = get_clock(indicator_widget)
+    started = clock.now()
+    shown = [None]
+
+    def step(now):
+        if indicator_widget not in _pulse_jobs:
+            return False  # Animation was cancelled
+        bright = int((now - started) // interval_ms) % 2 == 0
+        if bright != shown[0]:
+            shown[0] = bright
+            try:
+                indicator_widget.configure(fg_color=color if bright else _dim(color))
+            except Exception:  # widget destroyed: forget it so a later start_pulse starts afresh
+                if _pulse_jobs.get(indicator_widget) is step:
+                    del _pulse_jobs[indicator_widget]
+                return False
+
+    _pulse_jobs[indicator_widget] = step
+    clock.register(("pulse", indicator_widget), step, interval_ms, started)
 
 def start_pulse(indicator_widget, color: str) -> None:
-    """Register and start the pulse effect."""
-    _pulse_jobs[indicator_widget] = True
-    pulse_indicator(indicator_widget, color)
+    """Register and start the pulse effect (no-op if it is already pulsing)."""
+    if indicator_widget not in _pulse_jobs:
+        pulse_indicator(indicator_widget, color)
 
 def stop_pulse(indicator_widget) -> None:
     """Cancel the pulse animation and return to dim idle state."""
-    job = _pulse_jobs.pop(indicator_widget, None)
-    if job and job is not True:
-        try:
-            indicator_widget.after_cancel(job)
-        except Exception:
-            pass
+    if _pulse_jobs.pop(indicator_widget, None) is not None:
+        get_clock(indicator_widget).unregister(("pulse", indicator_widget))
 
 def _dim(hex_color: str) -> str:
     hex_color = hex_color.lstrip('#')
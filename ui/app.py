@@ -7,7 +7,9 @@ from ui.vacant_panel import VacantPanel
 from ui.context_bar import ContextBar
 from ui.layout import apply_layout
 from core.orchestrator import MAGIOrchestrator
+from core.worker import QueryWorker
 from core.config import CONFIG
+from memory.git_sync import SyncDaemon
 
 
 class MAGIApp(ctk.CTk):
@@ -27,10 +29,19 @@ class MAGIApp(ctk.CTk):
         apply_layout(self, self.magi_panel, self.terminal_panel, self.context_bar, self.vacant_panel)
 
         self.orchestrator = MAGIOrchestrator()
+        # One event loop for the whole session: queries queue up and run there in order
+        self.worker = QueryWorker()
+        # The terminal queues writes, so background threads can log to it directly
+        self.orchestrator.postprocess.log = lambda m: self.terminal_panel.append_text("SYSTEM", m)
+        # Git Mode: memory files are committed and pushed in batches on a daemon thread
+        self.git_sync = SyncDaemon(log=lambda m: self.terminal_panel.append_text("SYSTEM", m))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._last_response = ""  # tracks last MAGI output for /memory command
+        self._open_queries = 0    # submitted and not yet finished or cancelled
 
-        # Wire send button
+        # Wire send and stop buttons
         self.vacant_panel.send_btn.configure(command=self.submit_query)
+        self.vacant_panel.stop_btn.configure(command=self._on_stop)
 
         # Wire reset button (NeoVand pattern)
         self.magi_panel.controls.reset_btn.configure(command=self._on_reset)
@@ -42,10 +53,27 @@ class MAGIApp(ctk.CTk):
 
     def _on_reset(self):
         self.orchestrator.reset_history()
-        self.terminal_panel.textbox.configure(state="normal")
-        self.terminal_panel.textbox._textbox.delete("1.0", "end")
+        self.terminal_panel.clear()
         self.terminal_panel.append_text("SYSTEM", "History cleared. MAGI systems reset.")
 
+    def _on_stop(self):
+        cancelled = self.worker.cancel()
+        if cancelled:
+            self.terminal_panel.append_text("SYSTEM", f"■ Stopped — {cancelled} query(s) cancelled.")
+
+    def _on_close(self):
+        # Stop queries, then give queued memory storage a bounded chance to finish
+        self.worker.cancel()
+        try:
+            self.worker.run(self.orchestrator.postprocess.flush(),
+                            CONFIG.get("POSTPROCESS_EXIT_TIMEOUT", 20))
+        except Exception:
+            pass  # timed out: the rest resumes from disk
+        self.worker.stop()
+        # Final commit + push of anything still debouncing, then exit
+        self.git_sync.stop()
+        self.destroy()
+
     def _on_address_change(self, *args):
         from ui.animations import stop_pulse
         mode = self.magi_panel.controls.address_var.get()
@@ -71,18 +99,19 @@ class MAGIApp(ctk.CTk):
             return
 
         self.terminal_panel.append_text("USER", text)
-        self.vacant_panel.send_btn.configure(state="disabled")
+        if self._open_queries:
+            self.terminal_panel.append_text(
+                "SYSTEM", f"Queued — runs after {self._open_queries} query(s) ahead of it.")
         address = self.magi_panel.controls.address_var.get()
         context_text = self.context_bar.get_context_text()
         refinement = self.context_bar.is_refinement_mode()
         debate = self.context_bar.is_debate_mode()
         git = self.context_bar.is_git_mode()
-        self._set_thinking(address)
-        threading.Thread(
-            target=self._run_thread,
-            args=(text, address, context_text, refinement, debate, git),
-            daemon=True
-        ).start()
+        self._open_queries += 1
+        self.vacant_panel.stop_btn.configure(state="normal")
+        job = self.worker.submit(self._run_query, text, address, context_text, refinement, debate, git)
+        # Also fires for queries cancelled before they started
+        job.add_done_callback(lambda _: self.after(0, self._query_finished))
 
     def _set_thinking(self, address: str):
         indicators = {
@@ -98,45 +127,55 @@ class MAGIApp(ctk.CTk):
         for widget in [self.magi_panel.melchior, self.magi_panel.balthasar, self.magi_panel.casper]:
             widget.set_state("idle")
 
-    def _run_thread(self, text, address, context_text="", refinement=False, debate=False, git=False):
+    async def _run_query(self, text, address, context_text="", refinement=False, debate=False, git=False):
+        """One queued query, run on the worker loop."""
         def log(msg):
-            self.after(0, lambda m=msg: self.terminal_panel.append_text("SYSTEM", m))
+            self.terminal_panel.append_text("SYSTEM", msg)
         def tool_log(msg):
-            self.after(0, lambda m=msg: self.terminal_panel.append_text("TOOL", m))
+            self.terminal_panel.append_text("TOOL", msg)
         def stats_log(msg):
-            self.after(0, lambda m=msg: self.terminal_panel.append_text("SYSTEM", m))
+            self.terminal_panel.append_text("SYSTEM", msg)
+        streamed = set()  # agents whose replies were already streamed this query
+        def delta_log(name, token):
+            streamed.add(name)
+            self.terminal_panel.append_delta(name, token)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        self.after(0, lambda: self._set_thinking(address))
         try:
-            results = loop.run_until_complete(
-                self.orchestrator.process_query(
-                    text, address_mode=address,
-                    status_callback=log, tool_callback=tool_log,
-                    stats_callback=stats_log,
-                    context_text=context_text,
-                    refinement_mode=refinement,
-                    debate_mode=debate
-                )
+            results = await self.orchestrator.process_query(
+                text, address_mode=address,
+                status_callback=log, tool_callback=tool_log,
+                stats_callback=stats_log,
+                context_text=context_text,
+                refinement_mode=refinement,
+                debate_mode=debate,
+                delta_callback=delta_log
             )
-            self.after(0, lambda: self._show_results(results))
-
-            # Git sync -- save clipboard to disk and push memory files
-            if git:
-                from memory.git_sync import save_clipboard, sync
-                save_clipboard(self.orchestrator.clipboard)
-                ok, msg = sync(f"MAGI session [{text[:40]}]")
-                self.after(0, lambda m=msg: self.terminal_panel.append_text(
-                    "SYSTEM", f"[GIT] {m}"
-                ))
-        except Exception as e:
-            self.after(0, lambda: self.terminal_panel.append_text("SYSTEM", f"ERROR: {e}"))
-        finally:
-            loop.close()
-            self.after(0, self._clear_thinking)
-            self.after(0, lambda: self.vacant_panel.send_btn.configure(state="normal"))
+            self.after(0, lambda: self._show_results(results, streamed))
 
-    def _show_results(self, results: dict):
+            # Answer is on screen — finish the clipboard review before the next query reads it
+            await self._drain_background(text, git)
+        except asyncio.CancelledError:
+            self.terminal_panel.end_stream()
+            raise
+        except Exception as e:
+            self.terminal_panel.append_text("SYSTEM", f"ERROR: {e}")
+
+    def _query_finished(self):
+        self._open_queries -= 1
+        if not self._open_queries:
+            self._clear_thinking()
+            self.vacant_panel.stop_btn.configure(state="disabled")
+
+    async def _drain_background(self, text: str, git: bool):
+        """Finish clipboard review; queue the (optional) git sync. Storage keeps running on the loop."""
+        await self.orchestrator.wait_background()
+        if git:
+            # Returns at once -- the daemon writes clipboard.json and commits after a quiet spell
+            self.git_sync.notify(f"MAGI session [{text[:40]}]",
+                                 clipboard=list(self.orchestrator.clipboard))
+
+    def _show_results(self, results: dict, streamed=()):
         tts_on = self.magi_panel.controls.voice_var.get()
 
         # MAGI core direct response (router handled it — no council needed)
@@ -152,7 +191,8 @@ class MAGIApp(ctk.CTk):
             reply = results.get(ai, "").strip()
             if not reply or reply.startswith("[ERROR"):
                 continue
-            self.terminal_panel.append_text(ai, reply)
+            if ai not in streamed:  # streamed replies are already on screen
+                self.terminal_panel.append_text(ai, reply)
             if tts_on:
                 threading.Thread(target=self._speak, args=(ai, reply), daemon=True).start()
         final = results.get("FINAL_DECISION", "").strip()
@@ -190,6 +230,8 @@ class MAGIApp(ctk.CTk):
             with open(pinned_path, "a", encoding="utf-8") as f:
                 f.write(entry)
             self.terminal_panel.append_text("SYSTEM", f"[/memory] ✓ Committed to memory/pinned.md")
+            if self.context_bar.is_git_mode():
+                self.git_sync.notify(f"MAGI pin [{note or timestamp}]")
         except Exception as e:
             self.terminal_panel.append_text("SYSTEM", f"[/memory] ERROR: {e}")
 
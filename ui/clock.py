@@ -0,0 +1,90 @@
+"""
+Shared animation clock for the UI.
+One Tk timer per window drives every running animation (indicator frames,
+pulses) instead of one after() loop per widget. Each step registers with its
+own frame interval, and the clock only wakes at the earliest frame boundary
+among them, calling every registered step function with the current time in
+ms; a step returns False to unregister itself, and a step that raises (e.g.
+its widget was destroyed) is dropped without stopping the others. Steps
+decide their frame from the elapsed time, so a late tick never slows an
+animation down, and they only touch Tk when their frame actually changes.
+The clock stops when nothing is registered, and while the window is
+minimized or withdrawn it only polls every HIDDEN_INTERVAL ms without
+running any step.
+"""
+import math
+import time
+
+HIDDEN_INTERVAL = 500  # ms between visibility checks while the window is hidden
+
+
+class AnimationClock:
+    def __init__(self, root, hidden_interval: int = HIDDEN_INTERVAL):
+        self.root = root
+        self.hidden_interval = hidden_interval
+        self.ticks = 0          # ticks that ran steps (the metric tests look at)
+        self._steps: dict = {}  # key -> (step(now_ms) -> bool | None, interval_ms, start_ms)
+        self._after_id = None
+
+    @staticmethod
+    def now() -> float:
+        return time.monotonic() * 1000
+
+    def register(self, key, step, interval: float, start: float = None) -> None:
+        """Run step(now_ms) now and at every interval ms after start (default: now)
+        until it returns False, raises or is unregistered."""
+        self._steps[key] = (step, interval, self.now() if start is None else start)
+        self._cancel()  # the new step may be due sooner than the pending tick
+        self._after_id = self.root.after(0, self._tick)
+
+    def unregister(self, key) -> None:
+        self._steps.pop(key, None)
+        if not self._steps:
+            self._cancel()
+
+    def _cancel(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _hidden(self) -> bool:
+        try:
+            return self.root.state() in ("iconic", "withdrawn") or not self.root.winfo_viewable()
+        except Exception:
+            return True  # window is being destroyed
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if not self._steps:
+            return
+        if self._hidden():
+            self._after_id = self.root.after(self.hidden_interval, self._tick)
+            return
+        now = self.now()
+        for key, entry in list(self._steps.items()):
+            try:
+                done = entry[0](now) is False
+            except Exception:
+                done = True
+            if done and self._steps.get(key) is entry:
+                del self._steps[key]
+        self.ticks += 1
+        if self._steps:
+            self._after_id = self.root.after(self._next_delay(self.now()), self._tick)
+
+    def _next_delay(self, now: float) -> int:
+        """ms until the earliest frame boundary of any registered step."""
+        wait = min(interval - (now - start) % interval for _, interval, start in self._steps.values())
+        return max(1, math.ceil(wait))
+
+
+def get_clock(widget) -> AnimationClock:
+    """The clock of widget's toplevel window (created on first use)."""
+    root = widget.winfo_toplevel()
+    clock = getattr(root, "_animation_clock", None)
+    if clock is None:
+        clock = root._animation_clock = AnimationClock(root)
+    return clock
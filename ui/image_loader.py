@@ -1,15 +1,14 @@
-import os
 import customtkinter as ctk
-from PIL import Image
+from ui.sprites import load_image
 
 def load_image_or_color(image_path, width, height, fallback_color):
     """
     Attempts to load an image via Pillow for CustomTkinter.
     If the image doesn't exist, returns the fallback color string instead.
+    The file is opened and decoded once, and shared by both appearance modes.
     """
-    if os.path.exists(image_path):
-        return ctk.CTkImage(light_image=Image.open(image_path),
-                            dark_image=Image.open(image_path),
-                            size=(width, height)), None
+    img = load_image(image_path)
+    if img is not None:
+        return ctk.CTkImage(light_image=img, dark_image=img, size=(width, height)), None
     else:
         return None, fallback_color
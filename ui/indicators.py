@@ -1,8 +1,21 @@
 import customtkinter as ctk
-from PIL import Image
-import os
+from ui import sprites
+from ui.clock import get_clock
 
 FRAME_INTERVAL = 80  # ms between animation frames
+STATES = ("idle", "active", "thinking", "speaking")
+
+# CTkImages shared by every indicator; built the first time a frame is shown
+_ctk_frames: dict[tuple, ctk.CTkImage] = {}
+
+
+def _ctk_frame(name: str, state: str, i: int):
+    key = (name, state, i)
+    if key not in _ctk_frames:
+        img = sprites.frame(name, state, i)
+        _ctk_frames[key] = (ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
+                            if img is not None else None)
+    return _ctk_frames[key]
 
 
 class AIIndicator(ctk.CTkFrame):
@@ -12,68 +25,54 @@ class AIIndicator(ctk.CTkFrame):
         self.grid_propagate(False)
         self.name = name
         self.color = color
-        self._after_id = None
         self._frame_idx = 0
+        self._started = 0.0
+        self._shown = False  # nothing drawn yet (None is the text fallback)
 
-        # Load all frame sequences
-        n = name.lower()
-        self._frames = {
-            "idle":     self._load_frames(f"images/{n}_idle.png"),
-            "active":   self._load_frames(f"images/{n}_active.png"),
-            "thinking": self._load_sequence(f"images/{n}_thinking_", 12),
-            "speaking": self._load_sequence(f"images/{n}_speaking_", 16),
-        }
+        # Frame counts only — frames are decoded from the sprite sheet on first display
+        self._counts = {state: sprites.frame_count(name, state) for state in STATES}
+        self._state = None
 
         self.label = ctk.CTkLabel(self, text="", fg_color="transparent")
         self.label.place(relx=0.5, rely=0.5, anchor="center")
 
         self.set_state("idle")
 
-    def _load_frames(self, path: str) -> list:
-        if os.path.exists(path):
-            img = Image.open(path).convert("RGB")
-            return [ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))]
-        # Fallback: colored rectangle
-        return [None]
-
-    def _load_sequence(self, prefix: str, count: int) -> list:
-        frames = []
-        for i in range(count):
-            path = f"{prefix}{i:02d}.png"
-            if os.path.exists(path):
-                img = Image.open(path).convert("RGB")
-                frames.append(ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150)))
-        return frames if frames else [None]
-
     def set_state(self, state: str):
         """States: idle, active, thinking, speaking"""
+        if not self._counts.get(state):
+            state = "idle"
+        if state == self._state:
+            return  # already showing (or animating) it — don't restart
         self._stop_animation()
-        frames = self._frames.get(state, self._frames["idle"])
+        self._state = state
 
-        if len(frames) == 1:
-            self._show_frame(frames[0])
+        if self._counts[state] <= 1:
+            self._show_frame(_ctk_frame(self.name, state, 0))  # None → colored text fallback
         else:
-            self._frame_idx = 0
-            self._state_frames = frames
-            self._animate()
+            clock = get_clock(self)
+            self._frame_idx, self._started = 0, clock.now()
+            self._show_frame(_ctk_frame(self.name, state, 0))
+            clock.register(self, self._step, FRAME_INTERVAL, self._started)
 
     def _show_frame(self, frame):
+        if frame is self._shown:
+            return
+        self._shown = frame
         if frame:
             self.label.configure(image=frame, text="")
         else:
             self.label.configure(image=None, text=self.name, text_color=self.color,
                                   font=("Courier New", 10, "bold"))
 
-    def _animate(self):
-        frames = self._state_frames
-        self._show_frame(frames[self._frame_idx % len(frames)])
-        self._frame_idx += 1
-        self._after_id = self.after(FRAME_INTERVAL, self._animate)
+    def _step(self, now: float):
+        """Clock callback: show the frame for the elapsed time; redraw only when it changes."""
+        if not self.winfo_exists():
+            return False
+        idx = int((now - self._started) // FRAME_INTERVAL) % self._counts[self._state]
+        if idx != self._frame_idx:
+            self._frame_idx = idx
+            self._show_frame(_ctk_frame(self.name, self._state, idx))
 
     def _stop_animation(self):
-        if self._after_id:
-            try:
-                self.after_cancel(self._after_id)
-            except Exception:
-                pass
-            self._after_id = None
+        get_clock(self).unregister(self)
@@ -0,0 +1,85 @@
+"""
+Indicator sprite sheets and the process-wide decoded image cache.
+generate_indicators.py packs each personality's animation frames into one
+sheet (images/{name}_sheet.png) and describes them in images/indicators.json:
+  {"frame_size": [w, h], "sprites": {name: {"sheet": file, "states": {state: [first, count]}}}}
+A sheet is decoded once on first use; individual frames are cropped from it
+lazily, the first time a state is shown, and shared by every widget.
+Without a manifest the loose per-frame PNGs are used ({name}_{state}.png or
+{name}_{state}_NN.png).
+"""
+import json
+import os
+import threading
+from PIL import Image
+
+IMAGES_DIR = "images"
+MANIFEST = "indicators.json"
+
+_images: dict[str, Image.Image] = {}       # path -> decoded image
+_frames: dict[tuple, Image.Image] = {}     # (name, state, i) -> cropped frame
+_manifests: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def load_image(path: str):
+    """Decoded Pillow image for path, opened once per process; None if missing."""
+    with _lock:
+        img = _images.get(path)
+        if img is None and os.path.exists(path):
+            with Image.open(path) as f:
+                img = _images[path] = f.convert("RGBA" if "A" in f.getbands() else "RGB")
+        return img
+
+
+def manifest() -> dict:
+    path = os.path.join(IMAGES_DIR, MANIFEST)
+    if path not in _manifests:
+        try:
+            with open(path, encoding="utf-8") as f:
+                _manifests[path] = json.load(f)
+        except (OSError, ValueError):
+            _manifests[path] = {}
+    return _manifests[path]
+
+
+def _legacy_paths(name: str, state: str) -> list[str]:
+    single = os.path.join(IMAGES_DIR, f"{name}_{state}.png")
+    if os.path.exists(single):
+        return [single]
+    paths, i = [], 0
+    while os.path.exists(p := os.path.join(IMAGES_DIR, f"{name}_{state}_{i:02d}.png")):
+        paths.append(p)
+        i += 1
+    return paths
+
+
+def frame_count(name: str, state: str) -> int:
+    """Frames in a state's animation (0 if there are no images for it)."""
+    name = name.lower()
+    sprite = manifest().get("sprites", {}).get(name)
+    if sprite:
+        return sprite["states"].get(state, [0, 0])[1]
+    return len(_legacy_paths(name, state))
+
+
+def frame(name: str, state: str, i: int):
+    """Pillow image for frame i of a state (cropped on first use), or None."""
+    name = name.lower()
+    key = (name, state, i)
+    if key in _frames:
+        return _frames[key]
+    spec = manifest()
+    sprite = spec.get("sprites", {}).get(name)
+    if sprite:
+        first, count = sprite["states"].get(state, [0, 0])
+        sheet = load_image(os.path.join(IMAGES_DIR, sprite["sheet"]))
+        if sheet is None or i >= count:
+            return None
+        w, h = spec["frame_size"]
+        img = sheet.crop(((first + i) * w, 0, (first + i + 1) * w, h))
+    else:
+        paths = _legacy_paths(name, state)
+        img = load_image(paths[i]) if i < len(paths) else None
+    with _lock:
+        return _frames.setdefault(key, img)
@@ -0,0 +1,99 @@
+"""
+Output queue behind TerminalPanel.
+Any thread may write; the Tk thread drains the queue once per frame and
+inserts the whole batch with a single call. Adjacent writes with the same
+colour tag (streamed tokens) are merged into one segment, so a burst of a
+thousand tokens costs one Tk insert instead of a thousand.
+Everything drained is also appended to a plain-text transcript under
+data/transcripts/, which keeps the full session once the on-screen
+scrollback has been trimmed.
+"""
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from core.config import CONFIG
+
+TRANSCRIPT_DIR = CONFIG.get("TERMINAL_TRANSCRIPT_DIR", "data/transcripts")  # "" disables
+
+
+def speaker_tag(speaker: str, colors) -> str:
+    return f"tag_{speaker}" if speaker in colors else "tag_SYSTEM"
+
+
+class TerminalBuffer:
+    def __init__(self, colors, transcript_dir: str = TRANSCRIPT_DIR):
+        self.colors = colors
+        self.transcript_dir = transcript_dir
+        self.transcript_path = None    # created on the first write
+        self._ops: deque = deque()     # ("text" | "delta" | "end", speaker, text)
+        self._lock = threading.Lock()
+        self._stream_speaker = None    # speaker whose streamed block is still open
+
+    # ── Producers (any thread) ───────────────────────────────────────────────
+
+    def text(self, speaker: str, message: str) -> None:
+        self._ops.append(("text", speaker, message))
+
+    def delta(self, speaker: str, token: str) -> None:
+        self._ops.append(("delta", speaker, token))
+
+    def end_stream(self) -> None:
+        self._ops.append(("end", None, ""))
+
+    def discard(self) -> None:
+        """Drop everything not yet drawn (the panel is being cleared)."""
+        with self._lock:
+            self._ops.clear()
+            if self._stream_speaker is not None:
+                self._spill([("\n\n", "")])  # close the block in the transcript too
+            self._stream_speaker = None
+
+    # ── Consumer (Tk thread) ─────────────────────────────────────────────────
+
+    def pending(self) -> bool:
+        return bool(self._ops)
+
+    def drain(self) -> list[tuple[str, str]]:
+        """Everything queued so far as merged (text, tag) segments, in order."""
+        segments: list[list[str]] = []
+
+        def emit(text: str, tag: str) -> None:
+            if segments and segments[-1][1] == tag:
+                segments[-1][0] += text
+            else:
+                segments.append([text, tag])
+
+        with self._lock:
+            while self._ops:
+                kind, speaker, text = self._ops.popleft()
+                if kind == "delta" and self._stream_speaker == speaker:
+                    emit(text, speaker_tag(speaker, self.colors))
+                    continue
+                if self._stream_speaker is not None:
+                    emit("\n\n", "")
+                    self._stream_speaker = None
+                if kind == "text":
+                    emit(f"[{speaker}] ", "tag_label")
+                    emit(text.strip() + "\n\n", speaker_tag(speaker, self.colors))
+                elif kind == "delta":
+                    emit(f"[{speaker}] ", "tag_label")
+                    emit(text, speaker_tag(speaker, self.colors))
+                    self._stream_speaker = speaker
+        batch = [(text, tag) for text, tag in segments]
+        if batch:
+            self._spill(batch)
+        return batch
+
+    def _spill(self, batch: list[tuple[str, str]]) -> None:
+        if not self.transcript_dir:
+            return
+        try:
+            if self.transcript_path is None:
+                os.makedirs(self.transcript_dir, exist_ok=True)
+                name = datetime.now().strftime("%Y%m%d-%H%M%S") + ".log"
+                self.transcript_path = os.path.join(self.transcript_dir, name)
+            with open(self.transcript_path, "a", encoding="utf-8") as f:
+                f.write("".join(text for text, _ in batch))
+        except OSError:
+            self.transcript_dir = None  # read-only disk — keep the terminal working
@@ -1,5 +1,7 @@
 import customtkinter as ctk
 from tkinter import font as tkfont
+from core.config import CONFIG
+from ui.terminal_buffer import TerminalBuffer
 
 # Speaker color map per PRD Section 10
 COLORS = {
@@ -12,6 +14,10 @@ COLORS = {
     "TOOL":      "#ffdd00",
 }
 
+FLUSH_INTERVAL = 33                                    # ms — at most one redraw per frame
+MAX_LINES = CONFIG.get("TERMINAL_MAX_LINES", 4000)     # on-screen scrollback; the rest is on disk
+TRIM_SLACK = 200                                       # trim in chunks, not line by line
+
 
 class TerminalPanel(ctk.CTkFrame):
     def __init__(self, master, width, height):
@@ -44,14 +50,41 @@ class TerminalPanel(ctk.CTkFrame):
             self.textbox._textbox.tag_configure(f"tag_{speaker}", foreground=color)
         self.textbox._textbox.tag_configure("tag_label", foreground="#555555")
 
+        # Writers only queue; _flush draws the queued batch on the Tk thread
+        self.buffer = TerminalBuffer(COLORS)
+        self.after(FLUSH_INTERVAL, self._flush)
+
+    # Safe to call from any thread — nothing here touches Tk.
+
     def append_text(self, speaker: str, message: str):
-        self.textbox.configure(state="normal")
-        tb = self.textbox._textbox
+        self.buffer.text(speaker, message)
+
+    def append_delta(self, speaker: str, token: str):
+        """Append one streamed token. Opens a new labelled block when the speaker changes."""
+        self.buffer.delta(speaker, token)
+
+    def end_stream(self):
+        """Close the open streamed block, if any."""
+        self.buffer.end_stream()
+
+    def clear(self):
+        """Empty the screen and drop anything still queued (the transcript keeps it all)."""
+        self.buffer.discard()
+        self.textbox._textbox.delete("1.0", "end")
 
-        label = f"[{speaker}] "
-        tb.insert("end", label, "tag_label")
-        tag = f"tag_{speaker}" if speaker in COLORS else "tag_SYSTEM"
-        tb.insert("end", message.strip() + "\n\n", tag)
+    def _flush(self):
+        if self.buffer.pending():
+            batch = self.buffer.drain()
+            if batch:
+                tb = self.textbox._textbox
+                # One insert for the whole batch: text, tag, text, tag, ...
+                tb.insert("end", *[part for segment in batch for part in segment])
+                self._trim(tb)
+                tb.see("end")
+        self.after(FLUSH_INTERVAL, self._flush)
 
-        self.textbox.see("end")
-        self.textbox.configure(state="normal")
+    def _trim(self, tb):
+        """Cap the scrollback: drop the oldest lines once MAX_LINES + TRIM_SLACK is exceeded."""
+        lines = int(tb.index("end-1c").split(".")[0])
+        if lines > MAX_LINES + TRIM_SLACK:
+            tb.delete("1.0", f"{lines - MAX_LINES + 1}.0")
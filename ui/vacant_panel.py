@@ -43,9 +43,9 @@ class VacantPanel(ctk.CTkFrame):
         )
         self.status_label.place(x=64, y=136)
 
-        # Send button
+        # Send button — stays enabled while a query runs; new queries are queued
         self.send_btn = ctk.CTkButton(
-            self, text="►", width=54, height=86,
+            self, text="►", width=54, height=56,
             font=("Arial", 22, "bold"),
             fg_color="#003344", hover_color="#00d4ff",
             text_color="#00d4ff", corner_radius=4,
@@ -53,6 +53,17 @@ class VacantPanel(ctk.CTkFrame):
         )
         self.send_btn.place(x=412, y=42)
 
+        # Stop button — cancels the running query and anything queued behind it
+        self.stop_btn = ctk.CTkButton(
+            self, text="■", width=54, height=26,
+            font=("Arial", 12, "bold"),
+            fg_color="#220d0d", hover_color="#ff3333",
+            text_color="#ff3333", corner_radius=4,
+            border_color="#ff3333", border_width=1,
+            state="disabled"
+        )
+        self.stop_btn.place(x=412, y=102)
+
     def _on_enter(self, event):
         """Return key inserts a newline — does not submit."""
         self.input_field.insert("insert", "\n")